@@ -52,25 +52,45 @@ from __future__ import print_function, absolute_import
 ###########  Last modified:  May 27, 2020                 ############
 ####################################################################"""
 
-import ctypes, math, os.path, sys, time
+import contextlib, copy, importlib, io, json, math, os.path, re, sys, threading, time, warnings
 from datetime import datetime, timedelta
 from glob import glob
 from argparse import ArgumentParser
-import numpy as np
+from types import SimpleNamespace
 
+
+class lazy_module:
+    """
+    Stands in for a module until one of its attributes is used, then imports it.
+
+    Keeps dependencies that only some options need out of the start-up time: on first use the module replaces the
+    stand-in in the globals of GoodVibes.
+
+    Attributes:
+        name (str): module to import.
+        alias (str): global name of the module.
+    """
+    def __init__(self, name, alias):
+        self.name, self.alias = name, alias
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        module = importlib.import_module(self.name)
+        globals()[self.alias] = module
+        return getattr(module, attr)
+
+
+np = lazy_module('numpy', 'np')
+asyncio = lazy_module('asyncio', 'asyncio')
+csv = lazy_module('csv', 'csv')
+ctypes = lazy_module('ctypes', 'ctypes')
+hashlib = lazy_module('hashlib', 'hashlib')
+socket = lazy_module('socket', 'socket')
+sqlite3 = lazy_module('sqlite3', 'sqlite3')
 # Importing regardless of relative import
-try:
-    from .vib_scale_factors import scaling_data_dict, scaling_data_dict_mod, scaling_refs
-except:
-    from vib_scale_factors import scaling_data_dict, scaling_data_dict_mod, scaling_refs
-
-try:
-    from pyDFTD3 import dftd3 as D3
-except:
-    try:
-        from dftd3 import dftd3 as D3
-    except:
-        pass
+vib_scale_factors = lazy_module(__package__ + '.vib_scale_factors' if __package__ else 'vib_scale_factors',
+                                'vib_scale_factors')
 
 # VERSION NUMBER
 __version__ = "3.0.2"
@@ -87,6 +107,7 @@ AMU_to_KG = 1.66053886E-27  # UNIT CONVERSION
 ATMOS = 101.325  # UNIT CONVERSION
 J_TO_AU = 4.184 * 627.509541 * 1000.0  # UNIT CONVERSION
 KCAL_TO_AU = 627.509541  # UNIT CONVERSION
+BOHR_TO_ANGSTROM = 0.52917726  # UNIT CONVERSION
 
 # Some literature references
 grimme_ref = "Grimme, S. Chem. Eur. J. 2012, 18, 9955-9964"
@@ -99,8 +120,26 @@ csd_ref = ("C. R. Groom, I. J. Bruno, M. P. Lightfoot and S. C. Ward, Acta Cryst
 oniom_scale_ref = "Simon, L.; Paton, R. S. J. Am. Chem. Soc. 2018, 140, 5412-5420"
 d3_ref = "Grimme, S.; Atony, J.; Ehrlich S.; Krieg, H. J. Chem. Phys. 2010, 132, 154104"
 d3bj_ref = "Grimme S.; Ehrlich, S.; Goerigk, L. J. Comput. Chem. 2011, 32, 1456-1465"
+span_ref = "Kozuch, S.; Shaik, S. Acc. Chem. Res. 2011, 44, 101-110"
 atm_ref = "Axilrod, B. M.; Teller, E. J. Chem. Phys. 1943, 11, 299 \n Muto, Y. Proc. Phys. Math. Soc. Jpn. 1944, 17, 629"
 
+# DFT-D3 damping parameters (Grimme et al.) keyed by functional, names as written by Gaussian or ORCA
+# Zero damping: s6, rs6, s8
+D3_ZERO_PARAMS = {'B3LYP': (1.0, 1.261, 1.703), 'PBE': (1.0, 1.217, 0.722), 'PBE0': (1.0, 1.287, 0.928),
+                  'PBE1PBE': (1.0, 1.287, 0.928), 'TPSS': (1.0, 1.166, 1.105), 'TPSSTPSS': (1.0, 1.166, 1.105),
+                  'BP86': (1.0, 1.139, 1.683), 'BLYP': (1.0, 1.094, 1.682), 'B97D': (1.0, 0.892, 0.909),
+                  'REVPBE': (1.0, 0.923, 1.010), 'M062X': (1.0, 1.619, 0.0), 'M06': (1.0, 1.325, 0.0),
+                  'B2PLYP': (0.64, 1.427, 1.022), 'CAMB3LYP': (1.0, 1.378, 1.217), 'HF': (1.0, 1.158, 1.746),
+                  'PW6B95': (1.0, 1.532, 0.862)}
+# Becke-Johnson damping: s6, a1, s8, a2 (Bohr)
+D3_BJ_PARAMS = {'B3LYP': (1.0, 0.3981, 1.9889, 4.4211), 'PBE': (1.0, 0.4289, 0.7875, 4.4407),
+                'PBE0': (1.0, 0.4145, 1.2177, 4.8593), 'PBE1PBE': (1.0, 0.4145, 1.2177, 4.8593),
+                'TPSS': (1.0, 0.4535, 1.9435, 4.4752), 'TPSSTPSS': (1.0, 0.4535, 1.9435, 4.4752),
+                'BP86': (1.0, 0.3946, 3.2822, 4.8516), 'BLYP': (1.0, 0.4298, 2.6996, 4.2359),
+                'B97D': (1.0, 0.5545, 2.2609, 3.2297), 'REVPBE': (1.0, 0.5238, 2.3550, 3.5016),
+                'B2PLYP': (0.64, 0.3065, 0.9147, 5.0570), 'CAMB3LYP': (1.0, 0.3708, 2.0674, 5.4743),
+                'HF': (1.0, 0.3385, 0.9171, 2.8830), 'PW6B95': (1.0, 0.2076, 0.7257, 6.3750)}
+
 # Some useful arrays
 periodictable = ["", "H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne", "Na", "Mg", "Al", "Si",
                  "P", "S", "Cl", "Ar", "K", "Ca", "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn",
@@ -138,6 +177,11 @@ BONDI = {'H': 1.09, 'He': 1.40, 'Li': 1.82, 'Be': 2.00, 'B': 2.00, 'C': 1.70, 'N
 
 alphabet = 'abcdefghijklmnopqrstuvwxyz'
 
+
+class GoodVibesError(Exception):
+    """Error in the input files or options; the command line prints its message and exits."""
+
+
 def sharepath(filename):
     """
     Get absolute pathway to GoodVibes project.
@@ -154,6 +198,371 @@ def sharepath(filename):
     return os.path.join(here, 'share', filename)
 
 
+# Compiled symmetry library, loaded once per process on first use
+_symmetry_lib = None
+_symmetry_lock = threading.Lock()
+
+
+def symmetry_library():
+    """
+    Load the compiled point group library for this OS.
+
+    The library is loaded once and shared. Builds exporting symmetry_r keep all of their working state per call,
+    so they can be called from several threads at once; older builds are returned as well and handled by the caller.
+
+    Returns:
+    ctypes.CDLL: loaded symmetry library.
+    """
+    global _symmetry_lib
+    if _symmetry_lib is None:
+        with _symmetry_lock:
+            if _symmetry_lib is None:
+                if sys.platform.startswith('linux'):
+                    lib = ctypes.CDLL(sharepath('symmetry_linux.so'))
+                elif sys.platform.startswith('darwin'):
+                    lib = ctypes.CDLL(sharepath('symmetry_mac.dylib'))
+                else:
+                    lib = ctypes.cdll.LoadLibrary(sharepath('symmetry_windows.dll'))
+                if hasattr(lib, 'symmetry_r'):
+                    lib.symmetry_r.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+                    lib.symmetry_r.restype = ctypes.c_int
+                _symmetry_lib = lib
+    return _symmetry_lib
+
+
+def legacy_point_group(coords, file):
+    """
+    Point group from a symmetry library built before symmetry_r was added.
+
+    Older builds keep their state in globals, so each structure needs a freshly loaded copy of the library.
+
+    Parameters:
+    coords (bytes): "N\\nZ x y z\\n..." coordinate text.
+    file (str): name used for the temporary copy of the library.
+
+    Returns:
+    str: point group of the structure.
+    """
+    platform = sys.platform
+    if platform.startswith('linux'):  # linux - .so file
+        path1 = sharepath('symmetry_linux.so')
+        newlib = 'lib_' + file + '.so'
+        path2 = sharepath(newlib)
+        copy = 'cp ' + path1 + ' ' + path2
+        os.popen(copy).close()
+        symmetry = ctypes.CDLL(path2)
+    elif platform.startswith('darwin'):  # macOS - .dylib file
+        path1 = sharepath('symmetry_mac.dylib')
+        newlib = 'lib_' + file + '.dylib'
+        path2 = sharepath(newlib)
+        copy = 'cp ' + path1 + ' ' + path2
+        os.popen(copy).close()
+        symmetry = ctypes.CDLL(path2)
+    elif platform.startswith('win'):  # windows - .dll file
+        path1 = sharepath('symmetry_windows.dll')
+        newlib = 'lib_' + file + '.dll'
+        path2 = sharepath(newlib)
+        copy = 'copy ' + path1 + ' ' + path2
+        os.popen(copy).close()
+        symmetry = ctypes.cdll.LoadLibrary(path2)
+
+    symmetry.symmetry.restype = ctypes.c_char_p
+    pgroup = symmetry.symmetry(ctypes.c_char_p(coords)).decode('utf-8')
+
+    # Remove file
+    if platform.startswith('linux'):  # linux - .so file
+        remove = 'rm ' + path2
+        os.popen(remove).close()
+    elif platform.startswith('darwin'):  # macOS - .dylib file
+        remove = 'rm ' + path2
+        os.popen(remove).close()
+    elif platform.startswith('win'):  # windows - .dll file
+        handle = symmetry._handle
+        del symmetry
+        ctypes.windll.kernel32.FreeLibrary(ctypes.c_void_p(handle))
+        remove = 'Del /F "' + path2 + '"'
+        os.popen(remove).close()
+    return pgroup
+
+
+def _point_group_chunk(atom_nums, coords, offsets, group_len=16):
+    """
+    Assign point groups to one packed block of molecules with a single library call.
+
+    Parameters:
+    atom_nums (numpy.ndarray): int32 atomic numbers of all molecules, concatenated.
+    coords (numpy.ndarray): float64 (N, 3) Cartesian coordinates matching atom_nums.
+    offsets (numpy.ndarray): int32 start of each molecule in atom_nums, followed by the total atom count.
+    group_len (int): bytes reserved for each point group name.
+
+    Returns:
+    list: point group of each molecule, empty string if none could be assigned.
+    """
+    lib = symmetry_library()
+    nmols = len(offsets) - 1
+    if not hasattr(lib, 'symmetry_batch'):
+        pgroups = []
+        for m in range(nmols):
+            mol = SimpleNamespace(atom_nums=atom_nums[offsets[m]:offsets[m + 1]],
+                                  cartesians=coords[offsets[m]:offsets[m + 1]])
+            pgroups.append(legacy_point_group(getoutData.coords_string(mol).encode('utf-8'),
+                                              '{}_{}'.format(os.getpid(), m)))
+        return pgroups
+    groups = ctypes.create_string_buffer(group_len * nmols)
+    int_p, double_p = ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_double)
+    lib.symmetry_batch(ctypes.c_int(nmols), offsets.ctypes.data_as(int_p), atom_nums.ctypes.data_as(int_p),
+                       coords.ctypes.data_as(double_p), groups, ctypes.c_int(group_len))
+    raw = groups.raw
+    return [raw[m * group_len:(m + 1) * group_len].split(b'\0', 1)[0].decode('utf-8') for m in range(nmols)]
+
+
+def c1_prescreen(atom_nums, cartesians, tol=0.25, plane_tol=0.35):
+    """
+    Cheap test for structures that cannot have any symmetry element.
+
+    Every element accepted by the symmetry library maps each atom to within 0.1 Angstrom of an atom of the same
+    element, so symmetry-equivalent atoms share their distance from the centroid and their sorted distances to each
+    element to within 0.2 Angstrom. Without any such pair, an element would have to hold every atom in place, which
+    needs a (near-)planar or (near-)linear structure; that is read off the principal second moments.
+
+    Parameters:
+    atom_nums (list): atomic numbers.
+    cartesians (list): Cartesian coordinates in Angstrom.
+    tol (float): largest mismatch in distances (Angstrom) for two atoms to count as possibly equivalent.
+    plane_tol (float): root of the smallest principal second moment (Angstrom) below which an element may contain all atoms.
+
+    Returns:
+    bool: True if the structure is certainly C1, False if the full analysis is needed.
+    """
+    nums = np.asarray(atom_nums)
+    xyz = np.asarray(cartesians, dtype=float).reshape(-1, 3)
+    if len(nums) < 3:
+        return False
+    centered = xyz - xyz.mean(axis=0)
+    moments = np.linalg.eigvalsh(centered.T @ centered / len(nums))
+    if moments[0] <= plane_tol ** 2:
+        return False
+    radius = np.linalg.norm(centered, axis=1)
+    pairs = (nums[:, None] == nums[None, :]) & (np.abs(radius[:, None] - radius[None, :]) <= tol)
+    i, j = np.nonzero(np.triu(pairs, k=1))
+    if len(i) == 0:
+        return True
+    # Distances from each atom to all others, grouped by element and sorted within each group
+    dist = np.linalg.norm(xyz[:, None] - xyz[None, :], axis=-1)
+    order = np.lexsort((dist, np.broadcast_to(nums, dist.shape)), axis=-1)
+    signature = np.take_along_axis(dist, order, axis=-1)
+    return not np.any(np.max(np.abs(signature[i] - signature[j]), axis=1) <= tol)
+
+
+def point_groups(molecules, nproc=1, chunk_size=64, prescreen=True):
+    """
+    Assign point groups and external symmetry numbers to a whole ensemble of structures.
+
+    Geometries are packed into flat arrays and handed to the compiled library in blocks of chunk_size molecules,
+    which are spread over a process pool when nproc > 1 and there is more than one block. Structures that
+    c1_prescreen shows to have no symmetry element are assigned C1 without calling the library.
+
+    Parameters:
+    molecules (list): objects with atom_nums and cartesians, such as getoutData.
+    nproc (int): number of worker processes.
+    chunk_size (int): molecules per library call.
+    prescreen (bool): skip the library for structures that are certainly C1.
+
+    Returns:
+    list: point group of each structure, empty string if none could be assigned.
+    list: external symmetry number of each structure (1 if no point group was assigned).
+    """
+    geometries = [(getattr(mol, 'atom_nums', []), getattr(mol, 'cartesians', [])) for mol in molecules]
+    pgroups = [''] * len(geometries)
+    todo = []
+    for n, (nums, xyz) in enumerate(geometries):
+        if prescreen and len(nums) and c1_prescreen(nums, xyz):
+            pgroups[n] = 'C1'
+        else:
+            todo.append(n)
+    chunks = []
+    for start in range(0, len(todo), chunk_size):
+        block = [geometries[n] for n in todo[start:start + chunk_size]]
+        counts = [len(nums) for nums, _ in block]
+        offsets = np.zeros(len(block) + 1, dtype=np.int32)
+        offsets[1:] = np.cumsum(counts)
+        atom_nums = np.ascontiguousarray(np.concatenate([np.asarray(nums, dtype=np.int32) for nums, _ in block]
+                                                        + [np.zeros(0, dtype=np.int32)]))
+        coords = np.ascontiguousarray(np.concatenate([np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+                                                      for _, xyz in block] + [np.zeros((0, 3))]))
+        chunks.append((atom_nums, coords, offsets))
+    if nproc > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=nproc) as pool:
+            results = list(pool.map(_point_group_chunk, *zip(*chunks)))
+    else:
+        results = [_point_group_chunk(*chunk) for chunk in chunks]
+    for n, pgroup in zip(todo, [pgroup for result in results for pgroup in result]):
+        pgroups[n] = pgroup
+    return pgroups, [pg_sm.get(pgroup, 1) for pgroup in pgroups]
+
+
+def cache_dir():
+    """
+    Directory holding results that are reused across runs.
+
+    Returns:
+    str: GOODVIBES_CACHE_DIR if set, otherwise ~/.goodvibes.
+    """
+    return os.environ.get('GOODVIBES_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.goodvibes')
+
+
+# Sign changes of the principal axes that keep a right-handed frame
+PROPER_AXIS_SIGNS = ([1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1])
+
+
+def principal_axes(cartesians):
+    """
+    Centre a structure and find its principal axes.
+
+    Parameters:
+    cartesians (array): coordinates of shape (atoms, 3).
+
+    Returns:
+    numpy.ndarray: coordinates relative to the centroid.
+    numpy.ndarray: principal axes as the columns of a proper rotation matrix, smallest moment first. Each axis is
+                   only defined up to its sign (see PROPER_AXIS_SIGNS).
+    """
+    centered = np.asarray(cartesians, dtype=float).reshape(-1, 3)
+    centered = centered - centered.mean(axis=0)
+    axes = np.linalg.eigh(centered.T @ centered)[1]
+    if np.linalg.det(axes) < 0:
+        axes[:, 0] *= -1
+    return centered, axes
+
+
+def kabsch(coords_a, coords_b):
+    """
+    Optimal superposition of many pairs of structures (Kabsch algorithm).
+
+    Both structures of a pair are centred on their centroids. The rotation follows from the singular value
+    decomposition of their covariance matrix; a reflection is excluded by flipping the sign of the smallest singular
+    value, and the minimal RMSD follows from the singular values without rotating the structures.
+
+    Parameters:
+    coords_a (array): reference coordinates of shape (pairs, atoms, 3).
+    coords_b (array): coordinates of shape (pairs, atoms, 3), atoms in the same order as coords_a.
+
+    Returns:
+    numpy.ndarray: rotations of shape (pairs, 3, 3); centred b @ rotation is superimposed on centred a.
+    numpy.ndarray: RMSD of each pair after superposition.
+    """
+    a = np.asarray(coords_a, dtype=float)
+    b = np.asarray(coords_b, dtype=float)
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    u, sv, vt = np.linalg.svd(np.einsum('pni,pnj->pij', b, a))
+    d = np.ones((len(a), 3))
+    d[:, 2] = np.where(np.linalg.det(u) * np.linalg.det(vt) < 0, -1.0, 1.0)
+    rotation = np.einsum('pij,pj,pjk->pik', u, d, vt)
+    msd = (np.sum(a ** 2, axis=(1, 2)) + np.sum(b ** 2, axis=(1, 2)) - 2.0 * np.sum(sv * d, axis=1)) / a.shape[1]
+    return rotation, np.sqrt(np.maximum(msd, 0.0))
+
+
+def geometry_hash(atom_nums, cartesians, grid=0.01):
+    """
+    Key identifying a geometry independently of its position, orientation and atom numbering.
+
+    The structure is centred and rotated onto its principal axes; of the four proper orientations of those axes, the
+    one whose rounded, element-sorted coordinates sort first is hashed. The grid is a tenth of the symmetry analyzer
+    tolerance, so geometries sharing a key are indistinguishable to it. Structures with degenerate principal moments
+    may give different keys in different orientations, which only costs a cache miss.
+
+    Parameters:
+    atom_nums (list): atomic numbers.
+    cartesians (list): Cartesian coordinates in Angstrom.
+    grid (float): rounding applied to the aligned coordinates (Angstrom).
+
+    Returns:
+    str: hexadecimal SHA-1 digest.
+    """
+    nums = np.asarray(atom_nums, dtype=np.int64)
+    centered, axes = principal_axes(cartesians)
+    best = None
+    for signs in PROPER_AXIS_SIGNS:
+        aligned = np.rint(centered @ (axes * signs) / grid).astype(np.int64)
+        order = np.lexsort((aligned[:, 2], aligned[:, 1], aligned[:, 0], nums))
+        candidate = np.column_stack((nums[order], aligned[order])).tobytes()
+        if best is None or candidate < best:
+            best = candidate
+    return hashlib.sha1(best).hexdigest()
+
+
+class json_cache:
+    """
+    Entries kept as JSON in a file of cache_dir(), shared by the caches of results computed from geometries.
+
+    The file holds a format version and the entries; a file of another version is ignored. New entries are merged
+    into whatever is on disk when saved, so several processes may add to the same cache.
+
+    Attributes:
+        path (str): location of the cache file, False to keep the cache in memory only.
+        entries (dict): cached values by key.
+        updated (dict): entries added during this run, not yet written.
+    """
+    filename = None
+    version = 1
+
+    def __init__(self, path=None):
+        self.path = os.path.join(cache_dir(), self.filename) if path is None else path
+        self.entries = self.read()
+        self.updated = {}
+
+    def read(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.version:
+            return {}
+        return data.get('entries', {})
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def add(self, key, value):
+        self.entries[key] = self.updated[key] = value
+
+    # Merge new entries into whatever is on disk by now; a cache that cannot be written is simply not updated
+    def save(self):
+        if not self.updated or not self.path:
+            return
+        entries = self.read()
+        entries.update(self.updated)
+        tmp = '{}.{}.tmp'.format(self.path, os.getpid())
+        try:
+            if not os.path.isdir(os.path.dirname(self.path)):
+                os.makedirs(os.path.dirname(self.path))
+            with open(tmp, 'w') as f:
+                json.dump({'version': self.version, 'entries': entries}, f)
+            os.replace(tmp, self.path)
+        except (IOError, OSError):
+            return
+        self.updated = {}
+
+
+class symmetry_cache(json_cache):
+    """
+    Point groups and symmetry numbers of previously analysed geometries, keyed by geometry_hash.
+
+    Kept as JSON in cache_dir() so that reruns and other projects containing the same structures skip the analysis.
+    Entries are [point group, external symmetry number, internal symmetry number].
+    """
+    filename = 'symmetry.json'
+    version = 2
+
+    def put(self, key, pgroup, ex_sym, int_sym):
+        self.add(key, [pgroup, ex_sym, int_sym])
+
+
 def element_id(massno, num=False):
     """
     Get element symbol from mass number.
@@ -183,28 +592,22 @@ class Logger:
     """
     Enables output to terminal and to text file.
     
-    Writes GV output to .dat or .csv files.
+    Writes the human-readable GV output to a .dat file; machine-readable results are written by result_sink.
     
     Attributes:
-        csv (bool): decides if comma separated value file is written.
         log (file object): file to write GV output to.
-        thermodata (bool): decides if string passed to logger is thermochemical data, needing to be separated by commas 
+        quiet (bool): only write to the file, fatal errors excepted.
     """
-    def __init__(self, filein, append, csv):
-        self.csv = csv
-        if not self.csv:
-            suffix = 'dat'
-        else:
-            suffix = 'csv'
-        self.log = open('{0}_{1}.{2}'.format(filein, append, suffix), 'w')
-
-    def write(self, message, thermodata=False):
-        self.thermodata = thermodata
-        print(message, end='')
-        if self.csv and self.thermodata:
-            items = message.split()
-            message = ",".join(items)
-            message = message + ","
+    # csv is kept in third place for existing callers; CSV files are now written by result_sink
+    def __init__(self, filein, append, csv=False, *, quiet=False):
+        if csv:
+            warnings.warn("Logger no longer writes CSV files, use result_sink", DeprecationWarning, stacklevel=2)
+        self.log = open('{0}_{1}.dat'.format(filein, append), 'w')
+        self.quiet = quiet
+
+    def write(self, message):
+        if not self.quiet:
+            print(message, end='')
         self.log.write(message)
 
     def fatal(self, message):
@@ -217,12 +620,460 @@ class Logger:
         self.log.close()
 
 
+class message_log:
+    """
+    Collects the GV output in memory in place of Logger, for use as a library (see analyze).
+
+    Attributes:
+        messages (list): messages in the order written.
+    """
+    def __init__(self):
+        self.messages = []
+
+    def write(self, message):
+        self.messages.append(message)
+
+    def fatal(self, message):
+        raise GoodVibesError(message.strip())
+
+    def finalize(self):
+        pass
+
+
+class progress_meter:
+    """
+    Single-line progress indicator for batch runs, rewritten in place on stderr.
+
+    Shows the number of files done, files and megabytes parsed per second and the estimated time left, redrawn at
+    most every interval seconds.
+
+    Attributes:
+        total (int): number of files to process.
+        done (int): files processed so far.
+        nbytes (int): size of the files processed so far.
+        start (float): time the first file was started.
+    """
+    def __init__(self, total, label='Evaluating', stream=None, interval=0.2):
+        self.total, self.label, self.interval = total, label, interval
+        self.stream = stream or sys.stderr
+        self.done, self.nbytes = 0, 0
+        self.start = self.shown = time.time()
+
+    def update(self, file=None):
+        self.done += 1
+        if file is not None and os.path.isfile(file):
+            self.nbytes += os.path.getsize(file)
+        now = time.time()
+        if now - self.shown < self.interval and self.done < self.total:
+            return
+        self.shown = now
+        elapsed = max(now - self.start, 1e-9)
+        rate = self.done / elapsed
+        eta = timedelta(seconds=int(round((self.total - self.done) / rate)))
+        self.stream.write('\r   {} {}/{} files  {:.1f} files/s  {:.1f} MB/s  ETA {}  '.format(
+            self.label, self.done, self.total, rate, self.nbytes / elapsed / 1e6, eta))
+        self.stream.flush()
+
+    def finish(self):
+        if self.done:
+            self.stream.write('\n')
+            self.stream.flush()
+
+
+class result_sink:
+    """
+    Collects thermochemistry results as typed rows and writes them in one pass.
+
+    The format follows the file extension: .csv, .jsonl (one JSON object per row) or .npz (one NumPy array per
+    column). Values that do not apply to a row are left empty, null or NaN respectively.
+
+    Rows of relative energies along a PES and of selectivities may follow the structures. The record column then
+    tells the kind of each row ('structure', 'pes' or 'selectivity') and the summary_fields are written as well: PES
+    rows give the species, path, units and relative values in the energy columns, selectivity rows the values of
+    get_selectivity.
+
+    Attributes:
+        path (str): output file.
+        format (str): 'csv', 'jsonl' or 'npz'.
+        rows (list): rows added so far, as dicts over fields (and summary_fields for summary rows).
+    """
+    fields = ('structure', 'filename', 'temperature', 'sp_energy', 'scf_energy', 'zpe', 'enthalpy', 'qh_enthalpy', 'ts',
+              'qh_ts', 'gibbs_free_energy', 'qh_gibbs_free_energy', 'cosmo_qh_gibbs_free_energy', 'boltzmann',
+              'im_freqs', 'point_group')
+    summary_fields = ('record', 'path', 'units', 'excess', 'ratio_percent', 'ratio', 'major', 'ddg')
+    text_fields = ('structure', 'filename', 'im_freqs', 'point_group', 'record', 'path', 'units', 'ratio_percent',
+                   'ratio', 'major')
+    formats = ('csv', 'jsonl', 'npz')
+
+    def __init__(self, path):
+        self.path = path
+        self.format = os.path.splitext(path)[1][1:].lower()
+        if self.format not in self.formats:
+            raise ValueError("results file {} should end in .csv, .jsonl or .npz".format(path))
+        self.rows = []
+
+    @staticmethod
+    def row(file, bbe, temperature, spc=False, qh=False, boltz=None):
+        """
+        Result row of one structure.
+
+        Parameters:
+        file (str): output file of the structure.
+        bbe (calc_bbe): its thermochemistry.
+        temperature (float): temperature of the thermochemistry.
+        spc (bool): single-point energies were combined with the thermal corrections.
+        qh (bool): quasi-harmonic enthalpies were computed.
+        boltz (float): Boltzmann population, if computed.
+
+        Returns:
+        dict: values of result_sink.fields, None where not available.
+        """
+        value = lambda attr: getattr(bbe, attr, None)
+        row = dict.fromkeys(result_sink.fields)
+        row.update(structure=os.path.splitext(os.path.basename(file))[0], filename=file, temperature=temperature,
+                   scf_energy=value('scf_energy'), boltzmann=boltz, point_group=value('point_group'),
+                   im_freqs=list(value('im_frequency_wn') or []))
+        if spc and value('sp_energy') != '!':
+            row['sp_energy'] = value('sp_energy')
+        if hasattr(bbe, 'gibbs_free_energy'):
+            row.update(zpe=bbe.zpe, enthalpy=bbe.enthalpy, ts=temperature * bbe.entropy,
+                       qh_ts=temperature * bbe.qh_entropy, gibbs_free_energy=bbe.gibbs_free_energy,
+                       qh_gibbs_free_energy=bbe.qh_gibbs_free_energy, cosmo_qh_gibbs_free_energy=bbe.cosmo_qhg or None)
+            if qh:
+                row['qh_enthalpy'] = bbe.qh_enthalpy
+        return row
+
+    @staticmethod
+    def relative_values(units, relative, spc=False, qh=False, cosmo=False):
+        """
+        Relative values of a species along a PES, named as the fields of a structure row.
+
+        Parameters:
+        units (str): 'kJ/mol' or 'kcal/mol'.
+        relative (list): values relative to the start of the path in Hartree, ordered as printed by GoodVibes.
+        spc (bool): the values include single-point energies.
+        qh (bool): the values include the quasi-harmonic enthalpy.
+        cosmo (bool): the values include the COSMO-RS free energy.
+
+        Returns:
+        dict: values converted to units.
+        """
+        names = ['sp_energy', 'scf_energy', 'zpe', 'enthalpy'] + ['qh_enthalpy'] * qh + \
+                ['ts', 'qh_ts', 'gibbs_free_energy', 'qh_gibbs_free_energy'] + ['cosmo_qh_gibbs_free_energy'] * cosmo
+        conversion = J_TO_AU / 1000.0 if units == 'kJ/mol' else KCAL_TO_AU
+        values = dict((name, value * conversion) for name, value in zip(names, relative))
+        if not spc:
+            del values['sp_energy']
+        return values
+
+    def add(self, file, bbe, temperature, **kwargs):
+        self.rows.append(self.row(file, bbe, temperature, **kwargs))
+
+    def add_pes(self, path, species, temperature, units, relative, spc=False, qh=False, cosmo=False):
+        """Row of a species along a reaction path, see relative_values."""
+        row = dict.fromkeys(self.fields + self.summary_fields)
+        row.update(self.relative_values(units, relative, spc, qh, cosmo))
+        row.update(record='pes', structure=species, path=path, temperature=temperature, units=units)
+        self.rows.append(row)
+
+    def add_selectivity(self, temperature, excess, ratio_percent, ratio, major, ddg):
+        """Row of the selectivity, as obtained by get_selectivity."""
+        row = dict.fromkeys(self.fields + self.summary_fields)
+        row.update(record='selectivity', temperature=temperature, excess=excess, ratio_percent=ratio_percent,
+                   ratio=ratio, major=major, ddg=ddg)
+        self.rows.append(row)
+
+    def write(self):
+        # Summary columns are only written along with summary rows
+        summaries = any('record' in row for row in self.rows)
+        fields = self.fields + self.summary_fields if summaries else self.fields
+        rows = [dict(dict.fromkeys(fields), record='structure', **row) if summaries and 'record' not in row else row
+                for row in self.rows]
+        if self.format == 'csv':
+            with open(self.path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                writer.writerows([['' if row[key] is None else ' '.join('{:.2f}'.format(freq) for freq in row[key])
+                                   if key == 'im_freqs' else row[key] for key in fields] for row in rows])
+        elif self.format == 'jsonl':
+            with open(self.path, 'w') as f:
+                f.write(''.join(json.dumps(row) + '\n' for row in rows))
+        else:
+            columns = {}
+            for key in fields:
+                values = [row[key] for row in rows]
+                if key == 'im_freqs':
+                    columns[key] = np.array([' '.join('{:.2f}'.format(freq) for freq in v or []) for v in values],
+                                            dtype=str)
+                elif key in self.text_fields:
+                    columns[key] = np.array(['' if v is None else str(v) for v in values], dtype=str)
+                else:
+                    columns[key] = np.array([np.nan if v is None else v for v in values], dtype=float)
+            np.savez(self.path, **columns)
+
+
+class jsonl_stream:
+    """
+    Streams results as JSON Lines while a run progresses.
+
+    Each record is written and flushed as soon as it is available, so that consumers can follow the file and an
+    interrupted run keeps every completed result. The 'record' field gives the kind: 'structure' records (see
+    result_sink.row) as each file is evaluated, then 'boltzmann', 'selectivity' and 'pes' summaries.
+
+    Attributes:
+        path (str): output file.
+        stream (file object): the open file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.stream = open(path, 'w')
+
+    def write(self, record, **values):
+        self.stream.write(json.dumps(dict([('record', record)] + list(values.items()))) + '\n')
+        self.stream.flush()
+
+    def structure(self, file, bbe, temperature, **kwargs):
+        self.write('structure', **result_sink.row(file, bbe, temperature, **kwargs))
+
+    def boltzmann(self, files, boltz_facs, boltz_sum, weighted_free_energy, temperature):
+        clusters = dict((key[len('cluster-'):], {'qh_gibbs_free_energy': weighted_free_energy[key] / boltz_facs[key],
+                                                 'population': boltz_facs[key] / boltz_sum})
+                        for key in boltz_facs if key.startswith('cluster-'))
+        populations = dict((os.path.splitext(os.path.basename(file))[0], boltz_facs[file] / boltz_sum)
+                           for file in files if file in boltz_facs)
+        self.write('boltzmann', temperature=temperature, populations=populations, clusters=clusters)
+
+    def pes(self, path, species, temperature, units, relative, spc=False, qh=False, cosmo=False):
+        self.write('pes', path=path, species=species, temperature=temperature, units=units,
+                   **result_sink.relative_values(units, relative, spc, qh, cosmo))
+
+    def close(self):
+        self.stream.close()
+
+
+class project_db:
+    """
+    SQLite database of the parsed inputs and evaluated thermochemistry of a project.
+
+    Output files are identified by the SHA-1 of their contents, remembered for each path together with its size and
+    modification time so that unchanged files are not reread. The initial read of each file (level of theory,
+    solvation model, termination) is stored by content hash, and thermochemistry by content hash and settings hash,
+    so that a rerun only parses and evaluates new or changed files. The content hash of a result also covers the
+    single-point file, if any (see result_key). Results are indexed by settings hash and qh-G(T) for Boltzmann
+    summaries.
+
+    Attributes:
+        path (str): database file.
+        db (sqlite3.Connection): open connection.
+    """
+    version = 1
+    schema = """
+        CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, content_hash TEXT);
+        CREATE TABLE IF NOT EXISTS inputs (content_hash TEXT PRIMARY KEY, initial TEXT);
+        CREATE TABLE IF NOT EXISTS results (content_hash TEXT, settings_hash TEXT, name TEXT,
+                                            qh_gibbs_free_energy REAL, data TEXT,
+                                            PRIMARY KEY (content_hash, settings_hash));
+        CREATE INDEX IF NOT EXISTS results_energy ON results (settings_hash, qh_gibbs_free_energy);
+        CREATE INDEX IF NOT EXISTS results_name ON results (settings_hash, name);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        if self.db.execute('PRAGMA user_version').fetchone()[0] not in (0, self.version):
+            self.db.executescript('DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS inputs; '
+                                  'DROP TABLE IF EXISTS results;')
+        self.db.executescript(self.schema)
+        self.db.execute('PRAGMA user_version = {}'.format(self.version))
+
+    def content_hash(self, file):
+        """SHA-1 of the contents of a file, only recomputed when its size or modification time changes."""
+        path, stat = os.path.abspath(file), os.stat(file)
+        row = self.db.execute('SELECT size, mtime_ns, content_hash FROM files WHERE path = ?', (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        digest = hashlib.sha1()
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        key = digest.hexdigest()
+        self.db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)', (path, stat.st_size, stat.st_mtime_ns, key))
+        return key
+
+    @staticmethod
+    def settings_hash(settings):
+        """SHA-1 of the options that determine the thermochemistry, given as a JSON-serializable dict."""
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def read_initial(self, file):
+        """read_initial of a file, stored by content hash."""
+        key = self.content_hash(file)
+        row = self.db.execute('SELECT initial FROM inputs WHERE content_hash = ?', (key,)).fetchone()
+        if row:
+            return tuple(json.loads(row[0]))
+        initial = read_initial(file)
+        self.db.execute('INSERT OR REPLACE INTO inputs VALUES (?, ?)', (key, json.dumps(initial)))
+        return initial
+
+    def result_key(self, file, spc_file=None):
+        """Content hash of a file, combined with that of its single-point file if that is another file."""
+        if spc_file is None or spc_file == file:
+            return self.content_hash(file)
+        return self.content_hash(file) + '+' + self.content_hash(spc_file)
+
+    def results(self, files, settings, spc_files=None):
+        """
+        Stored thermochemistry of files evaluated before with the same settings.
+
+        Parameters:
+        files (list): output files.
+        settings (str): settings hash.
+        spc_files (dict): single-point file of each output file, if any.
+
+        Returns:
+        dict: calc_bbe object of each file found, rebuilt without reading the file.
+        """
+        spc_files = spc_files or {}
+        by_key = {}
+        for file in files:
+            by_key.setdefault(self.result_key(file, spc_files.get(file)), []).append(file)
+        keys, stored = list(by_key), {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.db.execute('SELECT content_hash, data FROM results WHERE settings_hash = ? AND content_hash '
+                                   'IN ({})'.format(','.join('?' * len(chunk))), [settings] + chunk)
+            for key, data in rows:
+                for file in by_key[key]:
+                    stored[file] = self.restore(json.loads(data), file)
+        return stored
+
+    def put(self, file, settings, bbe, spc_file=None):
+        """Store (or replace) the thermochemistry of a file evaluated with the given settings hash."""
+        data = dict((key, value) for key, value in vars(bbe).items() if key not in ('xyz', '_sp_xyz'))
+        data['xyz'] = vars(bbe.xyz)
+        self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', (
+            self.result_key(file, spc_file), settings, os.path.splitext(os.path.basename(file))[0],
+            getattr(bbe, 'qh_gibbs_free_energy', None), json.dumps(data, default=lambda value: value.tolist())))
+
+    @staticmethod
+    def restore(data, file):
+        bbe = calc_bbe.__new__(calc_bbe)
+        geometry = getoutData.__new__(getoutData)
+        geometry.__dict__.update(data.pop('xyz'))
+        bbe.__dict__.update(data)
+        bbe.xyz = geometry
+        # The same contents may have been stored from another path
+        if getattr(bbe, 'sp_file', None) == bbe.file:
+            bbe.sp_file = file
+        bbe.file = file
+        return bbe
+
+    def populations(self, settings, temperature, names=None):
+        """
+        Boltzmann populations from the qh-G(T) of stored structures.
+
+        Parameters:
+        settings (str): settings hash the structures were evaluated with.
+        temperature (float): temperature to compute Boltzmann populations at.
+        names (list): structure names to include, by default every structure evaluated with these settings.
+
+        Returns:
+        dict: population of each structure name.
+        """
+        query = 'SELECT name, qh_gibbs_free_energy FROM results WHERE settings_hash = ? AND ' \
+                'qh_gibbs_free_energy IS NOT NULL'
+        args = [settings]
+        if names is not None:
+            query += ' AND name IN ({})'.format(','.join('?' * len(names)))
+            args += list(names)
+        rows = self.db.execute(query + ' ORDER BY qh_gibbs_free_energy', args).fetchall()
+        if not rows:
+            return {}
+        return dict(zip([row[0] for row in rows], boltz_populations([row[1] for row in rows], temperature).tolist()))
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+class memory_store:
+    """
+    Parsed inputs and thermochemistry kept in warm_caches, with the interface of project_db.
+
+    Files are identified by their file_signature, so a file is parsed and evaluated again once it changes. Used by
+    analyze and by the service (see serve) when no project database is given.
+    """
+    @staticmethod
+    def content_hash(file):
+        return file_signature(file)
+
+    @staticmethod
+    def settings_hash(settings):
+        return json.dumps(settings, sort_keys=True)
+
+    def read_initial(self, file):
+        """read_initial of a file, kept until the file changes."""
+        initial, key = warm_cache('initial', dict), json.dumps(file_signature(file))
+        if key not in initial:
+            initial[key] = read_initial(file)
+        return initial[key]
+
+    def result_key(self, file, spc_file=None):
+        return json.dumps([file_signature(file), spc_file and file_signature(spc_file)])
+
+    def results(self, files, settings, spc_files=None):
+        """Copies of the thermochemistry of files evaluated before with the same settings, see project_db.results."""
+        spc_files, thermo, stored = spc_files or {}, warm_cache('thermo', dict), {}
+        for file in files:
+            key = (self.result_key(file, spc_files.get(file)), settings)
+            if key in thermo:
+                # Later steps may set attributes such as the degeneracy
+                stored[file] = copy.copy(thermo[key])
+        return stored
+
+    def put(self, file, settings, bbe, spc_file=None):
+        warm_cache('thermo', dict)[(self.result_key(file, spc_file), settings)] = copy.copy(bbe)
+
+    def commit(self):
+        pass
+
+
+def thermo_settings(options, file_id):
+    """
+    Options that determine the thermochemistry of a file, as a JSON-serializable dict (see project_db.settings_hash).
+
+    Parameters:
+    options (argparse.Namespace): GoodVibes options.
+    file_id (function): identifies the COSMO-RS and D3 reference files given as paths, e.g. by their contents.
+
+    Returns:
+    dict: settings.
+    """
+    cosmo_id = options.cosmo
+    if options.cosmo and os.path.isfile(options.cosmo):
+        cosmo_id = file_id(options.cosmo)
+    d3_id = False
+    if options.D3 or options.D3BJ:
+        d3_id = options.d3_reference or d3_reference_path()
+        if os.path.isfile(d3_id):
+            d3_id = file_id(d3_id)
+    return dict(version=__version__, QS=options.QS, QH=options.QH, S_freq_cutoff=options.S_freq_cutoff,
+                H_freq_cutoff=options.H_freq_cutoff, temperature=options.temperature, conc=options.conc,
+                freq_scale_factor=options.freq_scale_factor, freespace=options.freespace, spc=options.spc,
+                invert=options.invert, media=options.media, ssymm=options.ssymm,
+                mm_freq_scale_factor=options.mm_freq_scale_factor, inertia=options.inertia, cosmo=cosmo_id,
+                D3=options.D3, D3BJ=options.D3BJ, ATM=options.ATM, d3_reference=d3_id)
+
+
 # Enables output of optimized coordinates to a single xyz-formatted file
 class xyz_out:
     """
     Enables output of optimized coordinates to a single xyz-formatted file.
     
-    Writes Cartesian coordinates of parsed chemical input.
+    Writes Cartesian coordinates of parsed chemical input, one complete frame per write.
     
     Attributes:
         xyz (file object): path in current working directory to write Cartesian coordinates.
@@ -233,17 +1084,231 @@ class xyz_out:
     def write_text(self, message):
         self.xyz.write(message + "\n")
 
-    def write_coords(self, atoms, coords):
-        for n, carts in enumerate(coords):
-            self.xyz.write('{:>1}'.format(atoms[n]))
-            for cart in carts:
-                self.xyz.write('{:13.6f}'.format(cart))
-            self.xyz.write('\n')
+    def write_frame(self, atoms, coords, comment):
+        lines = ['{:>1}{:13.6f}{:13.6f}{:13.6f}'.format(atom, *carts) for atom, carts in zip(atoms, coords)]
+        self.xyz.write('{}\n{}\n{}\n'.format(len(lines), comment, '\n'.join(lines)))
 
     def finalize(self):
         self.xyz.close()
 
 
+def xyz_ensemble(files, thermo_data, populations=None, sort=False, min_population=None, annotate=False):
+    """
+    Frames of a multi-structure .xyz file, built from the geometries already parsed by calc_bbe.
+
+    Parameters:
+    files (list): structures to write, in their default order.
+    thermo_data (dict): calc_bbe objects of each file.
+    populations (dict): Boltzmann population of each file, used to filter and annotate frames.
+    sort (bool): order frames by increasing qh-G(T), structures without free energies last.
+    min_population (float): leave out structures with a lower Boltzmann population.
+    annotate (bool): add qh-G(T) and the Boltzmann population to the comment lines.
+
+    Returns:
+    list: atom types, cartesians and comment line of each frame.
+    """
+    frames = []
+    for file in files:
+        bbe = thermo_data[file]
+        geometry = getattr(bbe, 'xyz', None)
+        if not hasattr(geometry, 'cartesians') or not hasattr(geometry, 'atom_types'):
+            continue
+        population = populations.get(file) if populations else None
+        if min_population is not None and (population is None or population < min_population):
+            continue
+        qh_gibbs_free_energy = getattr(bbe, 'qh_gibbs_free_energy', None)
+        name = os.path.splitext(os.path.basename(file))[0]
+        if hasattr(bbe, 'scf_energy'):
+            comment = '{:<39} {:>13} {:13.6f}'.format(name, 'Eopt', bbe.scf_energy)
+        else:
+            comment = '{:<39}'.format(name)
+        if annotate and qh_gibbs_free_energy is not None:
+            comment += ' {:>13} {:13.6f}'.format('qh-G(T)', qh_gibbs_free_energy)
+        if annotate and population is not None:
+            comment += ' {:>7} {:7.3f}'.format('Boltz', population)
+        frames.append((qh_gibbs_free_energy, geometry.atom_types, geometry.cartesians, comment))
+    if sort:
+        frames.sort(key=lambda frame: (frame[0] is None, frame[0] or 0.0))
+    return [frame[1:] for frame in frames]
+
+
+def graph_classes(atom_nums, indptr, indices):
+    """
+    Partition atoms into classes of topologically equivalent atoms by colour refinement.
+
+    Starting from the atomic numbers, each atom's class is repeatedly refined by the multiset of its neighbours'
+    classes (Weisfeiler-Lehman), hashed into 64 bits from random keys of the atom's own class and of its neighbours'
+    classes, until the number of classes stops growing. Atoms related by a graph automorphism always end up in the same class.
+
+    Parameters:
+    atom_nums (list): atomic numbers.
+    indptr (numpy.ndarray): CSR row pointer of the bond graph.
+    indices (numpy.ndarray): CSR column indices of the bond graph.
+
+    Returns:
+    numpy.ndarray: class label of each atom.
+    """
+    n = len(atom_nums)
+    classes = np.unique(np.asarray(atom_nums), return_inverse=True)[1].reshape(-1)
+    if n == 0:
+        return classes
+    table = np.random.default_rng(0).integers(0, 2 ** 63, size=n, dtype=np.uint64)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    count = len(np.unique(classes))
+    while True:
+        neighbors = np.zeros(n, dtype=np.uint64)
+        np.add.at(neighbors, rows, table[classes[indices]])
+        refined = np.unique(table[classes] * np.uint64(0x9E3779B97F4A7C15) + neighbors,
+                            return_inverse=True)[1].reshape(-1)
+        new_count = refined.max() + 1
+        classes = refined
+        if new_count == count:
+            return classes
+        count = new_count
+
+
+def graph_bridges(indptr, indices):
+    """
+    Bonds that are not part of any ring, found with an iterative depth-first search (Tarjan).
+
+    Parameters:
+    indptr (numpy.ndarray): CSR row pointer of the bond graph.
+    indices (numpy.ndarray): CSR column indices of the bond graph.
+
+    Returns:
+    list: (a, b, n_b, n_total) for each bridge, where n_b atoms remain connected to b once the bond is cut and
+    n_total is the size of the molecule (connected component) containing it.
+    """
+    n = len(indptr) - 1
+    disc, low, size = [-1] * n, [0] * n, [1] * n
+    bridges, timer = [], 0
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        first = len(bridges)
+        component = 1
+        stack = [[root, -1, indptr[root]]]
+        while stack:
+            frame = stack[-1]
+            v, parent, ptr = frame
+            if ptr < indptr[v + 1]:
+                frame[2] += 1
+                w = int(indices[ptr])
+                if w == parent:
+                    continue
+                if disc[w] < 0:
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    component += 1
+                    stack.append([w, v, indptr[w]])
+                elif disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                stack.pop()
+                if parent >= 0:
+                    low[parent] = min(low[parent], low[v])
+                    size[parent] += size[v]
+                    if low[v] > disc[parent]:
+                        bridges.append([parent, v, size[v]])
+        for bridge in bridges[first:]:
+            bridge.append(component)
+    return [tuple(bridge) for bridge in bridges]
+
+
+def rotor_symmetry(cartesians, classes, neighbors, a, b, axis_tol=0.3, tol=0.4):
+    """
+    Symmetry number of the group on atom b rotating about the bond a-b.
+
+    The atoms bonded to b (other than a and any lying on the axis) must all be topologically equivalent, and a
+    rotation by 360/k degrees about the bond must carry each of the k atoms onto another one.
+
+    Parameters:
+    cartesians (numpy.ndarray): Cartesian coordinates in Angstrom.
+    classes (numpy.ndarray): topological class of each atom, from graph_classes.
+    neighbors (list): atoms bonded to b.
+    a (int): atom on the fixed side of the bond.
+    b (int): atom carrying the rotating group.
+    axis_tol (float): distance from the axis (Angstrom) below which an atom is taken to lie on it.
+    tol (float): largest mismatch (Angstrom) of a rotated atom.
+
+    Returns:
+    int: rotor symmetry number.
+    """
+    axis = cartesians[b] - cartesians[a]
+    axis = axis / np.linalg.norm(axis)
+    vecs = cartesians[[atom for atom in neighbors if atom != a]] - cartesians[b]
+    branch = [atom for atom in neighbors if atom != a]
+    off_axis = np.linalg.norm(vecs - np.outer(vecs @ axis, axis), axis=1) > axis_tol
+    vecs, branch = vecs[off_axis], np.array(branch)[off_axis]
+    k = len(branch)
+    if k < 2 or len(set(classes[branch].tolist())) != 1:
+        return 1
+    angle = 2 * math.pi / k
+    rotated = (vecs * math.cos(angle) + np.cross(axis, vecs) * math.sin(angle)
+               + np.outer(vecs @ axis, axis) * (1 - math.cos(angle)))
+    mismatch = np.linalg.norm(rotated[:, None] - vecs[None, :], axis=-1).min(axis=1)
+    return k if np.all(mismatch < tol) else 1
+
+
+def internal_rotors(atom_nums, atom_types, cartesians, adjacency, single_tol=0.12):
+    """
+    Rotatable bonds and the symmetry number of each internal rotor.
+
+    A bond is rotatable when it is not in a ring, neither atom is terminal and it is no shorter than the sum of
+    covalent radii less single_tol (shorter bonds are taken to be multiple bonds). The rotor is the smaller of the
+    two fragments; for equal fragments the larger symmetry number of the two ends is used.
+
+    Parameters:
+    atom_nums (list): atomic numbers.
+    atom_types (list): element symbols.
+    cartesians (list): Cartesian coordinates in Angstrom.
+    adjacency (tuple): CSR bond graph (indptr, indices), see connectivity_graph.
+    single_tol (float): allowance (Angstrom) below the sum of covalent radii for a single bond.
+
+    Returns:
+    list: (a, b, sigma) for each rotatable bond, with b the atom carrying the rotor.
+    """
+    indptr, indices = adjacency
+    xyz = np.asarray(cartesians, dtype=float).reshape(-1, 3)
+    classes = graph_classes(atom_nums, indptr, indices)
+    neighbors = lambda atom: indices[indptr[atom]:indptr[atom + 1]].tolist()
+    rotors = []
+    for a, b, n_b, n_total in graph_bridges(indptr, indices):
+        if indptr[a + 1] - indptr[a] < 2 or indptr[b + 1] - indptr[b] < 2:
+            continue
+        if np.linalg.norm(xyz[a] - xyz[b]) < RADII[atom_types[a]] + RADII[atom_types[b]] - single_tol:
+            continue
+        if 2 * n_b > n_total:
+            a, b = b, a
+        sigma = rotor_symmetry(xyz, classes, neighbors(b), a, b)
+        if 2 * n_b == n_total:
+            back = rotor_symmetry(xyz, classes, neighbors(a), b, a)
+            if back > sigma:
+                a, b, sigma = b, a, back
+        rotors.append((a, b, sigma))
+    return rotors
+
+
+def internal_symmetry(xyz):
+    """
+    Internal symmetry number: the product of the symmetry numbers of all internal rotors (CH3, CF3, tBu, NO2,
+    phenyl, ...), see internal_rotors.
+
+    Parameters:
+    xyz (getoutData object): geometry and atom types of the structure.
+
+    Returns:
+    int: internal symmetry number.
+    """
+    xyz.get_connectivity()
+    int_sym = 1
+    for _, _, sigma in internal_rotors(xyz.atom_nums, xyz.atom_types, xyz.cartesians, xyz.adjacency):
+        int_sym *= sigma
+    return int_sym
+
+
 class calc_bbe:
     """
     The function to compute the "black box" entropy and enthalpy values along with all other thermochemical quantities.
@@ -287,10 +1352,11 @@ class calc_bbe:
         gibbs_free_energy (float): Gibbs free energy of chemical system computed from enthalpy and entropy.
         qh_gibbs_free_energy (float): Gibbs free energy of chemical system computed from quasi-harmonic enthalpy and/or entropy.
         cosmo_qhg (float): quasi-harmonic Gibbs free energy with COSMO-RS correction for Gibbs free energy of solvation 
+        d3_energy (float): D3 dispersion energy added to the SCF (or single-point) energy, zero unless requested.
         linear_warning (bool): flag for linear molecules, may be missing a rotational constant. 
     """
     def __init__(self, file, QS, QH, s_freq_cutoff, H_FREQ_CUTOFF, temperature, conc, freq_scale_factor, solv, spc,
-                 invert, d3_term, ssymm=False, cosmo=None, mm_freq_scale_factor=False,inertia='global'):
+                 invert, d3_term, ssymm=False, cosmo=None, mm_freq_scale_factor=False,inertia='global', xyz=None):
         # List of frequencies and default values
         im_freq_cutoff, frequency_wn, im_frequency_wn, rotemp, roconst, linear_mol, link, freqloc, linkmax, symmno, self.cpu, inverted_freqs = 0.0, [], [], [
             0.0, 0.0, 0.0], [0.0, 0.0, 0.0], 0, 0, 0, 0, 1, [0, 0, 0, 0, 0], []
@@ -300,9 +1366,11 @@ class calc_bbe:
         else:
             fract_modelsys = []
             freq_scale_factor = [freq_scale_factor, mm_freq_scale_factor]
-        self.xyz = getoutData(file)
+        # The geometry may have been parsed already, e.g. for symmetry numbers
+        self.xyz = getoutData(file) if xyz is None else xyz
         self.job_type = jobtype(file)
         self.roconst = []
+        self.d3_energy = d3_term
         # Parse some useful information from the file 
         self.sp_energy, self.program, self.version_program, self.solvation_model, self.file, self.charge, self.empirical_dispersion, self.multiplicity = parse_data(
             file)
@@ -313,9 +1381,17 @@ class calc_bbe:
         if spc != False and spc != 'link':
             name, ext = os.path.splitext(file)
             try:
+                # The single-point file is read once for its energy, CPU time and geometry
+                sp_path = next((name + '_' + spc + sp_ext for sp_ext in ('.log', '.out')
+                                if os.path.exists(name + '_' + spc + sp_ext)), None)
+                if sp_path is None:
+                    raise ValueError("File {} does not exist".format(name + '_' + spc + ext))
+                with open(sp_path) as f:
+                    sp_data = f.readlines()
                 self.sp_energy, self.sp_program, self.sp_version_program, self.sp_solvation_model, self.sp_file, self.sp_charge, self.sp_empirical_dispersion, self.sp_multiplicity = parse_data(
-                    name + '_' + spc + ext)
-                self.cpu = sp_cpu(name + '_' + spc + ext)
+                    sp_path, sp_data)
+                self.cpu = sp_cpu(sp_path, sp_data)
+                self._sp_xyz = getoutData(sp_path, sp_data)
             except ValueError:
                 self.sp_energy = '!'
                 pass
@@ -444,7 +1520,6 @@ class calc_bbe:
                     self.cpu = [days, hours, mins, secs, msecs]
                     
         if self.sp_program == 'NWChem' or self.program == 'NWChem':
-            print("Parsing NWChem output...")
             # Iterate
             for i,line in enumerate(g_output):
                 #scanning for low frequencies...
@@ -494,7 +1569,6 @@ class calc_bbe:
                         linear_mol = 1
                 # Grab rotational constants (convert cm-1 to GHz)
                 elif line.strip().startswith('A=') or line.strip().startswith('B=') or line.strip().startswith('C=') :
-                    print(line.strip().split()[1])
                     letter=line.strip()[0]
                     h = 0
                     if letter == 'A':
@@ -514,10 +1588,7 @@ class calc_bbe:
                     self.cpu = [days,hours,mins,secs,msecs]       
 
         self.inverted_freqs = inverted_freqs
-        
-        print("freqs = " + str(frequency_wn))
-        print("inverted freqs = " + str(inverted_freqs))
-        
+
         # Skip the calculation if unable to parse the frequencies or zpe from the output file
         if hasattr(self, "zero_point_corr") and rotemp:
             cutoffs = [s_freq_cutoff for freq in frequency_wn]
@@ -603,7 +1674,9 @@ class calc_bbe:
 
             # Symmetry - entropy correction for molecular symmetry
             if ssymm:
-                sym_entropy_correction, pgroup = self.sym_correction(file.split('.')[0].replace('/', '_'))
+                # Precomputed (external symmetry number, point group, internal symmetry number) may be passed instead of True
+                sym_entropy_correction, pgroup = self.sym_correction(file.split('.')[0].replace('/', '_'),
+                                                                     None if ssymm is True else ssymm)
                 self.point_group = pgroup
                 self.entropy += sym_entropy_correction
                 self.qh_entropy += sym_entropy_correction
@@ -628,79 +1701,35 @@ class calc_bbe:
 
     # Get external symmetry number
     def ex_sym(self, file):
-        coords_string = self.xyz.coords_string()
-        coords = coords_string.encode('utf-8')
-        c_coords = ctypes.c_char_p(coords)
-
-        # Determine OS with sys.platform to see what compiled symmetry file to use
-        platform = sys.platform
-        if platform.startswith('linux'):  # linux - .so file
-            path1 = sharepath('symmetry_linux.so')
-            newlib = 'lib_' + file + '.so'
-            path2 = sharepath(newlib)
-            copy = 'cp ' + path1 + ' ' + path2
-            os.popen(copy).close()
-            symmetry = ctypes.CDLL(path2)
-        elif platform.startswith('darwin'):  # macOS - .dylib file
-            path1 = sharepath('symmetry_mac.dylib')
-            newlib = 'lib_' + file + '.dylib'
-            path2 = sharepath(newlib)
-            copy = 'cp ' + path1 + ' ' + path2
-            os.popen(copy).close()
-            symmetry = ctypes.CDLL(path2)
-        elif platform.startswith('win'):  # windows - .dll file
-            path1 = sharepath('symmetry_windows.dll')
-            newlib = 'lib_' + file + '.dll'
-            path2 = sharepath(newlib)
-            copy = 'copy ' + path1 + ' ' + path2
-            os.popen(copy).close()
-            symmetry = ctypes.cdll.LoadLibrary(path2)
-
-        symmetry.symmetry.restype = ctypes.c_char_p
-        pgroup = symmetry.symmetry(c_coords).decode('utf-8')
-        ex_sym = pg_sm.get(pgroup)
-
-        # Remove file
-        if platform.startswith('linux'):  # linux - .so file
-            remove = 'rm ' + path2
-            os.popen(remove).close()
-        elif platform.startswith('darwin'):  # macOS - .dylib file
-            remove = 'rm ' + path2
-            os.popen(remove).close()
-        elif platform.startswith('win'):  # windows - .dll file
-            handle = symmetry._handle
-            del symmetry
-            ctypes.windll.kernel32.FreeLibrary(ctypes.c_void_p(handle))
-            remove = 'Del /F "' + path2 + '"'
-            os.popen(remove).close()
-
-        return ex_sym, pgroup
+        pgroups, sym_nums = point_groups([self.xyz])
+        return sym_nums[0], pgroups[0]
 
     def int_sym(self):
-        self.xyz.get_connectivity()
-        cap = [1, 9, 17]
-        neighbor = [5, 6, 7, 8, 14, 15, 16]
-        int_sym = 1
-
-        for i, row in enumerate(self.xyz.connectivity):
-            if self.xyz.atom_nums[i] != 6: continue
-            As = np.array(self.xyz.atom_nums)[row]
-            if len(As == 4):
-                neighbors = [x for x in As if x in neighbor]
-                caps = [x for x in As if x in cap]
-                if (len(neighbors) == 1) and (len(set(caps)) == 1):
-                    int_sym *= 3
-        return int_sym
-
-    def sym_correction(self, file):
-        ex_sym, pgroup = self.ex_sym(file)
-        int_sym = self.int_sym()
-        #override int_sym
-        int_sym = 1
+        return internal_symmetry(self.xyz)
+
+    def sym_correction(self, file, symm=None):
+        if symm is None:
+            ex_sym, pgroup = self.ex_sym(file)
+            int_sym = self.int_sym()
+        else:
+            ex_sym, pgroup, int_sym = symm
         sym_num = ex_sym * int_sym
         sym_correction = (-GAS_CONSTANT * math.log(sym_num)) / J_TO_AU
         return sym_correction, pgroup
 
+    # Geometry of the single-point calculation, parsed with its energy or on first use (e.g. for stored results)
+    @property
+    def sp_xyz(self):
+        if not hasattr(self, '_sp_xyz'):
+            sp_file = getattr(self, 'sp_file', None)
+            if sp_file is None or not os.path.isfile(sp_file):
+                self._sp_xyz = None
+            elif sp_file == self.file:
+                self._sp_xyz = self.xyz
+            else:
+                self._sp_xyz = getoutData(sp_file)
+        return self._sp_xyz
+
 class get_pes:
     """
     Obtain relative thermochemistry between species and for reactions.
@@ -738,6 +1767,7 @@ class get_pes:
         g_qhgvals (list): relative quasi-harmonic Gibbs free energy values used for graphing.
         g_species_qhgzero (list):quasi-harmonic Gibbs free energy "zero" values used for graphing.
         g_rel_val (list): relative Gibbs free energy values used for graphing.
+        ts (list): flags marking which points of each reaction pathway are transition states.
     """
     def __init__(self, file, thermo_data, log, temperature, gconf, QH, cosmo=None, cosmo_int=None):
         # Default values
@@ -838,6 +1868,7 @@ class get_pes:
         self.spc_abs, self.e_abs, self.zpe_abs, self.h_abs, self.qh_abs, self.s_abs, self.qs_abs, self.g_abs, self.qhg_abs, self.cosmo_qhg_abs = [], [], [], [], [], [], [], [], [], []
         self.spc_zero, self.e_zero, self.zpe_zero, self.h_zero, self.qh_zero, self.ts_zero, self.qhts_zero, self.g_zero, self.qhg_zero, self.cosmo_qhg_zero = [], [], [], [], [], [], [], [], [], []
         self.g_qhgvals, self.g_species_qhgzero, self.g_rel_val = [], [], []
+        self.ts = []
         # Loop over .yaml file, grab energies, populate arrays and compute Boltzmann factors
         with open(file) as f:
             data = f.readlines()
@@ -899,7 +1930,8 @@ class get_pes:
                                                 g_rel = thermo_data[conformer].cosmo_qhg - g_min
                                             else:
                                                 g_rel = thermo_data[conformer].qh_gibbs_free_energy - g_min
-                                            boltz_fac = math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
+                                            boltz_fac = getattr(thermo_data[conformer], "degeneracy", 1) * math.exp(
+                                                -g_rel * J_TO_AU / GAS_CONSTANT / temperature)
                                             boltz_sum += boltz_fac
                                         for conformer in species[
                                             structure]:  # Calculate relative data based on Gmin and the Boltzmann sum
@@ -907,7 +1939,8 @@ class get_pes:
                                                 g_rel = thermo_data[conformer].cosmo_qhg - g_min
                                             else:
                                                 g_rel = thermo_data[conformer].qh_gibbs_free_energy - g_min
-                                            boltz_fac = math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
+                                            degeneracy = getattr(thermo_data[conformer], "degeneracy", 1)
+                                            boltz_fac = degeneracy * math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
                                             boltz_prob = boltz_fac / boltz_sum
                                             #if no contribution, skip further calculations
                                             if boltz_prob == 0.0:
@@ -918,19 +1951,19 @@ class get_pes:
                                                 spc_zero += thermo_data[conformer].sp_energy * boltz_prob
                                             if hasattr(thermo_data[conformer], "sp_energy") and thermo_data[
                                                 conformer].sp_energy is '!':
-                                                sys.exit(
+                                                raise GoodVibesError(
                                                     "Not all files contain a SPC value, relative values will not be calculated.")
                                             e_zero += thermo_data[conformer].scf_energy * boltz_prob
                                             zpe_zero += thermo_data[conformer].zpe * boltz_prob
                                             # Default calculate gconf correction for conformers, skip if no contribution
-                                            if gconf and boltz_prob > 0.0 and boltz_prob != 1.0:  
+                                            if gconf and boltz_prob > 0.0 and (boltz_prob != 1.0 or degeneracy > 1):
                                                 h_conf += thermo_data[conformer].enthalpy * boltz_prob
                                                 s_conf += thermo_data[conformer].entropy * boltz_prob
-                                                s_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob)
+                                                s_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob / degeneracy)
 
                                                 qh_conf += thermo_data[conformer].qh_enthalpy * boltz_prob
                                                 qs_conf += thermo_data[conformer].qh_entropy * boltz_prob
-                                                qs_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob)
+                                                qs_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob / degeneracy)
                                             elif gconf and boltz_prob == 1.0:
                                                 h_conf += thermo_data[conformer].enthalpy
                                                 s_conf += thermo_data[conformer].entropy
@@ -965,7 +1998,7 @@ class get_pes:
                                         "   Warning! Structure " + structure + ' has not been defined correctly as energy-zero in ' + file + '\n')
                                     log.write(
                                         "   Make sure this structure matches one of the SPECIES defined in the same file\n")
-                                    sys.exit("   Please edit " + file + " and try again\n")
+                                    raise GoodVibesError("   Please edit " + file + " and try again\n")
                             # Set zero vals here
                             conformers, single_structure, mix = False, False, False
                             for structure in zero_structures:
@@ -1027,6 +2060,7 @@ class get_pes:
                             self.g_qhgvals.append([])
                             self.g_species_qhgzero.append([])
                             self.g_rel_val.append([])  # graphing
+                            self.ts.append([])
 
                             pathway, pes = line.strip().replace(':', '=').split("=")
                             pes = pes.strip()
@@ -1081,7 +2115,8 @@ class get_pes:
                                                         g_rel = thermo_data[conformer].cosmo_qhg - g_min
                                                     else:
                                                         g_rel = thermo_data[conformer].qh_gibbs_free_energy - g_min
-                                                    boltz_fac = math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
+                                                    boltz_fac = getattr(thermo_data[conformer], "degeneracy", 1) * math.exp(
+                                                        -g_rel * J_TO_AU / GAS_CONSTANT / temperature)
                                                     boltz_sum += boltz_fac
                                                 # Calculate relative data based on Gmin and the Boltzmann sum
                                                 for conformer in species[structure]:
@@ -1089,7 +2124,8 @@ class get_pes:
                                                         g_rel = thermo_data[conformer].cosmo_qhg - g_min
                                                     else:
                                                         g_rel = thermo_data[conformer].qh_gibbs_free_energy - g_min
-                                                    boltz_fac = math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
+                                                    degeneracy = getattr(thermo_data[conformer], "degeneracy", 1)
+                                                    boltz_fac = degeneracy * math.exp(-g_rel * J_TO_AU / GAS_CONSTANT / temperature)
                                                     boltz_prob = boltz_fac / boltz_sum
                                                     if boltz_prob == 0.0:
                                                         continue
@@ -1097,7 +2133,7 @@ class get_pes:
                                                         conformer].sp_energy is not '!':
                                                         spc_abs += thermo_data[conformer].sp_energy * boltz_prob
                                                     if hasattr(thermo_data[conformer], "sp_energy") and thermo_data[conformer].sp_energy is '!':
-                                                        sys.exit("\n   Not all files contain a SPC value, relative values will not be calculated.\n")
+                                                        raise GoodVibesError("\n   Not all files contain a SPC value, relative values will not be calculated.\n")
                                                     e_abs += thermo_data[conformer].scf_energy * boltz_prob
                                                     zpe_abs += thermo_data[conformer].zpe * boltz_prob
                                                     if cosmo:
@@ -1109,14 +2145,14 @@ class get_pes:
                                                         rel_val += thermo_data[
                                                                        conformer].qh_gibbs_free_energy * boltz_prob
                                                     # Default calculate gconf correction for conformers, skip if no contribution
-                                                    if gconf and boltz_prob > 0.0 and boltz_prob != 1.0:    
+                                                    if gconf and boltz_prob > 0.0 and (boltz_prob != 1.0 or degeneracy > 1):
                                                         h_conf += thermo_data[conformer].enthalpy * boltz_prob
                                                         s_conf += thermo_data[conformer].entropy * boltz_prob
-                                                        s_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob)
+                                                        s_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob / degeneracy)
 
                                                         qh_conf += thermo_data[conformer].qh_enthalpy * boltz_prob
                                                         qs_conf += thermo_data[conformer].qh_entropy * boltz_prob
-                                                        qs_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob)
+                                                        qs_conf += -GAS_CONSTANT / J_TO_AU * boltz_prob * math.log(boltz_prob / degeneracy)
                                                     elif gconf and boltz_prob == 1.0:
                                                         h_conf += thermo_data[conformer].enthalpy
                                                         s_conf += thermo_data[conformer].entropy
@@ -1153,8 +2189,17 @@ class get_pes:
                                             self.g_species_qhgzero[n][i].append(zero_conf)  # Raw data for graphing
                                     except KeyError:
                                         log.write("   Warning! Structure " + structure + ' has not been defined correctly in ' + file + '\n')
-                                        sys.exit("   Please edit " + file + " and try again\n")
+                                        raise GoodVibesError("   Please edit " + file + " and try again\n")
                                     self.species[n].append(point)
+                                    point_ts = False
+                                    for structure in point_structures:
+                                        if isinstance(species[structure], list):
+                                            structure_data = [thermo_data[conformer] for conformer in species[structure]]
+                                        else:
+                                            structure_data = [thermo_data[species[structure]]]
+                                        if is_transition_state(structure, structure_data):
+                                            point_ts = True
+                                    self.ts[n].append(point_ts)
                                     self.e_abs[n].append(e_abs)
                                     self.spc_abs[n].append(spc_abs)
                                     self.zpe_abs[n].append(zpe_abs)
@@ -1202,6 +2247,7 @@ class get_pes:
                                         self.cosmo_qhg_abs[n].append(cosmo_qhg_abs)
                                 else:
                                     self.species[n].append('none')
+                                    self.ts[n].append(False)
                                     self.e_abs[n].append(float('nan'))
 
                             n = n + 1
@@ -1209,43 +2255,505 @@ class get_pes:
                             pass
 
 
-class getoutData:
+def is_transition_state(name, thermo_data):
     """
-    Read molecule data from a computational chemistry output file.
-    
-    Currently supports Gaussian and ORCA output types.
-    
-    Attributes:
-        FREQS (list): list of frequencies parsed from Gaussian file.
-        REDMASS (list): list of reduced masses parsed from Gaussian file.
-        FORCECONST (list): list of force constants parsed from Gaussian file.
-        NORMALMODE (list): list of normal modes parsed from Gaussian file.
-        atom_nums (list): list of atom number IDs.
-        atom_types (list): list of atom element symbols.
-        cartesians (list): list of cartesian coordinates for each atom.
-        atomictypes (list): list of atomic types output in Gaussian files.
-        connectivity (list): list of atomic connectivity in a molecule, based on covalent radii
+    Decide whether a species is a transition state.
+
+    A species is a transition state if it was optimized as one (opt=ts), has exactly one imaginary frequency,
+    or its name contains 'TS' as a separate token (e.g. TS1, TS-II, Int-TS).
+
+    Parameters:
+    name (str): name of the species.
+    thermo_data (list): calc_bbe objects of the species (one per conformer).
+
+    Returns:
+    bool: True if the species is a transition state.
     """
-    def __init__(self, file):
-        with open(file) as f:
-            data = f.readlines()
-        program = 'none'
+    if re.search(r'(^|[^A-Za-z])TS([^A-Za-z]|$)', name):
+        return True
+    for bbe in thermo_data:
+        if getattr(bbe, 'job_type', '').find('TS') > -1 or len(getattr(bbe, 'im_frequency_wn', [])) == 1:
+            return True
+    return False
 
-        for line in data:
-            if "Gaussian" in line:
-                program = "Gaussian"
-                break
-            if "* O   R   C   A *" in line:
-                program = "Orca"
-                break
-            if "NWChem" in line:
-                program = "NWChem"
-                break 
 
-        def get_freqs(self, outlines, natoms, format):
-            self.FREQS = []
-            self.REDMASS = []
-            self.FORCECONST = []
+class energetic_span:
+    """
+    Energetic span model of catalytic cycles.
+
+    Evaluates the TOF-determining transition state (TDTS) and intermediate (TDI), the degree of TOF control of every
+    state, the energetic span and the turnover frequency of many pathways at many temperatures with array operations
+    on a (temperatures x pathways x points) free energy tensor. The first point of each pathway is the resting state
+    of the cycle and the last point closes it, so that their difference is the reaction free energy.
+
+    REF: Kozuch, S.; Shaik, S. Acc. Chem. Res. 2011, 44, 101-110
+
+    Attributes:
+        temperatures (numpy.ndarray): temperatures (K).
+        dgr (numpy.ndarray): reaction free energy of each pathway (Hartree), shape (temperatures, pathways).
+        span (numpy.ndarray): energetic span (Hartree), shape (temperatures, pathways).
+        tof (numpy.ndarray): turnover frequency (1/s), shape (temperatures, pathways).
+        tdts (numpy.ndarray): index of the TOF-determining transition state, shape (temperatures, pathways).
+        tdi (numpy.ndarray): index of the TOF-determining intermediate, shape (temperatures, pathways).
+        x_tof (numpy.ndarray): degree of TOF control of each point, shape (temperatures, pathways, points).
+    """
+    def __init__(self, g, ts, temperatures):
+        """
+        Parameters:
+        g (array): free energies (Hartree) of shape (temperatures, pathways, points); NaN pads shorter pathways.
+        ts (array): bool array of shape (pathways, points) flagging transition states.
+        temperatures (array): temperature (K) of each leading slice of g.
+        """
+        g = np.asarray(g, dtype=float)
+        self.temperatures = np.asarray(temperatures, dtype=float)
+        n_temp, n_path, n_point = g.shape
+        valid = ~np.isnan(g[0])
+        last = n_point - 1 - np.argmax(valid[:, ::-1], axis=1)
+        index = np.arange(n_point)
+        ts = np.asarray(ts, dtype=bool) & valid
+        intermediate = ~ts & valid & (index[None, :] < last[:, None])
+
+        paths = np.arange(n_path)
+        self.dgr = g[:, paths, last] - g[:, :, 0]
+        # Exponent T_i - I_j, plus the reaction energy when transition state i precedes intermediate j
+        exponent = g[:, :, :, None] - g[:, :, None, :]
+        exponent = exponent + np.where(index[:, None] < index[None, :], 1.0, 0.0) * self.dgr[:, :, None, None]
+        pair = ts[:, :, None] & intermediate[:, None, :]
+        rt = GAS_CONSTANT * self.temperatures[:, None, None, None] / J_TO_AU
+        exponent = np.where(pair[None], exponent / rt, -np.inf)
+        top = np.max(exponent, axis=(2, 3), keepdims=True)
+        top = np.where(np.isfinite(top), top, 0.0)
+        weights = np.exp(exponent - top)
+        total = np.sum(weights, axis=(2, 3))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_ts = np.sum(weights, axis=3) / total[:, :, None]
+            x_int = np.sum(weights, axis=2) / total[:, :, None]
+            self.x_tof = np.where(ts[None], x_ts, x_int)
+            prefactor = BOLTZMANN_CONSTANT * self.temperatures[:, None] / PLANCK_CONSTANT
+            rt = rt[:, :, 0, 0]
+            self.tof = prefactor * np.expm1(-self.dgr / rt) * np.exp(-top[:, :, 0, 0]) / total + 0.0
+        self.tdts = np.argmax(np.where(ts[None], x_ts, -1.0), axis=2)
+        self.tdi = np.argmax(np.where(intermediate[None], x_int, -1.0), axis=2)
+        g_tdts = np.take_along_axis(g, self.tdts[:, :, None], axis=2)[:, :, 0]
+        g_tdi = np.take_along_axis(g, self.tdi[:, :, None], axis=2)[:, :, 0]
+        self.span = g_tdts - g_tdi + np.where(self.tdts < self.tdi, self.dgr, 0.0)
+        # Pathways without a transition state or an intermediate have no span
+        undefined = ~(ts.any(axis=1) & intermediate.any(axis=1))[None, :] | ~(total > 0)
+        self.span = np.where(undefined, np.nan, self.span)
+        self.tof = np.where(undefined, np.nan, self.tof)
+
+
+def get_span(pes, temperatures, QH):
+    """
+    Energetic span analysis of every pathway of a PES over a temperature grid.
+
+    Free energies at each temperature are extrapolated linearly as G(T) = H - T.S from the (quasi-harmonic) enthalpy
+    and entropy evaluated at the temperature of the PES, so the whole grid is evaluated from a single set of
+    thermochemistry.
+
+    Parameters:
+    pes (get_pes): relative thermochemistry of the reaction pathways.
+    temperatures (list): temperatures (K) to perform the analysis at.
+    QH (bool): use quasi-harmonic enthalpies.
+
+    Returns:
+    energetic_span: energetic span analysis of all pathways.
+    """
+    n_point = max([len(species) for species in pes.species] + [1])
+    enthalpy = np.full((len(pes.path), n_point), np.nan)
+    entropy = np.full((len(pes.path), n_point), np.nan)
+    ts = np.zeros((len(pes.path), n_point), dtype=bool)
+    for i in range(len(pes.path)):
+        h_vals = pes.qh_abs[i] if QH else pes.h_abs[i]
+        k = 0
+        for j, point in enumerate(pes.species[i]):
+            if point != 'none':
+                enthalpy[i, j], entropy[i, j] = h_vals[k], pes.qs_abs[i][k]
+                k += 1
+        ts[i, :len(pes.ts[i])] = pes.ts[i]
+    temperatures = np.asarray(temperatures, dtype=float)
+    g = enthalpy[None, :, :] - temperatures[:, None, None] * entropy[None, :, :]
+    return energetic_span(g, ts, temperatures)
+
+
+def neighbor_pairs(cartesians, cutoff):
+    """
+    Find all pairs of atoms closer than a cutoff with a cell list.
+
+    Atoms are binned into cubic cells of the cutoff size, so only atoms in the same or adjacent cells are compared;
+    each pair is examined once from its half shell of neighbouring cells.
+
+    Parameters:
+    cartesians (list): Cartesian coordinates.
+    cutoff (float): largest separation of a pair.
+
+    Returns:
+    numpy.ndarray: first atom of each pair.
+    numpy.ndarray: second atom of each pair, always greater than the first.
+    numpy.ndarray: separation of each pair.
+    """
+    xyz = np.asarray(cartesians, dtype=float).reshape(-1, 3)
+    n = len(xyz)
+    if n < 2:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+    # Padding of one empty cell on every side keeps neighbouring cell keys from wrapping around
+    cells = np.floor((xyz - xyz.min(axis=0)) / cutoff).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    first, second = [], []
+    offsets = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if (dx, dy, dz) >= (0, 0, 0)]
+    for dx, dy, dz in offsets:
+        neighbor_keys = keys + (dx * dims[1] + dy) * dims[2] + dz
+        start = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+        counts = np.searchsorted(sorted_keys, neighbor_keys, side='right') - start
+        i = np.repeat(np.arange(n), counts)
+        j = order[np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+        if (dx, dy, dz) == (0, 0, 0):
+            i, j = i[i < j], j[i < j]
+        first.append(i)
+        second.append(j)
+    i, j = np.concatenate(first), np.concatenate(second)
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    distance = np.linalg.norm(xyz[i] - xyz[j], axis=1)
+    close = distance < cutoff
+    return i[close], j[close], distance[close]
+
+
+def connectivity_graph(atom_types, cartesians, tolerance=0.2):
+    """
+    Bonded atoms from covalent radii, as a sparse adjacency structure.
+
+    Two atoms are bonded when closer than the sum of their RADII plus the tolerance.
+
+    Parameters:
+    atom_types (list): element symbols.
+    cartesians (list): Cartesian coordinates in Angstrom.
+    tolerance (float): allowance added to the sum of covalent radii (Angstrom).
+
+    Returns:
+    numpy.ndarray: CSR row pointer; the neighbours of atom i are indices[indptr[i]:indptr[i + 1]].
+    numpy.ndarray: CSR column indices, sorted within each row.
+    """
+    radii = np.array([RADII[atom] for atom in atom_types], dtype=float)
+    n = len(radii)
+    indptr = np.zeros(n + 1, dtype=int)
+    if n == 0:
+        return indptr, np.zeros(0, dtype=int)
+    i, j, distance = neighbor_pairs(cartesians, 2 * radii.max() + tolerance)
+    bonded = distance < radii[i] + radii[j] + tolerance
+    rows = np.concatenate((i[bonded], j[bonded]))
+    cols = np.concatenate((j[bonded], i[bonded]))
+    order = np.lexsort((cols, rows))
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+    return indptr, cols[order]
+
+
+def d3_parameters(functional, damp):
+    """
+    DFT-D3 damping parameters of a functional.
+
+    Parameters:
+    functional (str): functional name as found in the output file, e.g. B3LYP, UB3LYP or CAM-B3LYP.
+    damp (str): 'zero' or 'bj'.
+
+    Returns:
+    tuple: (s6, rs6, s8) for zero damping or (s6, a1, s8, a2) for Becke-Johnson damping.
+    """
+    table = D3_ZERO_PARAMS if damp == 'zero' else D3_BJ_PARAMS
+    name = functional.upper().replace('-', '').replace(' ', '')
+    for key in (name, name[1:] if name[:1] in ('R', 'U') else None):
+        if key in table:
+            return table[key]
+    raise ValueError("no D3{} parameters known for functional '{}'".format('' if damp == 'zero' else '(BJ)',
+                                                                           functional))
+
+
+def d3_reference_path():
+    """
+    Default location of the DFT-D3 reference data.
+
+    Returns:
+    str: GOODVIBES_D3_REFERENCE if set, otherwise d3_reference.npz in cache_dir() if present, otherwise the reference
+         data distributed with GoodVibes (share/d3_reference.npz).
+    """
+    if os.environ.get('GOODVIBES_D3_REFERENCE'):
+        return os.environ['GOODVIBES_D3_REFERENCE']
+    path = os.path.join(cache_dir(), 'd3_reference.npz')
+    return path if os.path.isfile(path) else sharepath('d3_reference.npz')
+
+
+def load_d3_reference(path=None):
+    """
+    Read the DFT-D3 reference data.
+
+    The reference C6 coefficients (over 30,000 values) of Grimme's dftd3 program are distributed with GoodVibes for
+    elements 1-94 in share/d3_reference.npz. Reference data are read from an .npz file with the arrays below, in
+    atomic units and indexed by atomic number - 1:
+        c6ab (Z, Z, M, M, 3): reference C6 of each element pair with the coordination numbers of both atoms;
+            entries with C6 <= 0 are unused.
+        r0ab (Z, Z): cutoff radii used by zero damping and the three-body term.
+        rcov (Z): covalent radii for coordination numbers, including the 4/3 scaling.
+        r2r4 (Z): sqrt(0.5 <r4>/<r2> sqrt(Z)), so that C8 = 3 C6 r2r4_A r2r4_B.
+
+    Parameters:
+    path (str): .npz file, by default d3_reference_path().
+
+    Returns:
+    dict: the four arrays.
+    """
+    with np.load(path or d3_reference_path()) as data:
+        return dict((key, np.asarray(data[key], dtype=float)) for key in ('c6ab', 'r0ab', 'rcov', 'r2r4'))
+
+
+class d3_dispersion:
+    """
+    DFT-D3 dispersion energy with zero or Becke-Johnson damping and the optional Axilrod-Teller-Muto three-body term.
+
+    Coordination numbers, C6 interpolation and all energy terms are evaluated with NumPy over neighbour lists from
+    neighbor_pairs, using the cutoffs of the dftd3 program: sqrt(9000) Bohr for two-body terms and 40 Bohr for
+    coordination numbers and three-body terms. The cost therefore follows the number of neighbours rather than
+    all pairs and triples.
+
+    Attributes:
+        coordination_numbers (numpy.ndarray): fractional coordination number of each atom.
+        pairs (tuple): first and second atom of each pair inside the two-body cutoff.
+        c6 (numpy.ndarray): C6 coefficient of each pair (Hartree Bohr^6).
+        attractive_r6_vdw (float): two-body C6 term (kcal/mol).
+        attractive_r8_vdw (float): two-body C8 term (kcal/mol).
+        repulsive_abc (float): three-body term, zero unless requested (kcal/mol).
+        energy (float): total dispersion energy (Hartree).
+    """
+    def __init__(self, atom_nums, cartesians, functional, damp='zero', abc=False, reference=None, params=None,
+                 cutoff=math.sqrt(9000.0), cn_cutoff=40.0):
+        reference = reference if reference is not None else load_d3_reference()
+        c6ab, r0ab, rcov, r2r4 = reference['c6ab'], reference['r0ab'], reference['rcov'], reference['r2r4']
+        params = params or d3_parameters(functional, damp)
+        nums = np.asarray(atom_nums, dtype=int) - 1
+        if np.any(nums < 0) or np.any(nums >= len(rcov)) or np.any(c6ab[nums, nums, 0, 0, 0] <= 0):
+            missing = sorted(set(int(z) + 1 for z in nums if z < 0 or z >= len(rcov) or c6ab[z, z, 0, 0, 0] <= 0))
+            raise ValueError("no D3 reference data for atomic numbers {}".format(missing))
+        xyz = np.asarray(cartesians, dtype=float).reshape(-1, 3) / BOHR_TO_ANGSTROM
+
+        # Coordination numbers
+        i, j, r = neighbor_pairs(xyz, cn_cutoff)
+        count = 1.0 / (1.0 + np.exp(-16.0 * ((rcov[nums[i]] + rcov[nums[j]]) / r - 1.0)))
+        cn = np.bincount(i, count, len(nums)) + np.bincount(j, count, len(nums))
+        self.coordination_numbers = cn
+
+        # Two-body terms
+        i, j, r = neighbor_pairs(xyz, cutoff)
+        c6 = self.interpolate_c6(c6ab, nums[i], nums[j], cn[i], cn[j])
+        c8 = 3.0 * c6 * r2r4[nums[i]] * r2r4[nums[j]]
+        if damp == 'zero':
+            s6, rs6, s8 = params
+            r0 = r0ab[nums[i], nums[j]]
+            e6 = -s6 * np.sum(c6 / r ** 6 / (1.0 + 6.0 * (r / (rs6 * r0)) ** -14))
+            e8 = -s8 * np.sum(c8 / r ** 8 / (1.0 + 6.0 * (r / r0) ** -16))
+        else:
+            s6, a1, s8, a2 = params
+            r0 = a1 * np.sqrt(c8 / c6) + a2
+            e6 = -s6 * np.sum(c6 / (r ** 6 + r0 ** 6))
+            e8 = -s8 * np.sum(c8 / (r ** 8 + r0 ** 8))
+        self.pairs, self.c6 = (i, j), c6
+        e_abc = self.three_body(xyz, nums, r0ab, i, j, c6, cn_cutoff) if abc else 0.0
+
+        self.attractive_r6_vdw = e6 * KCAL_TO_AU
+        self.attractive_r8_vdw = e8 * KCAL_TO_AU
+        self.repulsive_abc = e_abc * KCAL_TO_AU
+        self.energy = e6 + e8 + e_abc
+
+    # C6 of each pair from the reference values, weighted by the distance of their coordination numbers to the
+    # actual ones; as in dftd3, the closest reference is used once every weight underflows. Pairs are handled in
+    # groups of the same two elements, which share their reference values
+    @staticmethod
+    def interpolate_c6(c6ab, za, zb, cna, cnb):
+        c6 = np.empty(len(za))
+        codes = za * c6ab.shape[1] + zb
+        for code in np.unique(codes):
+            group = np.nonzero(codes == code)[0]
+            ref = c6ab[code // c6ab.shape[1], code % c6ab.shape[1]].reshape(-1, 3)
+            ref = ref[ref[:, 0] > 0]
+            dist = (ref[:, 1] - cna[group, None]) ** 2 + (ref[:, 2] - cnb[group, None]) ** 2
+            weight = np.exp(-4.0 * dist)
+            total = weight.sum(axis=1)
+            nearest = ref[np.argmin(dist, axis=1), 0]
+            c6[group] = np.where(total > 1e-99, weight @ ref[:, 0] / np.where(total > 1e-99, total, 1.0), nearest)
+        return c6
+
+    # Axilrod-Teller-Muto term over all triples whose three sides lie within the cutoff, with C9 = -sqrt(C6 C6 C6)
+    # and zero damping of the geometric mean distance against 4/3 of the mean cutoff radius. Pair quantities are
+    # held in dense matrices and the triples are enumerated one anchor atom at a time
+    @staticmethod
+    def three_body(xyz, nums, r0ab, pair_i, pair_j, pair_c6, cutoff):
+        n = len(nums)
+        r2 = np.sum((xyz[pair_i] - xyz[pair_j]) ** 2, axis=1)
+        within = r2 < cutoff ** 2
+        i, j = pair_i[within], pair_j[within]
+        close = np.zeros((n, n), dtype=bool)
+        close[i, j] = True
+        c6, r2m, r0m = np.zeros((n, n)), np.ones((n, n)), np.ones((n, n))
+        c6[i, j] = c6[j, i] = pair_c6[within]
+        r2m[i, j] = r2m[j, i] = r2[within]
+        r0m[i, j] = r0m[j, i] = r0ab[nums[i], nums[j]]
+        energy = 0.0
+        for a in range(n - 2):
+            partners = np.nonzero(close[a])[0]
+            if len(partners) < 2:
+                continue
+            b, c = np.nonzero(np.triu(close[np.ix_(partners, partners)], k=1))
+            if len(b) == 0:
+                continue
+            b, c = partners[b], partners[c]
+            r2ab, r2ac, r2bc = r2m[a, b], r2m[a, c], r2m[b, c]
+            r2prod = r2ab * r2ac * r2bc
+            r0 = np.cbrt(r0m[a, b] * r0m[a, c] * r0m[b, c])
+            damp = 1.0 / (1.0 + 6.0 * (16.0 / 9.0 * r0 * r0 / np.cbrt(r2prod)) ** 8)
+            angle = 0.375 * (r2ab + r2bc - r2ac) * (r2ab - r2bc + r2ac) * (-r2ab + r2bc + r2ac) / r2prod + 1.0
+            c9 = -np.sqrt(c6[a, b] * c6[a, c] * c6[b, c])
+            energy -= np.sum(c9 * damp * angle / (r2prod * np.sqrt(r2prod)))
+        return energy
+
+
+class d3_cache(json_cache):
+    """
+    D3 dispersion energies of previously computed geometries.
+
+    Entries are keyed by geometry_hash (on a 1e-4 Angstrom grid), the damping, the functional parameters, the
+    three-body option and the reference data, and kept as JSON in cache_dir(), so that each geometry is evaluated once
+    across temperatures, interval runs and reruns.
+
+    Attributes:
+        reference (dict): DFT-D3 reference data, see load_d3_reference.
+        reference_id (str): digest of the reference data.
+    """
+    filename = 'd3.json'
+    version = 1
+
+    def __init__(self, reference, path=None):
+        json_cache.__init__(self, path)
+        self.reference = reference
+        digest = hashlib.sha1()
+        for key in sorted(reference):
+            digest.update(np.ascontiguousarray(reference[key], dtype=float).tobytes())
+        self.reference_id = digest.hexdigest()[:16]
+
+    def energy(self, atom_nums, cartesians, functional, damp='zero', abc=False):
+        """
+        D3 dispersion energy of a geometry, from the cache when available.
+
+        Parameters:
+        atom_nums (list): atomic numbers.
+        cartesians (list): cartesian coordinates in Angstrom.
+        functional (str): density functional, see d3_parameters.
+        damp (str): 'zero' or 'bj'.
+        abc (bool): include the three-body term.
+
+        Returns:
+        float: dispersion energy in Hartree.
+        """
+        params = d3_parameters(functional, damp)
+        key = '{}:{}:{}:{}:{}'.format(geometry_hash(atom_nums, cartesians, grid=1e-4), damp,
+                                      ','.join(repr(float(p)) for p in params), int(bool(abc)), self.reference_id)
+        energy = self.get(key)
+        if energy is None:
+            energy = d3_dispersion(atom_nums, cartesians, functional, damp, abc, reference=self.reference,
+                                   params=params).energy
+            self.add(key, energy)
+        return energy
+
+
+def dispersion_energies(geometries, functionals, cache, damp, abc=False):
+    """
+    D3 dispersion energy of each file, see d3_cache.
+
+    Parameters:
+    geometries (dict): getoutData of each output file, as then given to calc_bbe.
+    functionals (dict): functional of each output file, as in its level of theory (see read_initial).
+    cache (d3_cache): cache to look up and store energies in.
+    damp (str): 'zero' or 'bj'.
+    abc (bool): include the three-body term.
+
+    Returns:
+    dict: dispersion energy (Hartree) of each file.
+    """
+    energies = {}
+    for file, geometry in geometries.items():
+        try:
+            energies[file] = cache.energy(geometry.atom_nums, geometry.cartesians, functionals[file], damp, abc)
+        except (AttributeError, ValueError) as e:
+            raise GoodVibesError("\nx  Dispersion correction failed for {}: {}\n".format(file, e))
+    return energies
+
+
+def symmetry_numbers(geometries, cache, nproc=1):
+    """
+    External and internal symmetry numbers and point group of each file, see symmetry_cache and point_groups.
+
+    Parameters:
+    geometries (dict): getoutData of each output file, as then given to calc_bbe.
+    cache (symmetry_cache): geometries analysed before; new ones are added to it.
+    nproc (int): processes used to assign point groups.
+
+    Returns:
+    dict: (external symmetry number, point group, internal symmetry number) of each file, as taken by calc_bbe.
+    """
+    files = list(geometries)
+    geoms = [geometries[file] for file in files]
+    keys = [geometry_hash(geom.atom_nums, geom.cartesians) if len(getattr(geom, 'atom_nums', [])) else None
+            for geom in geoms]
+    symm = [cache.get(key) if key else None for key in keys]
+    missing = [n for n, entry in enumerate(symm) if entry is None]
+    pgroups, sym_nums = point_groups([geoms[n] for n in missing], nproc=nproc)
+    for n, pgroup, ex_sym in zip(missing, pgroups, sym_nums):
+        int_sym = internal_symmetry(geoms[n]) if keys[n] else 1
+        symm[n] = [pgroup, ex_sym, int_sym]
+        if keys[n] and pgroup:
+            cache.put(keys[n], pgroup, ex_sym, int_sym)
+    return dict((file, (ex_sym, pgroup, int_sym)) for file, (pgroup, ex_sym, int_sym) in zip(files, symm))
+
+
+class getoutData:
+    """
+    Read molecule data from a computational chemistry output file.
+    
+    Currently supports Gaussian and ORCA output types.
+    
+    Attributes:
+        FREQS (list): list of frequencies parsed from Gaussian file.
+        REDMASS (list): list of reduced masses parsed from Gaussian file.
+        FORCECONST (list): list of force constants parsed from Gaussian file.
+        NORMALMODE (list): list of normal modes parsed from Gaussian file.
+        atom_nums (list): list of atom number IDs.
+        atom_types (list): list of atom element symbols.
+        cartesians (list): list of cartesian coordinates for each atom.
+        atomictypes (list): list of atomic types output in Gaussian files.
+        connectivity (list): list of atomic connectivity in a molecule, based on covalent radii
+        adjacency (tuple): the same connectivity as CSR arrays (indptr, indices), see connectivity_graph.
+    """
+    def __init__(self, file, data=None):
+        if data is None:
+            with open(file) as f:
+                data = f.readlines()
+        program = 'none'
+
+        for line in data:
+            if "Gaussian" in line:
+                program = "Gaussian"
+                break
+            if "* O   R   C   A *" in line:
+                program = "Orca"
+                break
+            if "NWChem" in line:
+                program = "NWChem"
+                break 
+
+        def get_freqs(self, outlines, natoms, format):
+            self.FREQS = []
+            self.REDMASS = []
+            self.FORCECONST = []
             self.NORMALMODE = []
             freqs_so_far = 0
             if format == "Gaussian":
@@ -1329,20 +2837,9 @@ class getoutData:
 
     # Obtain molecule connectivity to be used for internal symmetry determination
     def get_connectivity(self):
-        connectivity = []
-        tolerance = 0.2
-
-        for i, ai in enumerate(self.atom_types):
-            row = []
-            for j, aj in enumerate(self.atom_types):
-                if i == j:
-                    continue
-                cutoff = RADII[ai] + RADII[aj] + tolerance
-                distance = np.linalg.norm(np.array(self.cartesians[i]) - np.array(self.cartesians[j]))
-                if distance < cutoff:
-                    row.append(j)
-            connectivity.append(row)
-            self.connectivity = connectivity
+        self.adjacency = connectivity_graph(self.atom_types, self.cartesians)
+        indptr, indices = self.adjacency
+        self.connectivity = [indices[indptr[i]:indptr[i + 1]].tolist() for i in range(len(indptr) - 1)]
 
 
 def jitter(datasets, color, ax, nx, marker, edgecol='black'):
@@ -1647,7 +3144,7 @@ def cosmo_rs_out(datfile, names, interval=False):
         return gsolv
 
 
-def parse_data(file):
+def parse_data(file, data=None):
     """
     Read computational chemistry output file.
     
@@ -1656,6 +3153,7 @@ def parse_data(file):
     
     Parameter:
     file (str): name of file to be parsed.
+    data (list): lines of the file if already read (e.g. only its head and tail, see read_head_tail).
     
     Returns:
     float: single point energy.
@@ -1667,9 +3165,11 @@ def parse_data(file):
     str: empirical dispersion used in chemical calculation (if any).
     int: multiplicity of molecule or chemical system.
     """
-    spe, program, data, version_program, solvation_model, keyword_line, a, charge, multiplicity = 'none', 'none', [], '', '', '', 0, None, None
+    spe, program, version_program, solvation_model, keyword_line, a, charge, multiplicity = 'none', 'none', '', '', '', 0, None, None
 
-    if os.path.exists(os.path.splitext(file)[0] + '.log'):
+    if data is not None:
+        pass
+    elif os.path.exists(os.path.splitext(file)[0] + '.log'):
         with open(os.path.splitext(file)[0] + '.log') as f:
             data = f.readlines()
     elif os.path.exists(os.path.splitext(file)[0] + '.out'):
@@ -1905,11 +3405,13 @@ def parse_data(file):
     return spe, program, version_program, solvation_model, file, charge, empirical_dispersion, multiplicity
 
 
-def sp_cpu(file):
-    """Read single-point output for cpu time."""
-    spe, program, data, cpu = None, None, [], None
+def sp_cpu(file, data=None):
+    """Read single-point output for cpu time; data are the lines of the file if already read."""
+    spe, program, cpu = None, None, None
 
-    if os.path.exists(os.path.splitext(file)[0] + '.log'):
+    if data is not None:
+        pass
+    elif os.path.exists(os.path.splitext(file)[0] + '.log'):
         with open(os.path.splitext(file)[0] + '.log') as f:
             data = f.readlines()
     elif os.path.exists(os.path.splitext(file)[0] + '.out'):
@@ -2013,10 +3515,11 @@ def level_of_theory(file):
     return level_of_theory
 
 
-def read_initial(file):
+def read_initial(file, data=None):
     """At beginning of procedure, read level of theory, solvation model, and check for normal termination"""
-    with open(file) as f:
-        data = f.readlines()
+    if data is None:
+        with open(file) as f:
+            data = f.readlines()
     level, bs, program, keyword_line = 'none', 'none', 'none', 'none'
     progress, orientation = 'Incomplete', 'Input'
     a, repeated_theory = 0, 0
@@ -2169,10 +3672,11 @@ def read_initial(file):
     return level_of_theory, solvation_model, progress, orientation, dft_used
 
 
-def jobtype(file):
+def jobtype(file, data=None):
     """Read output for the level of theory and basis set used."""
-    with open(file) as f:
-        data = f.readlines()
+    if data is None:
+        with open(file) as f:
+            data = f.readlines()
     job = ''
     for line in data:
         if line.strip().find('\\SP\\') > -1:
@@ -2186,6 +3690,98 @@ def jobtype(file):
     return job
 
 
+def read_head_tail(file, tail_bytes=65536, max_head_lines=5000, max_tail_bytes=2 ** 24):
+    """
+    Read the beginning of an output file up to the charge and multiplicity, and its last bytes.
+
+    The head holds the program version and route section, the tail the termination message and (Gaussian) archive
+    entry, so a finished job can be validated without reading the whole file. For Gaussian outputs the tail is
+    extended until it contains the last archive entry, which may be followed by a long force constant block.
+
+    Parameters:
+    file (str): output file.
+    tail_bytes (int): number of bytes first read from the end of the file.
+    max_head_lines (int): largest number of lines read from the beginning of the file.
+    max_tail_bytes (int): largest number of bytes read from the end of the file.
+
+    Returns:
+    list: lines of the head followed by the lines of the tail.
+    """
+    with open(file, 'rb') as f:
+        head = []
+        for line in f:
+            head.append(line.decode('utf-8', 'replace'))
+            if 'Multiplicity' in head[-1] or len(head) >= max_head_lines:
+                break
+        head_end = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        gaussian = any('Gaussian' in line for line in head)
+        while True:
+            start = max(head_end, size - tail_bytes)
+            f.seek(start)
+            tail = f.read(size - start).decode('utf-8', 'replace')
+            if start == head_end or not gaussian or tail_bytes >= max_tail_bytes or \
+                    ' 1\\1\\' in tail or ' 1|1|' in tail:
+                break
+            tail_bytes *= 4
+    tail = tail.splitlines(True)
+    return head + (tail if start == head_end else tail[1:])
+
+
+class output_summary:
+    """
+    Validation data of an output file read from its head and tail only (see read_head_tail).
+
+    Provides the attributes of calc_bbe used by check_files without computing any thermochemistry.
+
+    Attributes:
+        file (str): output file.
+        progress (str): termination status (Normal, Error or Incomplete).
+        level_of_theory (str): level of theory and basis set.
+        solvation (str): solvation model from the route section.
+        program (str): program used in chemical computation.
+        version_program (str): program version used in chemical computation.
+        solvation_model (str): solvation model as parsed by parse_data.
+        charge (int): overall charge of molecule.
+        multiplicity (int): multiplicity of molecule or chemical system.
+        empirical_dispersion (str): empirical dispersion model used in computation.
+        job_type (str): type of job (GS, TS, Freq, SP) from the archive entry and route section.
+        n_imag (int): number of imaginary frequencies from the archive entry, None if not available.
+    """
+    def __init__(self, file, tail_bytes=65536):
+        data = read_head_tail(file, tail_bytes)
+        self.file = file
+        self.level_of_theory, self.solvation, self.progress = read_initial(file, data)[:3]
+        self.sp_energy, self.program, self.version_program, self.solvation_model, self.file, self.charge, self.empirical_dispersion, self.multiplicity = parse_data(
+            file, data)
+        if self.solvation_model == '':
+            self.solvation_model = self.solvation
+        # Earlier archive entries of multi-step jobs may lie outside the tail: use the route section as well
+        self.job_type = jobtype(file, data)
+        route = ''
+        for line in data:
+            if line.strip().startswith('#') or (route and not line.strip().startswith('-')):
+                route += ' ' + line.strip().lower()
+            elif route:
+                break
+        if 'TS' not in self.job_type and re.search(r'opt\w*\s*=\s*\(?[\w,=\s]*\bts\b', route):
+            self.job_type = 'TS' + self.job_type
+        elif 'GS' not in self.job_type and 'TS' not in self.job_type and re.search(r'\bopt\b', route):
+            self.job_type = 'GS' + self.job_type
+        archive = ''.join(line.strip() for line in data)
+        n_imag = re.findall(r'NImag=(\d+)', archive)
+        self.n_imag = int(n_imag[-1]) if n_imag else None
+
+    def report(self):
+        """Dictionary of the validation data for the machine-readable report."""
+        return {'file': self.file, 'termination': self.progress, 'program': self.version_program,
+                'level_of_theory': self.level_of_theory, 'solvation': self.solvation,
+                'charge': self.charge,
+                'multiplicity': int(self.multiplicity) if str(self.multiplicity).isdigit() else self.multiplicity,
+                'empirical_dispersion': self.empirical_dispersion, 'job_type': self.job_type,
+                'n_imag': self.n_imag}
+
+
 def add_time(tm, cpu):
     """Calculate elapsed time."""
     [days, hrs, mins, secs, msecs] = cpu
@@ -2265,7 +3861,7 @@ def calc_vibrational_energy(frequency_wn, temperature, freq_scale_factor, fract_
     # Error occurs if T is too low when performing math.exp
     for entry in factor:
         if entry > math.log(sys.float_info.max):
-            sys.exit("\nx  Warning! Temperature may be too low to calculate vibrational energy. Please adjust using the `-t` option and try again.\n")
+            raise GoodVibesError("\nx  Warning! Temperature may be too low to calculate vibrational energy. Please adjust using the `-t` option and try again.\n")
 
     energy = [entry * GAS_CONSTANT * temperature * (0.5 + (1.0 / (math.exp(entry) - 1.0)))
               for entry in factor]
@@ -2514,36 +4110,33 @@ def calc_damp(frequency_wn, freq_cutoff):
     return damp
 
 
-def get_selectivity(pattern, files, boltz_facs, boltz_sum, temperature, log, dup_list):
+def get_selectivity_files(pattern, files, log):
     """
-    Calculate selectivity as enantioselectivity/diastereomeric ratio.
-    
+    Sort files into the two groups compared in a selectivity calculation.
+
     Parameters:
     pattern (str): pattern to recognize for selectivity calculation, i.e. "R":"S".
-    files (str): files to use for selectivity calculation.
-    boltz_facs (dict): dictionary of Boltzmann factors for each file used in the calculation.
-    boltz_sum (float) 
-    temperature (float)
-    
+    files (list): files to use for selectivity calculation.
+    log (Logger): output for warnings.
+
     Returns:
-    float: enantiomeric/diasteriomeric ratio.
-    str: pattern used to identify ratio.
-    float: Gibbs free energy barrier.
-    bool: flag for failed selectivity calculation.
-    str: preferred enantiomer/diastereomer configuration.
+    set: files matching the first pattern.
+    set: files matching the second pattern.
+    str: name of the first isomer.
+    str: name of the second isomer.
     """
     dirs = []
     for file in files:
         dirs.append(os.path.dirname(file))
     dirs = list(set(dirs))
-    a_files, b_files, a_sum, b_sum, failed, pref = [], [], 0.0, 0.0, False, ''
-    
+    a_files, b_files = [], []
+
     [a_regex,b_regex] = pattern.split(':')
     [a_regex,b_regex] = [a_regex.strip(), b_regex.strip()]
-    
+
     A = ''.join(a for a in a_regex if a.isalnum())
     B = ''.join(b for b in b_regex if b.isalnum())
-    
+
     if len(dirs) > 1 or dirs[0] != '':
         for dir in dirs:
             a_files.extend(glob(dir+'/'+a_regex))
@@ -2551,19 +4144,38 @@ def get_selectivity(pattern, files, boltz_facs, boltz_sum, temperature, log, dup
     else:
         a_files.extend(glob(a_regex))
         b_files.extend(glob(b_regex))
-        
-    
-    if len(a_files) is 0 or len(b_files) is 0:
+
+    if len(a_files) == 0 or len(b_files) == 0:
         log.write("\n   Warning! Filenames have not been formatted correctly for determining selectivity\n")
         log.write("   Make sure the filename contains either " + A + " or " + B + "\n")
-        sys.exit("   Please edit either your filenames or selectivity pattern argument and try again\n")
+        raise GoodVibesError("   Please edit either your filenames or selectivity pattern argument and try again\n")
+    return set(a_files), set(b_files), A, B
+
+
+def get_selectivity(pattern, files, boltz_facs, boltz_sum, temperature, log, dup_list):
+    """
+    Calculate selectivity as enantioselectivity/diastereomeric ratio.
+    
+    Parameters:
+    pattern (str): pattern to recognize for selectivity calculation, i.e. "R":"S".
+    files (str): files to use for selectivity calculation.
+    boltz_facs (dict): dictionary of Boltzmann factors for each file used in the calculation.
+    boltz_sum (float) 
+    temperature (float)
+    
+    Returns:
+    float: enantiomeric/diasteriomeric ratio.
+    str: pattern used to identify ratio.
+    float: Gibbs free energy barrier.
+    bool: flag for failed selectivity calculation.
+    str: preferred enantiomer/diastereomer configuration.
+    """
+    a_sum, b_sum, failed, pref = 0.0, 0.0, False, ''
+    a_files, b_files, A, B = get_selectivity_files(pattern, files, log)
     # Grab Boltzmann sums
+    duplicates = set(dup[0] for dup in dup_list)
     for file in files:
-        duplicate = False
-        if len(dup_list) != 0:
-            for dup in dup_list:
-                if dup[0] == file: duplicate = True
-        if duplicate == False:
+        if file not in duplicates:
             if file in a_files:
                 a_sum += boltz_facs[file] / boltz_sum
             elif file in b_files:
@@ -2606,11 +4218,33 @@ def get_selectivity(pattern, files, boltz_facs, boltz_sum, temperature, log, dup
     return ee, r, ratio, dd_free_energy, failed, pref
 
 
+def cluster_label(n):
+    """
+    Label for the n-th requested cluster.
+
+    Clusters are labelled A, B, ..., Z, then AA, AB, ... so that any number of clusters can be named.
+
+    Parameter:
+    n (int): zero-based index of the cluster.
+
+    Returns:
+    str: cluster label.
+    """
+    label = ''
+    n += 1
+    while n > 0:
+        n, r = divmod(n - 1, len(alphabet))
+        label = alphabet[r].upper() + label
+    return label
+
+
 def get_boltz(files, thermo_data, clustering, clusters, temperature, dup_list):
     """
     Obtain Boltzmann factors, Boltzmann sums, and weighted free energy values.
     
-    Used for selectivity and boltzmann requested options.
+    Used for selectivity and boltzmann requested options. Factors are computed for all files at once and cluster
+    sums are obtained with a single segmented reduction over a file-to-cluster index. Each factor is multiplied by
+    the degeneracy of the structure (2 for a collapsed mirror-image pair, see set_degeneracy).
     
     Parameters:
     files (list): list of files to find Boltzmann factors for.
@@ -2625,125 +4259,670 @@ def get_boltz(files, thermo_data, clustering, clusters, temperature, dup_list):
     dict: dictionary of files with corresponding weighted Gibbs free energy.
     float: Boltzmann sum computed from Boltzmann factors and Gibbs free energy.
     """
-    boltz_facs, weighted_free_energy, e_rel, e_min, boltz_sum = {}, {}, {}, sys.float_info.max, 0.0
+    boltz_facs, weighted_free_energy = {}, {}
+    duplicates = set(dup[0] for dup in dup_list)
 
-    for file in files:  # Need the most stable structure
-        bbe = thermo_data[file]
-        if hasattr(bbe, "qh_gibbs_free_energy"):
-            if bbe.qh_gibbs_free_energy != None:
-                if bbe.qh_gibbs_free_energy < e_min:
-                    e_min = bbe.qh_gibbs_free_energy
+    energies = np.zeros(len(files))
+    has_energy = np.zeros(len(files), dtype=bool)
+    for i, file in enumerate(files):
+        qh_gibbs_free_energy = getattr(thermo_data[file], "qh_gibbs_free_energy", None)
+        if qh_gibbs_free_energy is not None:
+            energies[i], has_energy[i] = qh_gibbs_free_energy, True
+    # Need the most stable structure
+    finite = has_energy & ~np.isnan(energies)
+    e_min = np.min(energies[finite]) if finite.any() else sys.float_info.max
+    # Calculate E_rel and Boltzmann factors
+    use = has_energy & np.array([file not in duplicates for file in files], dtype=bool)
+    degeneracy = np.array([getattr(thermo_data[file], "degeneracy", 1) for file in files], dtype=float)
+    facs = np.zeros(len(files))
+    facs[use] = degeneracy[use] * np.exp(-(energies[use] - e_min) * J_TO_AU / GAS_CONSTANT / temperature)
+    for i in np.flatnonzero(use):
+        boltz_facs[files[i]] = float(facs[i])
+    boltz_sum = float(np.sum(facs))
 
     if clustering:
-        for n, cluster in enumerate(clusters):
-            boltz_facs['cluster-' + alphabet[n].upper()] = 0.0
-            weighted_free_energy['cluster-' + alphabet[n].upper()] = 0.0
-    # Calculate E_rel and Boltzmann factors
-    for file in files:
-        duplicate = False
-        if len(dup_list) != 0:
-            for dup in dup_list:
-                if dup[0] == file: duplicate = True
-        if not duplicate:
-
-            bbe = thermo_data[file]
-            if hasattr(bbe, "qh_gibbs_free_energy"):
-                if bbe.qh_gibbs_free_energy != None:
-                    e_rel[file] = bbe.qh_gibbs_free_energy - e_min
-                    boltz_facs[file] = math.exp(-e_rel[file] * J_TO_AU / GAS_CONSTANT / temperature)
-                    if clustering:
-                        for n, cluster in enumerate(clusters):
-                            for structure in cluster:
-                                if structure == file:
-                                    boltz_facs['cluster-' + alphabet[n].upper()] += math.exp(
-                                        -e_rel[file] * J_TO_AU / GAS_CONSTANT / temperature)
-                                    weighted_free_energy['cluster-' + alphabet[n].upper()] += math.exp(
-                                        -e_rel[file] * J_TO_AU / GAS_CONSTANT / temperature) * bbe.qh_gibbs_free_energy
-                    boltz_sum += math.exp(-e_rel[file] * J_TO_AU / GAS_CONSTANT / temperature)
+        index = dict((file, i) for i, file in enumerate(files))
+        members = [(index[structure], n) for n, cluster in enumerate(clusters) for structure in cluster
+                   if structure in index]
+        members = np.array(members, dtype=int).reshape(-1, 2)
+        member_facs = facs[members[:, 0]]
+        member_g = np.where(use[members[:, 0]], energies[members[:, 0]], 0.0)
+        cluster_facs = np.bincount(members[:, 1], weights=member_facs, minlength=len(clusters))
+        cluster_g = np.bincount(members[:, 1], weights=member_facs * member_g, minlength=len(clusters))
+        for n in range(len(clusters)):
+            boltz_facs['cluster-' + cluster_label(n)] = float(cluster_facs[n])
+            weighted_free_energy['cluster-' + cluster_label(n)] = float(cluster_g[n])
 
     return boltz_facs, weighted_free_energy, boltz_sum
 
 
-def check_dup(files, thermo_data):
+def read_sigma(sigma, files, l_o_t):
     """
-    Check for duplicate species from among all files based on energy, rotational constants and frequencies
-    
-    Energy cutoff = 1 microHartree
-    RMS Rotational Constant cutoff = 1kHz
-    RMS Freq cutoff = 10 wavenumbers
-    """
-    e_cutoff = 1e-4
-    ro_cutoff = 1e-4
-    freq_cutoff = 100
-    mae_freq_cutoff = 10
-    max_freq_cutoff = 10
-    dup_list = []
-    freq_diff, mae_freq_diff, max_freq_diff, e_diff, ro_diff = 100, 3, 10, 1, 1
-    for i, file in enumerate(files):
-        for j in range(0, i):
-            bbe_i, bbe_j = thermo_data[files[i]], thermo_data[files[j]]
-            if hasattr(bbe_i, "scf_energy") and hasattr(bbe_j, "scf_energy"):
-                e_diff = bbe_i.scf_energy - bbe_j.scf_energy
-            if hasattr(bbe_i, "roconst") and hasattr(bbe_j, "roconst"):
-                if len(bbe_i.roconst) == len(bbe_j.roconst):
-                    ro_diff = np.linalg.norm(np.array(bbe_i.roconst) - np.array(bbe_j.roconst))
-            if hasattr(bbe_i, "frequency_wn") and hasattr(bbe_j, "frequency_wn"):
-                if len(bbe_i.frequency_wn) == len(bbe_j.frequency_wn) and len(bbe_i.frequency_wn) > 0:
-                    freq_diff = [np.linalg.norm(freqi - freqj) for freqi, freqj in
-                                 zip(bbe_i.frequency_wn, bbe_j.frequency_wn)]
-                    mae_freq_diff, max_freq_diff = np.mean(freq_diff), np.max(freq_diff)
-                elif len(bbe_i.frequency_wn) == len(bbe_j.frequency_wn) and len(bbe_i.frequency_wn) == 0:
-                    mae_freq_diff, max_freq_diff = 0., 0.
-            if e_diff < e_cutoff and ro_diff < ro_cutoff and mae_freq_diff < mae_freq_cutoff and max_freq_diff < max_freq_cutoff:
-                dup_list.append([files[i], files[j]])
-    return dup_list
+    Obtain the free energy uncertainty of each structure for Monte-Carlo sampling.
 
+    Parameters:
+    sigma (str): a single uncertainty (kcal/mol) applied to all structures, or the name of a file containing
+                 'name = sigma' lines, where name is a structure name, a level of theory or 'default'.
+    files (list): files to obtain uncertainties for.
+    l_o_t (list): level of theory of each file.
 
-def print_check_fails(log, check_attribute, file, attribute, option2=False):
-    """Function for printing checks to the terminal"""
-    unique_attr = {}
-    for i, attr in enumerate(check_attribute):
-        if option2 is not False: attr = (attr, option2[i])
-        if attr not in unique_attr:
-            unique_attr[attr] = [file[i]]
-        else:
-            unique_attr[attr].append(file[i])
-    log.write("\nx  Caution! Different {} found: ".format(attribute))
-    for attr in unique_attr:
-        if option2 is not False:
-            if float(attr[0]) < 0:
-                log.write('\n       {} {}: '.format(attr[0], attr[1]))
+    Returns:
+    numpy.ndarray: uncertainty of each file in kcal/mol.
+    """
+    try:
+        return np.full(len(files), float(sigma))
+    except ValueError:
+        pass
+    if not os.path.isfile(sigma):
+        raise GoodVibesError("\n   Uncertainty '{}' is neither a value in kcal/mol nor a file.\n".format(sigma))
+    table = {}
+    with open(sigma) as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if len(line) == 0:
+                continue
+            if '=' in line:
+                name, value = line.rsplit('=', 1)
             else:
-                log.write('\n        {} {}: '.format(attr[0], attr[1]))
+                name, value = line.rsplit(None, 1)
+            table[name.strip().upper()] = float(value)
+    sigmas = np.zeros(len(files))
+    for i, file in enumerate(files):
+        name = os.path.basename(file)
+        for key in (os.path.splitext(name)[0], name, l_o_t[i], 'default'):
+            if key.upper() in table:
+                sigmas[i] = table[key.upper()]
+                break
         else:
-            log.write('\n        -{}: '.format(attr))
-        for filename in unique_attr[attr]:
-            if filename is unique_attr[attr][-1]:
-                log.write('{}'.format(filename))
-            else:
-                log.write('{}, '.format(filename))
+            raise GoodVibesError("\n   No uncertainty found for {} in {}. Add an entry for this structure, its level of theory "
+                     "({}) or a 'default' entry.\n".format(name, sigma, l_o_t[i]))
+    return sigmas
 
 
-def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model, orientation, grid):
-    """
-    Perform checks for consistency in calculation output files for computational projects
-    
-    Check for consistency in: Gaussian version, solvation state/gas phase,
-    level of theory/basis set, charge and multiplicity, standard concentration,
-    potential linear molecule errors, transition state verification, empirical dispersion models
+def boltz_populations(energies, temperature):
     """
-    log.write("\n   Checks for thermochemistry calculations (frequency calculations):")
-    log.write("\n" + STARS)
-    # Check program used and version
-    version_check = [thermo_data[key].version_program for key in thermo_data]
-    file_check = [thermo_data[key].file for key in thermo_data]
-    if all_same(version_check) != False:
-        log.write("\no  Using {} in all calculations.".format(version_check[0]))
-    else:
-        print_check_fails(log, version_check, file_check, "programs or versions")
+    Normalized Boltzmann populations of one or many sets of free energies.
 
-    # Check level of theory
-    if all_same(l_o_t) is not False:
+    Parameters:
+    energies (array): free energies (Hartree); the last axis runs over structures, any leading axes (e.g. samples)
+                      are treated as independent sets.
+    temperature (float): temperature to compute Boltzmann populations at.
+
+    Returns:
+    numpy.ndarray: populations with the same shape as energies, summing to one along the last axis.
+    """
+    energies = np.asarray(energies, dtype=float)
+    facs = np.exp(-(energies - np.min(energies, axis=-1, keepdims=True)) * J_TO_AU / GAS_CONSTANT / temperature)
+    return facs / np.sum(facs, axis=-1, keepdims=True)
+
+
+def mc_boltz(energies, sigma, temperature, samples, seed=None, chunk_size=2 ** 22):
+    """
+    Monte-Carlo propagation of free energy uncertainties into Boltzmann populations.
+
+    Gaussian noise is added to every free energy and the populations of all samples are evaluated as batched array
+    operations, a chunk of samples at a time to bound memory use.
+
+    Parameters:
+    energies (array): free energies (Hartree) of each structure.
+    sigma (array): standard deviation (kcal/mol) of each free energy.
+    temperature (float): temperature to compute Boltzmann populations at.
+    samples (int): number of Monte-Carlo samples.
+    seed (int): seed for the random number generator.
+    chunk_size (int): maximum number of sampled energies held at once.
+
+    Returns:
+    numpy.ndarray: populations of shape (samples, structures).
+    """
+    energies = np.asarray(energies, dtype=float)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float) / KCAL_TO_AU, energies.shape)
+    rng = np.random.default_rng(seed)
+    populations = np.empty((samples, len(energies)))
+    step = max(1, chunk_size // max(1, len(energies)))
+    for start in range(0, samples, step):
+        stop = min(samples, start + step)
+        perturbed = energies + rng.standard_normal((stop - start, len(energies))) * sigma
+        populations[start:stop] = boltz_populations(perturbed, temperature)
+    return populations
+
+
+def mc_selectivity(populations, a_mask, b_mask, temperature, sign=1.0):
+    """
+    Selectivity of each Monte-Carlo sample.
+
+    Parameters:
+    populations (array): populations of shape (samples, structures).
+    a_mask (array): bool mask of structures belonging to the first isomer.
+    b_mask (array): bool mask of structures belonging to the second isomer.
+    temperature (float): temperature to compute ddG at.
+    sign (float): +1 to report the excess of the first isomer, -1 for the second.
+
+    Returns:
+    numpy.ndarray: signed excess (%) of each sample.
+    numpy.ndarray: signed ddG (kcal/mol) of each sample.
+    """
+    ee = sign * (populations[:, a_mask].sum(axis=1) - populations[:, b_mask].sum(axis=1)) * 100.0
+    ee = np.clip(ee, -99.99, 99.99)
+    dd_free_energy = GAS_CONSTANT / J_TO_AU * temperature * np.log((50 + ee / 2.0) / (50 - ee / 2.0)) * KCAL_TO_AU
+    return ee, dd_free_energy
+
+
+def confidence_interval(values, level=95.0):
+    """
+    Mean and central confidence interval of Monte-Carlo samples along the first axis.
+
+    Returns:
+    tuple: mean, lower bound and upper bound.
+    """
+    low, high = np.percentile(values, [(100.0 - level) / 2.0, (100.0 + level) / 2.0], axis=0)
+    return np.mean(values, axis=0), low, high
+
+
+def get_mc_input(files, thermo_data, dup_list, sigma, l_o_t, temperature):
+    """
+    Collect the structures, free energies and uncertainties entering a Monte-Carlo Boltzmann analysis.
+
+    Duplicates and files without thermochemistry are left out, as in get_boltz. The free energy of a degenerate
+    structure is lowered by RT ln(degeneracy) so that its population matches the weighting in get_boltz.
+
+    Returns:
+    list: files included.
+    numpy.ndarray: qh free energies (Hartree).
+    numpy.ndarray: uncertainties (kcal/mol).
+    """
+    duplicates = set(dup[0] for dup in dup_list)
+    sigmas = read_sigma(sigma, files, l_o_t)
+    keep = [i for i, file in enumerate(files) if file not in duplicates and
+            getattr(thermo_data[file], "qh_gibbs_free_energy", None) is not None]
+    mc_files = [files[i] for i in keep]
+    energies = np.array([thermo_data[file].qh_gibbs_free_energy for file in mc_files])
+    degeneracy = np.array([getattr(thermo_data[file], "degeneracy", 1) for file in mc_files], dtype=float)
+    energies -= GAS_CONSTANT * temperature * np.log(np.maximum(degeneracy, 1.0)) / J_TO_AU
+    return mc_files, energies, sigmas[keep]
+
+
+def energy_window_pairs(energies, e_cutoff):
+    """
+    Find all pairs of structures whose energies differ by less than a cutoff.
+
+    Energies are sorted once and each structure is paired with the structures that follow it in the sorted order
+    up to the end of its energy window, so the cost scales with the number of close pairs rather than N^2.
+
+    Parameters:
+    energies (array): energy of each structure, NaN if unavailable (never paired).
+    e_cutoff (float): energy window.
+
+    Returns:
+    numpy.ndarray: index of the later structure of each pair (in input order).
+    numpy.ndarray: index of the earlier structure of each pair.
+    """
+    energies = np.asarray(energies, dtype=float)
+    order = np.flatnonzero(~np.isnan(energies))
+    order = order[np.argsort(energies[order], kind='stable')]
+    sorted_e = energies[order]
+    window_end = np.searchsorted(sorted_e, sorted_e + e_cutoff, side='left')
+    counts = window_end - np.arange(len(order)) - 1
+    first = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(len(first)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    a, b = order[first], order[first + offsets]
+    return np.maximum(a, b), np.minimum(a, b)
+
+
+def heavy_atom_coords(thermo_data, files):
+    """
+    Heavy-atom element sequence and coordinates of each file, grouped by element sequence.
+
+    Hydrogens are dropped unless a structure contains no other atoms.
+
+    Returns:
+    numpy.ndarray: group index of each file (-1 if no geometry was parsed); files share a group when their heavy
+                   atoms are the same elements in the same order.
+    list: coordinate arrays of shape (members, atoms, 3), one per group.
+    numpy.ndarray: position of each file within its group.
+    """
+    groups, group_coords = {}, []
+    group = np.full(len(files), -1)
+    position = np.zeros(len(files), dtype=int)
+    for i, file in enumerate(files):
+        xyz = getattr(thermo_data[file], "xyz", None)
+        if xyz is None or len(getattr(xyz, "cartesians", [])) == 0:
+            continue
+        atom_nums = np.asarray(xyz.atom_nums)
+        heavy = atom_nums > 1 if np.any(atom_nums > 1) else np.ones(len(atom_nums), dtype=bool)
+        key = tuple(atom_nums[heavy])
+        if key not in groups:
+            groups[key] = len(groups)
+            group_coords.append([])
+        group[i] = groups[key]
+        position[i] = len(group_coords[group[i]])
+        group_coords[group[i]].append(np.asarray(xyz.cartesians, dtype=float)[heavy])
+    return group, [np.array(coords) for coords in group_coords], position
+
+
+def match_roconst(files, thermo_data, later, earlier, ro_cutoff=None, ro_rel_cutoff=None):
+    """
+    Compare the rotational constants of pairs of files.
+
+    Parameters:
+    later (array): index of the first structure of each pair.
+    earlier (array): index of the second structure of each pair.
+    ro_cutoff (float): largest norm of the difference (absolute test).
+    ro_rel_cutoff (float): largest norm of the difference relative to the norm of the second structure (used if no
+                           absolute cutoff is given).
+
+    Returns:
+    numpy.ndarray: True for pairs with the same number of rotational constants that agree within the cutoff.
+    """
+    roconsts = [getattr(thermo_data[file], "roconst", None) for file in files]
+    ro_len = np.array([-1 if ro is None else len(ro) for ro in roconsts])
+    ro_vals = np.zeros((len(files), max([3] + list(ro_len))))
+    for i, ro in enumerate(roconsts):
+        if ro_len[i] > 0:
+            ro_vals[i, :ro_len[i]] = ro
+    ro_diff = np.linalg.norm(ro_vals[later] - ro_vals[earlier], axis=1)
+    if ro_cutoff is not None:
+        close = ro_diff < ro_cutoff
+    else:
+        close = ro_diff <= ro_rel_cutoff * np.linalg.norm(ro_vals[earlier], axis=1)
+    return (ro_len[later] == ro_len[earlier]) & (ro_len[later] >= 0) & close
+
+
+def pair_rmsd(files, thermo_data, later, earlier, mirror=False, chunk_size=2 ** 22):
+    """
+    Heavy-atom RMSD after alignment (see kabsch) for pairs of files.
+
+    Parameters:
+    files (list): files to compare.
+    thermo_data (dict): parsed data of each file (the geometry is taken from its xyz attribute).
+    later (array): index of the first structure of each pair.
+    earlier (array): index of the second structure of each pair.
+    mirror (bool): reflect the first structure of each pair through a plane before alignment.
+    chunk_size (int): maximum number of coordinates held at once.
+
+    Returns:
+    numpy.ndarray: RMSD of each pair, inf if the structures do not share the same heavy-atom sequence.
+    """
+    group, group_coords, position = heavy_atom_coords(thermo_data, files)
+    rmsd = np.full(len(later), np.inf)
+    comparable = (group[later] == group[earlier]) & (group[later] >= 0)
+    reflect = np.array([-1.0, 1.0, 1.0]) if mirror else np.ones(3)
+    for g in np.unique(group[later][comparable]):
+        pairs = np.flatnonzero(comparable & (group[later] == g))
+        coords = group_coords[g]
+        step = max(1, chunk_size // (9 * coords.shape[1]))
+        for start in range(0, len(pairs), step):
+            chunk = pairs[start:start + step]
+            rmsd[chunk] = kabsch(coords[position[later[chunk]]] * reflect, coords[position[earlier[chunk]]])[1]
+    return rmsd
+
+
+class initial_structure:
+    """
+    Energy, rotational constants and geometry of an output file, read once before its thermochemistry is evaluated.
+
+    Provides the attributes of calc_bbe that check_enantiomers compares, so mirror images can be found before any
+    file is evaluated.
+
+    Attributes:
+        file (str): the output file.
+        scf_energy (float): final energy (see parse_data), NaN if none was found.
+        roconst (list): last rotational constants (GHz) printed in the file, empty if none.
+        xyz (getoutData): geometry of the file.
+    """
+    def __init__(self, file):
+        with open(file) as f:
+            data = f.readlines()
+        self.file = file
+        spe = parse_data(file, data)[0]
+        self.scf_energy = np.nan if spe == 'none' else spe
+        self.roconst = []
+        for line in data:
+            if line.strip().startswith('Rotational constants (GHZ):'):
+                values = line.strip().replace(':', ' ').split()
+                try:
+                    self.roconst = [float(values[3]), float(values[4]), float(values[5])]
+                except ValueError:
+                    self.roconst = [float(values[4]), float(values[5])]
+        self.xyz = getoutData(file, data)
+
+
+def mirror_image(bbe, structure, spc_file=None):
+    """
+    Thermochemistry of a mirror image, which is that of its representative with the file and geometry of the mirror.
+
+    Parameters:
+    bbe (calc_bbe): thermochemistry of the representative.
+    structure (initial_structure): the mirror image (or its calc_bbe: only the file and xyz attributes are used).
+    spc_file (str): separate single-point file of the mirror image, if any.
+
+    Returns:
+    calc_bbe: a copy of bbe.
+    """
+    mirror = copy.copy(bbe)
+    mirror.__dict__.pop('_sp_xyz', None)
+    sp_file = getattr(bbe, 'sp_file', None)
+    if sp_file is not None:
+        mirror.sp_file = structure.file if sp_file == bbe.file else spc_file
+    mirror.file, mirror.xyz = structure.file, structure.xyz
+    return mirror
+
+
+def check_enantiomers(files, thermo_data, rmsd_cutoff=0.1, e_cutoff=1e-4, ro_rel_cutoff=0.02, chunk_size=2 ** 22):
+    """
+    Find conformers that are mirror images of an earlier conformer.
+
+    Candidates within the energy window (see energy_window_pairs) with matching rotational constants are compared
+    by heavy-atom RMSD after reflecting one structure: a pair is a mirror pair if the reflected structure superimposes
+    within the cutoff while the structures themselves do not (which would make them duplicates). Each structure is
+    paired at most once, so a collapsed pair stands for exactly two conformers.
+
+    Structures are given as calc_bbe or initial_structure (anything with scf_energy, roconst and xyz attributes).
+
+    Returns:
+    list: [mirror image, representative] file pairs, where the representative appears earlier in files.
+    """
+    energies = np.array([getattr(thermo_data[file], "scf_energy", np.nan) for file in files], dtype=float)
+    later, earlier = energy_window_pairs(energies, e_cutoff)
+    keep = match_roconst(files, thermo_data, later, earlier, ro_rel_cutoff=ro_rel_cutoff)
+    later, earlier = later[keep], earlier[keep]
+    keep = pair_rmsd(files, thermo_data, later, earlier, mirror=True, chunk_size=chunk_size) < rmsd_cutoff
+    later, earlier = later[keep], earlier[keep]
+    keep = pair_rmsd(files, thermo_data, later, earlier, chunk_size=chunk_size) >= rmsd_cutoff
+    later, earlier = later[keep], earlier[keep]
+
+    paired, enant_list = set(), []
+    for order in np.lexsort((earlier, later)):
+        i, j = later[order], earlier[order]
+        if i not in paired and j not in paired:
+            paired.update((i, j))
+            enant_list.append([files[i], files[j]])
+    return enant_list
+
+
+def set_degeneracy(thermo_data, enant_list):
+    """
+    Collapse mirror-image pairs: the representative counts twice and the mirror image not at all.
+
+    The degeneracy attribute multiplies the Boltzmann factor of a structure (see get_boltz and get_pes).
+    """
+    for mirror, representative in enant_list:
+        thermo_data[representative].degeneracy = 2
+        thermo_data[mirror].degeneracy = 0
+
+
+def check_dup(files, thermo_data, e_cutoff=1e-4, ro_cutoff=1e-4, mae_freq_cutoff=10, max_freq_cutoff=10,
+              rmsd_cutoff=None, ro_rel_cutoff=0.02, chunk_size=2 ** 22):
+    """
+    Check for duplicate species from among all files based on energy, rotational constants and frequencies
+    
+    Only pairs inside the energy window are considered (see energy_window_pairs). Rotational constants and
+    frequencies of all candidate pairs are then compared as arrays, grouped by the number of values.
+    If an RMSD cutoff is given, the geometry replaces the frequencies as criterion: candidates that pass a looser
+    (relative) rotational constant prefilter are aligned and compared by heavy-atom RMSD (see kabsch).
+
+    Energy cutoff = 0.1 milliHartree
+    Rotational constant cutoff = 0.1 MHz (norm of the difference), or 2% (relative) with an RMSD cutoff
+    Freq cutoff = 10 wavenumbers (mean and max absolute difference)
+
+    Returns:
+    list: [duplicate, original] file pairs, where the original appears earlier in files.
+    """
+    energies = np.array([getattr(thermo_data[file], "scf_energy", np.nan) for file in files], dtype=float)
+    later, earlier = energy_window_pairs(energies, e_cutoff)
+
+    # Rotational constants must have the same length and agree within the cutoff
+    if rmsd_cutoff is None:
+        keep = match_roconst(files, thermo_data, later, earlier, ro_cutoff=ro_cutoff)
+    else:
+        keep = match_roconst(files, thermo_data, later, earlier, ro_rel_cutoff=ro_rel_cutoff)
+    later, earlier = later[keep], earlier[keep]
+
+    if rmsd_cutoff is not None:
+        # Geometries must contain the same heavy atoms in the same order and superimpose within the cutoff
+        keep = pair_rmsd(files, thermo_data, later, earlier, chunk_size=chunk_size) < rmsd_cutoff
+        later, earlier = later[keep], earlier[keep]
+    else:
+        # Frequencies must have the same length and agree within the cutoffs
+        freqs = [getattr(thermo_data[file], "frequency_wn", None) for file in files]
+        freq_len = np.array([-1 if freq is None else len(freq) for freq in freqs])
+        keep = (freq_len[later] == freq_len[earlier]) & (freq_len[later] >= 0)
+        later, earlier = later[keep], earlier[keep]
+        keep = np.zeros(len(later), dtype=bool)
+        for n_freq in np.unique(freq_len[later]):
+            pairs = np.flatnonzero(freq_len[later] == n_freq)
+            if n_freq == 0:
+                keep[pairs] = True
+                continue
+            members = np.flatnonzero(freq_len == n_freq)
+            position = np.zeros(len(files), dtype=int)
+            position[members] = np.arange(len(members))
+            table = np.array([freqs[i] for i in members], dtype=float)
+            step = max(1, chunk_size // int(n_freq))
+            for start in range(0, len(pairs), step):
+                chunk = pairs[start:start + step]
+                freq_diff = np.abs(table[position[later[chunk]]] - table[position[earlier[chunk]]])
+                keep[chunk] = (np.mean(freq_diff, axis=1) < mae_freq_cutoff) & \
+                              (np.max(freq_diff, axis=1) < max_freq_cutoff)
+        later, earlier = later[keep], earlier[keep]
+
+    order = np.lexsort((earlier, later))
+    return [[files[i], files[j]] for i, j in zip(later[order], earlier[order])]
+
+
+def print_check_fails(log, check_attribute, file, attribute, option2=False):
+    """Function for printing checks to the terminal"""
+    unique_attr = {}
+    for i, attr in enumerate(check_attribute):
+        if option2 is not False: attr = (attr, option2[i])
+        if attr not in unique_attr:
+            unique_attr[attr] = [file[i]]
+        else:
+            unique_attr[attr].append(file[i])
+    log.write("\nx  Caution! Different {} found: ".format(attribute))
+    for attr in unique_attr:
+        if option2 is not False:
+            if float(attr[0]) < 0:
+                log.write('\n       {} {}: '.format(attr[0], attr[1]))
+            else:
+                log.write('\n        {} {}: '.format(attr[0], attr[1]))
+        else:
+            log.write('\n        -{}: '.format(attr))
+        for filename in unique_attr[attr]:
+            if filename is unique_attr[attr][-1]:
+                log.write('{}'.format(filename))
+            else:
+                log.write('{}, '.format(filename))
+
+
+def align_deviation(coords_a, coords_b):
+    """
+    Superimpose many pairs of structures (see kabsch) and measure the remaining differences.
+
+    Parameters:
+    coords_a (array): reference coordinates of shape (pairs, atoms, 3).
+    coords_b (array): coordinates of shape (pairs, atoms, 3), atoms in the same order as coords_a.
+
+    Returns:
+    numpy.ndarray: largest atomic deviation of each pair after alignment.
+    numpy.ndarray: RMSD of each pair after alignment.
+    """
+    a = np.asarray(coords_a, dtype=float)
+    b = np.asarray(coords_b, dtype=float)
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    rotation = kabsch(a, b)[0]
+    deviation = np.linalg.norm(np.einsum('pni,pij->pnj', b, rotation) - a, axis=2)
+    return np.max(deviation, axis=1), np.sqrt(np.mean(deviation ** 2, axis=1))
+
+
+def match_atom_order(atom_nums_a, coords_a, atom_nums_b, coords_b):
+    """
+    Find the atom order of structure b that matches structure a.
+
+    Both structures are brought into their principal axes (each proper choice of axis directions is tried) and each
+    atom of a is matched with the closest atom of b of the same element.
+
+    Returns:
+    numpy.ndarray or None: indices of the atoms of b in the order of a, None if no consistent order was found.
+    """
+    atom_nums_a, atom_nums_b = np.asarray(atom_nums_a), np.asarray(atom_nums_b)
+    if len(atom_nums_a) != len(atom_nums_b) or sorted(atom_nums_a) != sorted(atom_nums_b):
+        return None
+    a, axes_a = principal_axes(coords_a)
+    b, axes_b = principal_axes(coords_b)
+    frame_a = a @ axes_a
+    best, best_rmsd = None, np.inf
+    for signs in PROPER_AXIS_SIGNS:
+        frame_b = (b @ axes_b) * signs
+        order = np.empty(len(a), dtype=int)
+        for element in np.unique(atom_nums_a):
+            idx_a = np.flatnonzero(atom_nums_a == element)
+            idx_b = np.flatnonzero(atom_nums_b == element)
+            dist = np.linalg.norm(frame_a[idx_a, None, :] - frame_b[None, idx_b, :], axis=2)
+            order[idx_a] = idx_b[np.argmin(dist, axis=1)]
+        if len(np.unique(order)) != len(order):
+            continue
+        rmsd = kabsch(a[None], b[order][None])[1][0]
+        if rmsd < best_rmsd:
+            best, best_rmsd = order, rmsd
+    return best
+
+
+def check_geometries(xyz_a, xyz_b, tol=0.01):
+    """
+    Compare pairs of geometries (e.g. frequency and single-point calculations) after alignment.
+
+    Pairs with the same number of atoms are aligned together (see align_deviation). Pairs listing their atoms in a
+    different order, or that do not match in the given order, are compared again after reordering the atoms of the
+    second geometry (see match_atom_order).
+
+    Parameters:
+    xyz_a (list): getoutData objects (atom_nums and cartesians) of the reference geometries.
+    xyz_b (list): getoutData objects of the geometries to compare with.
+    tol (float): largest deviation (Angstrom) below which a pair is not retried with reordered atoms.
+
+    Returns:
+    numpy.ndarray: largest atomic deviation of each pair after alignment (inf if the atoms differ).
+    numpy.ndarray: RMSD of each pair after alignment (inf if the atoms differ).
+    """
+    max_dev, rmsd = np.full(len(xyz_a), np.inf), np.full(len(xyz_a), np.inf)
+    n_atoms = np.array([len(xyz.atom_nums) for xyz in xyz_a])
+    same_order = np.array([list(a.atom_nums) == list(b.atom_nums) for a, b in zip(xyz_a, xyz_b)], dtype=bool)
+    for n in np.unique(n_atoms[same_order]):
+        pairs = np.flatnonzero(same_order & (n_atoms == n))
+        max_dev[pairs], rmsd[pairs] = align_deviation([xyz_a[i].cartesians for i in pairs],
+                                                      [xyz_b[i].cartesians for i in pairs])
+    # Retry pairs that did not match, allowing for a different atom order
+    for i in np.flatnonzero(~same_order | ~(max_dev < tol)):
+        order = match_atom_order(xyz_a[i].atom_nums, xyz_a[i].cartesians, xyz_b[i].atom_nums, xyz_b[i].cartesians)
+        if order is not None:
+            dev = align_deviation([xyz_a[i].cartesians], [np.asarray(xyz_b[i].cartesians)[order]])
+            if dev[0][0] < max_dev[i]:
+                max_dev[i], rmsd[i] = dev[0][0], dev[1][0]
+    return max_dev, rmsd
+
+
+def is_linear(cartesians, tol=0.1):
+    """
+    Collinearity test of one or many geometries with the same number of atoms.
+
+    The second and third singular values of the centered coordinates measure the spread of the atoms perpendicular
+    to their best-fit line.
+
+    Parameters:
+    cartesians (array): coordinates of shape (atoms, 3) or (structures, atoms, 3).
+    tol (float): largest root-mean-square distance (Angstrom) of the atoms from the line.
+
+    Returns:
+    bool or numpy.ndarray: True for linear geometries.
+    """
+    coords = np.asarray(cartesians, dtype=float)
+    centered = coords - coords.mean(axis=-2, keepdims=True)
+    sv = np.linalg.svd(centered, compute_uv=False)
+    return np.sqrt(np.sum(sv[..., 1:] ** 2, axis=-1) / coords.shape[-2]) < tol
+
+
+def check_imaginary(log, files, thermo_data):
+    """Checks whether any TS have > 1 imaginary frequency and any GS have any imaginary frequencies"""
+    for file in files:
+        bbe = thermo_data[file]
+        n_imag = getattr(bbe, 'n_imag', None)
+        if n_imag is None:
+            if not hasattr(bbe, 'im_frequency_wn'):
+                continue
+            n_imag = len(bbe.im_frequency_wn)
+        if bbe.job_type.find('TS') > -1 and n_imag != 1:
+            log.write("\nx  Caution! TS {} does not have 1 imaginary frequency greater than -50 wavenumbers.".format(file))
+        if bbe.job_type.find('GS') > -1 and bbe.job_type.find('TS') == -1 and n_imag != 0:
+            log.write("\nx  Caution: GS {} has 1 or more imaginary frequencies greater than -50 wavenumbers.".format(file))
+
+
+def check_dispersion(log, thermo_data, file_check):
+    """Check for empirical dispersion"""
+    dispersion_check = [thermo_data[key].empirical_dispersion for key in thermo_data]
+    if all_same(dispersion_check):
+        if dispersion_check[0] == 'No empirical dispersion detected':
+            log.write("\n-  No empirical dispersion detected in any of the calculations.")
+        else:
+            log.write("\no  Using " + dispersion_check[0] + " in all calculations.")
+    else:
+        print_check_fails(log, dispersion_check, file_check, "dispersion models")
+
+
+def check_only(log, files, options, STARS):
+    """
+    Validate output files from their heads and tails only, without any thermochemistry.
+
+    Prints the termination status and the check_files report, and writes the validation data of every file to a
+    JSON file next to the GoodVibes output.
+
+    Returns:
+    dict: output_summary object of each file.
+    """
+    summaries = dict((file, output_summary(file)) for file in files)
+    log.write("\n\n   Checks for output files (heads and tails only):")
+    log.write("\n" + STARS)
+    progress = [summaries[file].progress for file in files]
+    if all(status == 'Normal' for status in progress):
+        log.write("\no  All {} calculations terminated normally.".format(len(files)))
+    else:
+        print_check_fails(log, progress, files, "termination states")
+    log.write("\n" + STARS + "\n")
+    l_o_t = [summaries[file].level_of_theory for file in files]
+    s_m = [summaries[file].solvation for file in files]
+    check_files(log, files, summaries, options, STARS, l_o_t, s_m, None, None, headers_only=True)
+    json_file = 'Goodvibes_{}.json'.format(options.output)
+    with open(json_file, 'w') as f:
+        json.dump([summaries[file].report() for file in files], f, indent=1)
+    log.write("\n   Validation report written to " + json_file + "\n")
+    return summaries
+
+
+def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model, orientation, grid,
+                spc_l_o_t=None, headers_only=False):
+    """
+    Perform checks for consistency in calculation output files for computational projects
+    
+    Check for consistency in: Gaussian version, solvation state/gas phase,
+    level of theory/basis set, charge and multiplicity, standard concentration,
+    potential linear molecule errors, transition state verification, empirical dispersion models
+
+    All checks use the data already parsed into thermo_data; spc_l_o_t maps each file to the level of theory of its
+    single-point correction (see analysis.spc_levels_of_theory). With headers_only, thermo_data holds
+    output_summary objects and the checks that need geometries or frequencies are skipped.
+    """
+    log.write("\n   Checks for thermochemistry calculations (frequency calculations):")
+    log.write("\n" + STARS)
+    # Check program used and version
+    version_check = [thermo_data[key].version_program for key in thermo_data]
+    file_check = [thermo_data[key].file for key in thermo_data]
+    if all_same(version_check) != False:
+        log.write("\no  Using {} in all calculations.".format(version_check[0]))
+    else:
+        print_check_fails(log, version_check, file_check, "programs or versions")
+
+    # Check level of theory
+    if all_same(l_o_t) is not False:
         log.write("\no  Using {} in all calculations.".format(l_o_t[0]))
     elif all_same(l_o_t) is False:
         print_check_fails(log, l_o_t, file_check, "levels of theory")
@@ -2784,70 +4963,42 @@ def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model,
     else:
         print_check_fails(log, charge_check, file_check, "charge and multiplicity", multiplicity_check)
 
-    # Check for duplicate structures
-    dup_list = check_dup(files, thermo_data)
+    if headers_only:
+        check_imaginary(log, files, thermo_data)
+        check_dispersion(log, thermo_data, file_check)
+        log.write("\n" + STARS + "\n")
+        return
+
+    # Check for duplicate structures; mirror images match on energy and frequencies but are reported as enantiomers
+    enant_list = check_enantiomers(files, thermo_data, rmsd_cutoff=options.rmsd if options.rmsd else 0.1)
+    dup_list = [dup for dup in check_dup(files, thermo_data, rmsd_cutoff=options.rmsd) if dup not in enant_list]
     if len(dup_list) == 0:
-        log.write("\no  No duplicates or enantiomers found")
+        log.write("\no  No duplicates found")
     else:
-        log.write("\nx  Caution! Possible duplicates or enantiomers found:")
+        log.write("\nx  Caution! Possible duplicates found:")
         for dup in dup_list:
             log.write('\n        {} and {}'.format(dup[0], dup[1]))
 
-    # Check for linear molecules with incorrect number of vibrational modes
-    linear_fails, linear_fails_atom, linear_fails_cart, linear_fails_files, linear_fails_list = [], [], [], [], []
-    frequency_list = []
-    for file in files:
-        linear_fails = getoutData(file)
-        linear_fails_cart.append(linear_fails.cartesians)
-        linear_fails_atom.append(linear_fails.atom_types)
-        linear_fails_files.append(file)
-        frequency_list.append(thermo_data[file].frequency_wn)
-
-    linear_fails_list.append(linear_fails_atom)
-    linear_fails_list.append(linear_fails_cart)
-    linear_fails_list.append(frequency_list)
-    linear_fails_list.append(linear_fails_files)
+    if len(enant_list) == 0:
+        log.write("\no  No enantiomers found")
+    else:
+        log.write("\nx  Caution! Possible enantiomers found (collapsed with option --enant):")
+        for enant in enant_list:
+            log.write('\n        {} and {}'.format(enant[0], enant[1]))
 
+    # Check for linear molecules with incorrect number of vibrational modes (3N-5)
     linear_mol_correct, linear_mol_wrong = [], []
-    for i in range(len(linear_fails_list[0])):
-        count_linear = 0
-        if len(linear_fails_list[0][i]) == 2:
-            if len(linear_fails_list[2][i]) == 1:
-                linear_mol_correct.append(linear_fails_list[3][i])
+    n_atoms = np.array([len(thermo_data[file].xyz.cartesians) for file in files])
+    for n in np.unique(n_atoms[n_atoms > 1]):
+        group = [file for file, n_file in zip(files, n_atoms) if n_file == n]
+        linear = is_linear([thermo_data[file].xyz.cartesians for file in group])
+        for file, is_lin in zip(group, linear):
+            if not is_lin:
+                continue
+            if len(thermo_data[file].frequency_wn) == 3 * n - 5:
+                linear_mol_correct.append(file)
             else:
-                linear_mol_wrong.append(linear_fails_list[3][i])
-        if len(linear_fails_list[0][i]) == 3:
-            if linear_fails_list[0][i] == ['I', 'I', 'I'] or linear_fails_list[0][i] == ['O', 'O', 'O'] or \
-                    linear_fails_list[0][i] == ['N', 'N', 'N'] or linear_fails_list[0][i] == ['H', 'C', 'N'] or \
-                    linear_fails_list[0][i] == ['H', 'N', 'C'] or linear_fails_list[0][i] == ['C', 'H', 'N'] or \
-                    linear_fails_list[0][i] == ['C', 'N', 'H'] or linear_fails_list[0][i] == ['N', 'H', 'C'] or \
-                    linear_fails_list[0][i] == ['N', 'C', 'H']:
-                if len(linear_fails_list[2][i]) == 4:
-                    linear_mol_correct.append(linear_fails_list[3][i])
-                else:
-                    linear_mol_wrong.append(linear_fails_list[3][i])
-            else:
-                for j in range(len(linear_fails_list[0][i])):
-                    for k in range(len(linear_fails_list[0][i])):
-                        if k > j:
-                            for l in range(len(linear_fails_list[1][i][j])):
-                                if linear_fails_list[0][i][j] == linear_fails_list[0][i][k]:
-                                    if linear_fails_list[1][i][j][l] > (-linear_fails_list[1][i][k][l] - 0.1) and \
-                                            linear_fails_list[1][i][j][l] < (-linear_fails_list[1][i][k][l] + 0.1):
-                                        count_linear = count_linear + 1
-                                        if count_linear == 3:
-                                            if len(linear_fails_list[2][i]) == 4:
-                                                linear_mol_correct.append(linear_fails_list[3][i])
-                                            else:
-                                                linear_mol_wrong.append(linear_fails_list[3][i])
-        if len(linear_fails_list[0][i]) == 4:
-            if linear_fails_list[0][i] == ['C', 'C', 'H', 'H'] or linear_fails_list[0][i] == ['C', 'H', 'C', 'H'] or \
-                    linear_fails_list[0][i] == ['C', 'H', 'H', 'C'] or linear_fails_list[0][i] == ['H', 'C', 'C', 'H'] or \
-                    linear_fails_list[0][i] == ['H', 'C', 'H', 'C'] or linear_fails_list[0][i] == ['H', 'H', 'C', 'C']:
-                if len(linear_fails_list[2][i]) == 7:
-                    linear_mol_correct.append(linear_fails_list[3][i])
-                else:
-                    linear_mol_wrong.append(linear_fails_list[3][i])
+                linear_mol_wrong.append(file)
     linear_correct_print, linear_wrong_print = "", ""
     for i in range(len(linear_mol_correct)):
         linear_correct_print += ', ' + linear_mol_correct[i]
@@ -2869,37 +5020,14 @@ def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model,
                       "number of frequencies (3N-5) found in other calculations -{}.".format(linear_wrong_print,
                                                                                              linear_correct_print))
 
-    # Checks whether any TS have > 1 imaginary frequency and any GS have any imaginary frequencies
-    for file in files:
-        bbe = thermo_data[file]
-        if bbe.job_type.find('TS') > -1 and len(bbe.im_frequency_wn) != 1:
-            log.write("\nx  Caution! TS {} does not have 1 imaginary frequency greater than -50 wavenumbers.".format(file))
-        if bbe.job_type.find('GS') > -1 and bbe.job_type.find('TS') == -1 and len(bbe.im_frequency_wn) != 0:
-            log.write("\nx  Caution: GS {} has 1 or more imaginary frequencies greater than -50 wavenumbers.".format(file))
-
-    # Check for empirical dispersion
-    dispersion_check = [thermo_data[key].empirical_dispersion for key in thermo_data]
-    if all_same(dispersion_check):
-        if dispersion_check[0] == 'No empirical dispersion detected':
-            log.write("\n-  No empirical dispersion detected in any of the calculations.")
-        else:
-            log.write("\no  Using " + dispersion_check[0] + " in all calculations.")
-    else:
-        print_check_fails(log, dispersion_check, file_check, "dispersion models")
+    check_imaginary(log, files, thermo_data)
+    check_dispersion(log, thermo_data, file_check)
     log.write("\n" + STARS + "\n")
 
     # Check for single-point corrections
     if options.spc is not False:
         log.write("\n   Checks for single-point corrections:")
         log.write("\n" + STARS)
-        names_spc, version_check_spc = [], []
-        for file in files:
-            name, ext = os.path.splitext(file)
-            if os.path.exists(name + '_' + options.spc + '.log'):
-                names_spc.append(name + '_' + options.spc + '.log')
-            elif os.path.exists(name + '_' + options.spc + '.out'):
-                names_spc.append(name + '_' + options.spc + '.out')
-
         # Check SPC program versions
         version_check_spc = [thermo_data[key].sp_version_program for key in thermo_data]
         if all_same(version_check_spc):
@@ -2918,10 +5046,10 @@ def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model,
             print_check_fails(log, solvent_check_spc, file_check, "solvation models")
 
         # Check SPC level of theory
-        l_o_t_spc = [level_of_theory(name) for name in names_spc]
-        if all_same(l_o_t_spc):
+        l_o_t_spc = [spc_l_o_t[file] for file in files if file in (spc_l_o_t or {})]
+        if l_o_t_spc and all_same(l_o_t_spc):
             log.write("\no  Using {} in all the single-point corrections.".format(l_o_t_spc[0]))
-        else:
+        elif l_o_t_spc:
             print_check_fails(log, l_o_t_spc, file_check, "levels of theory")
 
         # Check SPC charge and multiplicity
@@ -2934,43 +5062,22 @@ def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model,
             print_check_fails(log, charge_spc_check, file_check, "charge and multiplicity", multiplicity_spc_check)
 
         # Check if the geometries of freq calculations match their corresponding structures in single-point calculations
-        geom_duplic_list, geom_duplic_list_spc, geom_duplic_cart, geom_duplic_files, geom_duplic_cart_spc, geom_duplic_files_spc = [], [], [], [], [], []
-        for file in files:
-            geom_duplic = getoutData(file)
-            geom_duplic_cart.append(geom_duplic.cartesians)
-            geom_duplic_files.append(file)
-        geom_duplic_list.append(geom_duplic_cart)
-        geom_duplic_list.append(geom_duplic_files)
-
-        for name in names_spc:
-            geom_duplic_spc = getoutData(name)
-            geom_duplic_cart_spc.append(geom_duplic_spc.cartesians)
-            geom_duplic_files_spc.append(name)
-        geom_duplic_list_spc.append(geom_duplic_cart_spc)
-        geom_duplic_list_spc.append(geom_duplic_files_spc)
-        spc_mismatching = "Caution! Potential differences found between frequency and single-point geometries -"
-        if len(geom_duplic_list[0]) == len(geom_duplic_list_spc[0]):
-            for i in range(len(files)):
-                count = 1
-                for j in range(len(geom_duplic_list[0][i])):
-                    if count == 1:
-                        if geom_duplic_list[0][i][j] == geom_duplic_list_spc[0][i][j]:
-                            count = count
-                        elif '{0:.3f}'.format(geom_duplic_list[0][i][j][0]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][0] * (-1)) or '{0:.3f}'.format(geom_duplic_list[0][i][j][0]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][0]):
-                            if '{0:.3f}'.format(geom_duplic_list[0][i][j][1]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][1] * (-1)) or '{0:.3f}'.format(geom_duplic_list[0][i][j][1]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][1] * (-1)):
-                                count = count
-                            if '{0:.3f}'.format(geom_duplic_list[0][i][j][2]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][2] * (-1)) or '{0:.3f}'.format(
-                                geom_duplic_list[0][i][j][2]) == '{0:.3f}'.format(geom_duplic_list_spc[0][i][j][2] * (-1)):
-                                count = count
-                        else:
-                            spc_mismatching += ", " + geom_duplic_list[1][i]
-                            count = count + 1
-            if spc_mismatching == "Caution! Potential differences found between frequency and single-point geometries -":
-                log.write("\no  No potential differences found between frequency and single-point geometries (based on input coordinates).")
+        freq_xyz = [thermo_data[file].xyz for file in files]
+        spc_xyz = [thermo_data[file].sp_xyz for file in files]
+        if all(xyz is not None for xyz in spc_xyz):
+            max_dev, rmsd = check_geometries(freq_xyz, spc_xyz, options.geom_tol)
+            mismatch = [i for i in range(len(files)) if not max_dev[i] < options.geom_tol]
+            if len(mismatch) == 0:
+                log.write("\no  No potential differences found between frequency and single-point geometries "
+                          "(max. deviation after alignment below {} Angstrom).".format(options.geom_tol))
             else:
-                spc_mismatching_1 = spc_mismatching[:84]
-                spc_mismatching_2 = spc_mismatching[85:]
-                log.write("\nx  " + spc_mismatching_1 + spc_mismatching_2 + '.')
+                log.write("\nx  Caution! Potential differences found between frequency and single-point geometries:")
+                for i in mismatch:
+                    if np.isinf(max_dev[i]):
+                        log.write("\n        {}: different atoms".format(files[i]))
+                    else:
+                        log.write("\n        {}: max. deviation {:.3f}, RMSD {:.3f} Angstrom".format(
+                            files[i], max_dev[i], rmsd[i]))
         else:
             log.write("\nx  One or more geometries from single-point corrections are missing.")
 
@@ -2986,13 +5093,667 @@ def check_files(log, files, thermo_data, options, STARS, l_o_t, solvation_model,
         log.write("\n" + STARS + "\n")
 
 
-def main():
-    files = []
-    bbe_vals = []
-    clusters = []
-    command = '   Requested: '
-    clustering = False
-    # Get command line inputs. Use -h to list all possible arguments and default values
+# Options that only concern the output of the command line, not available through analyze
+COMMAND_LINE_OPTIONS = ('temperature_interval', 'cosmo_int', 'mc', 'sigma', 'seed', 'cputime', 'xyz', 'xyz_sort',
+                        'xyz_min_pop', 'xyz_annotate', 'csv', 'quiet', 'jsonl', 'db', 'results', 'imag_freq', 'output',
+                        'span', 'check', 'check_only', 'geom_tol', 'custom_ext', 'graph', 'serve', 'workers')
+
+# Caches kept in memory between calls of analyze, see warm_cache
+warm_caches = {}
+
+
+def warm_cache(name, factory):
+    """Cache called name in warm_caches, created by calling factory on first use."""
+    if name not in warm_caches:
+        warm_caches[name] = factory()
+    return warm_caches[name]
+
+
+def file_signature(file):
+    """Absolute path, size and modification time of a file: a file with the same signature is not parsed again."""
+    stat = os.stat(file)
+    return [os.path.abspath(file), stat.st_size, stat.st_mtime_ns]
+
+
+def analyze(files, settings=None, **kwargs):
+    """
+    Thermochemistry of output files, for use of GoodVibes as a library.
+
+    Settings are named as the command-line options, with the same defaults (see command_line_parser), e.g.
+    analyze(files, QH=True, temperature=353.15, boltz=True). Nothing is printed or written to disk and errors raise
+    GoodVibesError. Parsed files, symmetry numbers and D3 energies are kept in memory (see warm_caches), so that
+    repeated calls in a long-lived process only evaluate what is new.
+
+    Parameters:
+    files (str or list): output file(s).
+    settings (dict): options; they may also be given as keyword arguments.
+
+    Returns:
+    analysis: the results.
+    """
+    options = command_line_parser().parse_args([])
+    settings = dict(settings or {}, **kwargs)
+    for key, value in settings.items():
+        if not hasattr(options, key):
+            raise GoodVibesError("Unknown setting '{}'".format(key))
+        if key in COMMAND_LINE_OPTIONS and value != getattr(options, key):
+            raise GoodVibesError("Setting '{}' is only available on the command line".format(key))
+        setattr(options, key, value)
+    if isinstance(files, str):
+        files = [files]
+    result = analysis(list(files), options, store=memory_store(), warm=True)
+    if options.ee is not False:
+        result.get_selectivity()
+    if options.pes is not False:
+        result.get_pes()
+    return result
+
+
+class analysis:
+    """
+    Thermochemistry of a set of output files: the evaluation shared by the command line and analyze.
+
+    Failed or incomplete calculations are omitted and the vibrational scale factor is looked up for the level of
+    theory. Mirror-image conformers are found from the files as read (enant option), then each file other than the
+    mirror images is evaluated (reusing the results of earlier runs kept in store) and duplicates and Boltzmann
+    populations are found. Selectivity and relative energies along a PES follow from
+    get_selectivity and get_pes. Messages are written to log as they would be printed; the tables are left to the
+    caller.
+
+    Attributes:
+        options (argparse.Namespace): options used, including the scale factor and concentration applied.
+        log (Logger or message_log): output of the messages.
+        files (list): files evaluated.
+        omitted (list): files omitted for error or incomplete termination.
+        levels_of_theory (list): level of theory of each file evaluated.
+        solvation_models (list): solvation model of each file evaluated.
+        orientation (dict): orientation of the coordinates of each file.
+        grid (dict): integration grid of each file.
+        spc_files (dict): single-point file of each file, if the single-point energy is taken from another file.
+        spc_levels_of_theory (dict): level of theory of the single-point file of each file.
+        cosmo_solv (dict): COSMO-RS solvation free energy of each file (cosmo), None if not read.
+        t_interval (list): temperatures of the COSMO-RS file (cosmo_int).
+        gsolv_dicts (list): COSMO-RS solvation free energies of each file at each of these temperatures (cosmo_int).
+        d3_energies (dict): D3 dispersion energy of each file, zero unless requested.
+        media_conc (float): concentration of the structure that is the solvent medium (media).
+        thermo_data (dict): calc_bbe of each file.
+        enantiomers (list): [mirror image, representative] pairs found with the enant option.
+        duplicates (list): [duplicate, original] pairs found with the duplicate or enant options.
+        boltz_facs (dict): Boltzmann factor of each file and cluster (boltz or ee), see get_boltz.
+        weighted_free_energy (dict): Boltzmann-weighted free energy of each cluster.
+        boltz_sum (float): sum of the Boltzmann factors.
+        rows (list): result_sink rows of the files that are not duplicates.
+        populations (dict): Boltzmann population of each file (boltz).
+        selectivity (dict): excess, ratio_percent, ratio, major and ddg (ee, see get_selectivity); None if it could
+                            not be obtained.
+        pes (get_pes): relative thermochemistry (pes, see get_pes).
+        messages (list): the messages, if log is a message_log.
+    """
+    def __init__(self, files, options, log=None, store=None, warm=False, clusters=None, stream=False, meter=False):
+        """
+        Parameters:
+        files (list): output files.
+        options (argparse.Namespace): options, see command_line_parser.
+        log (Logger): output of the messages; by default they are collected in messages and no cache file is written.
+        store (project_db or memory_store): parsed inputs and thermochemistry of earlier runs, if any.
+        warm (bool): keep the symmetry numbers and D3 energies in warm_caches.
+        clusters (list): files of each cluster, if clustering.
+        stream (jsonl_stream): receives each structure as it is evaluated, if any.
+        meter (bool): show a progress_meter while the files are evaluated.
+        """
+        self.log = log = log or message_log()
+        self.options, self.messages = options, getattr(log, 'messages', None)
+        self.populations, self.selectivity, self.pes = None, None, None
+        self.cosmo_solv, self.media_conc, self.t_interval, self.gsolv_dicts = None, None, None, None
+        self.boltz_facs, self.weighted_free_energy, self.boltz_sum = {}, {}, 0.0
+        # Symmetry numbers and D3 energies are only cached on disk for the command line
+        cache_path = None if isinstance(log, Logger) else False
+        if options.Q:
+            options.QH = True
+        if options.rmsd is not None:
+            options.duplicate = True
+        if not options.conc:
+            options.conc = ATMOS / (GAS_CONSTANT * options.temperature)
+        if not files:
+            raise GoodVibesError("No output files given")
+        self.spc_files = spc_files = {}
+        for file in files:
+            if not os.path.isfile(file):
+                raise GoodVibesError("Output file '{}' not found".format(file))
+            if options.spc is not False and options.spc != 'link':
+                name = os.path.splitext(file)[0] + '_' + options.spc
+                spc_files[file] = next((name + ext for ext in ('.log', '.out') if os.path.exists(name + ext)), None)
+                if spc_files[file] is None:
+                    raise GoodVibesError("\nError! SPC calculation file '{}' not found! Make sure files are named with "
+                                         "the convention: 'filename_spc' or specify link job.\nFor help, use option "
+                                         "'-h'\n".format(name))
+
+        # Initial read of files,
+        # Grab level of theory, solvation model, check for Normal Termination
+        read = store.read_initial if store else read_initial
+        initial = dict((file, read(file)) for file in files)
+        spc_initial = dict((file, read(spc_files[file])) for file in spc_files)
+        self.omitted = []
+        for file in files:
+            if initial[file][2] == 'Error':
+                log.write("\n\nx  Warning! Error termination found in file {}. This file will be omitted from further "
+                          "calculations.".format(file))
+                self.omitted.append(file)
+            elif initial[file][2] == 'Incomplete':
+                log.write("\n\nx  Warning! File {} may not have terminated normally or the calculation may still be "
+                          "running. This file will be omitted from further calculations.".format(file))
+                self.omitted.append(file)
+        # Check spc files for normal termination
+        for file in spc_files:
+            if spc_initial[file][2] == 'Error':
+                raise GoodVibesError("\n\nx  ERROR! Error termination found in file {} calculations.".format(
+                    spc_files[file]))
+            elif spc_initial[file][2] == 'Incomplete':
+                raise GoodVibesError("\n\nx  ERROR! File {} may not have terminated normally or the calculation may "
+                                     "still be running.".format(spc_files[file]))
+        self.files = files = [file for file in files if file not in self.omitted]
+        if len(files) == 0:
+            raise GoodVibesError("\n\nPlease try again with normally terminated output files.\nFor help, use option "
+                                 "'-h'\n")
+        self.levels_of_theory = l_o_t = [initial[file][0] for file in files]
+        self.solvation_models = [initial[file][1] for file in files]
+        self.orientation = dict((file, initial[file][3]) for file in files)
+        self.grid = dict((file, initial[file][4]) for file in files)
+        # The single-point energy of a link job is read from the output file itself
+        self.spc_levels_of_theory = dict((file, spc_initial[file][0] if file in spc_files else initial[file][0])
+                                         for file in files if options.spc is not False)
+
+        # Attempt to automatically obtain frequency scale factor,
+        # Application of freq scale factors requires all outputs to be same level of theory
+        if options.freq_scale_factor is not False:
+            if 'ONIOM' not in l_o_t[0]:
+                log.write("\n\n   User-defined vibrational scale factor " + str(options.freq_scale_factor) + " for " +
+                          l_o_t[0] + " level of theory")
+            else:
+                log.write("\n\n   User-defined vibrational scale factor " + str(options.freq_scale_factor) +
+                          " for QM region of " + l_o_t[0])
+        elif all_same(l_o_t):
+            # Look for vibrational scaling factor automatically
+            level = l_o_t[0].upper()
+            for data in (vib_scale_factors.scaling_data_dict, vib_scale_factors.scaling_data_dict_mod):
+                if level in data:
+                    options.freq_scale_factor = float(data[level].zpe_fac)
+                    ref = vib_scale_factors.scaling_refs[data[level].zpe_ref]
+                    log.write("\n\no  Found vibrational scaling factor of {:.3f} for {} level of theory\n"
+                              "   REF: {}".format(options.freq_scale_factor, l_o_t[0], ref))
+                    break
+        else:
+            # Print files and different levels of theory found
+            print_check_fails(log, l_o_t, files, "levels of theory")
+
+        # Exit program if a comparison of Boltzmann factors is requested and level of theory is not uniform across
+        # all files
+        if not all_same(l_o_t) and (options.boltz is not False or options.ee is not False):
+            raise GoodVibesError("\n\nERROR: When comparing files using Boltzmann factors (boltz or ee input options), "
+                                 "the level of theory used should be the same for all files.\n ")
+        # Exit program if enantiomers are both collapsed and compared: ee would count a mirror pair as one enantiomer
+        if options.enant and options.ee is not False:
+            raise GoodVibesError("\n\nERROR: Option --enant collapses mirror-image conformers into one structure and "
+                                 "cannot be combined with --ee, which compares the two enantiomers.\n ")
+        # Exit program if molecular mechanics scaling factor is given and all files are not ONIOM calculations
+        if options.mm_freq_scale_factor is not False:
+            if all_same(l_o_t) and 'ONIOM' in l_o_t[0]:
+                log.write("\n\n   User-defined vibrational scale factor " +
+                          str(options.mm_freq_scale_factor) + " for MM region of " + l_o_t[0])
+                log.write("\n   REF: {}".format(oniom_scale_ref))
+            else:
+                raise GoodVibesError("\n   Option --vmm is only for use in ONIOM calculation output files.\n   "
+                                     " help use option '-h'\n")
+
+        if options.freq_scale_factor is False:
+            options.freq_scale_factor = 1.0  # If no scaling factor is found use 1.0
+            if all_same(l_o_t):
+                log.write("\n\n   Using vibrational scale factor {} for {} level of "
+                          "theory".format(options.freq_scale_factor, l_o_t[0]))
+            else:
+                log.write("\n\n   Using vibrational scale factor {}: differing levels of theory "
+                          "detected.".format(options.freq_scale_factor))
+        # Checks to see whether the available free space of a requested solvent is defined
+        freespace = get_free_space(options.freespace)
+        if freespace != 1000.0:
+            log.write("\n   Specified solvent " + options.freespace + ": free volume " + str(
+                "%.3f" % (freespace / 10.0)) + " (mol/l) corrects the translational entropy")
+
+        # Check for implicit solvation
+        for solvation_model in self.solvation_models:
+            if 'smd' in solvation_model.lower() or 'cpcm' in solvation_model.lower():
+                log.write("\n\n   Caution! Implicit solvation (SMD/CPCM) detected. Enthalpic and entropic terms "
+                          "cannot be safely separated. Use them at your own risk!")
+                break
+
+        # COSMO-RS temperature interval
+        if options.cosmo_int:
+            args = options.cosmo_int.split(',')
+            cfile = args[0]
+            cinterval = args[1:]
+            log.write('\n\n   Reading COSMO-RS file: ' + cfile + ' over a T range of ' + cinterval[0] + '-' +
+                      cinterval[1] + ' K.')
+            self.t_interval, self.gsolv_dicts = cosmo_rs_out(cfile, files, interval=cinterval)
+            options.temperature_interval = True
+        elif options.cosmo is not False:  # Read from COSMO-RS output
+            try:
+                self.cosmo_solv = cosmo_rs_out(options.cosmo, files)
+                log.write('\n\n   Reading COSMO-RS file: ' + options.cosmo)
+            except ValueError:
+                log.write('\n\n   Warning! COSMO-RS file ' + options.cosmo + ' requested but not found')
+
+        if options.freq_cutoff != 100.0:
+            options.S_freq_cutoff = options.freq_cutoff
+            options.H_freq_cutoff = options.freq_cutoff
+
+        # Summary of the quasi-harmonic treatment; print out the relevant reference
+        log.write("\n\n   Entropic quasi-harmonic treatment: frequency cut-off value of " + str(
+            options.S_freq_cutoff) + " wavenumbers will be applied.")
+        if options.QS == "grimme":
+            log.write("\n   QS = Grimme: Using a mixture of RRHO and Free-rotor vibrational entropies.")
+            qs_ref = grimme_ref
+        elif options.QS == "truhlar":
+            log.write("\n   QS = Truhlar: Using an RRHO treatment where low frequencies are adjusted to the cut-off "
+                      "value.")
+            qs_ref = truhlar_ref
+        else:
+            log.fatal("\n   FATAL ERROR: Unknown quasi-harmonic model " + options.QS + " specified (QS must = grimme "
+                      "or truhlar).")
+        log.write("\n   REF: " + qs_ref + '\n')
+
+        # Check if qh-H correction should be applied
+        if options.QH:
+            log.write("\n\n   Enthalpy quasi-harmonic treatment: frequency cut-off value of " + str(
+                options.H_freq_cutoff) + " wavenumbers will be applied.")
+            log.write("\n   QH = Head-Gordon: Using an RRHO treatement with an approximation term for vibrational "
+                      "energy.")
+            log.write("\n   REF: " + head_gordon_ref + '\n')
+
+        # Check if D3 corrections should be applied
+        if options.D3:
+            log.write("\n\n   D3-Dispersion energy with zero-damping will be calculated and included in the energy "
+                      "and enthalpy terms.")
+            log.write("\n   REF: " + d3_ref + '\n')
+        if options.D3BJ:
+            log.write("\n\n   D3-Dispersion energy with Becke-Johnson damping will be calculated and added to the "
+                      "energy terms.")
+            log.write("\n   REF: " + d3bj_ref + '\n')
+        if options.ATM:
+            log.write("\n   The repulsive Axilrod-Teller-Muto 3-body term will be included in the dispersion "
+                      "correction.")
+            log.write("\n   REF: " + atm_ref + '\n')
+
+        # Check if entropy symmetry correction should be applied
+        if options.ssymm:
+            log.write('\n\n   Ssymm requested. Symmetry contribution to entropy to be calculated using S. '
+                      'Patchkovskii\'s \n   open source software "Brute Force Symmetry Analyzer" available under GNU '
+                      'General Public License.')
+            log.write('\n   REF: (C) 1996, 2003 S. Patchkovskii, Serguei.Patchkovskii@sympatico.ca')
+            log.write('\n\n   Atomic radii used to calculate internal symmetry based on Cambridge Structural '
+                      'Database covalent radii.')
+            log.write("\n   REF: " + csd_ref + '\n')
+
+        # Whether single-point energies are to be used
+        if options.spc:
+            log.write("\n   Combining final single point energy with thermal corrections.")
+        # Solvent correction message
+        if options.media:
+            log.write("\n   Applying standard concentration correction (based on density at 20C) to solvent media.")
+
+        # Reuse the thermochemistry of files evaluated before with the same settings
+        stored = {}
+        if store:
+            # Input files other than the output files are identified by their contents
+            settings_hash = store.settings_hash(thermo_settings(options, store.content_hash))
+            stored = store.results(files, settings_hash, spc_files)
+            if options.D3 or options.D3BJ:
+                # Records stored without their D3 term are evaluated again
+                stored = dict((file, bbe) for file, bbe in stored.items() if hasattr(bbe, 'd3_energy'))
+            if stored and options.db:
+                log.write("\n\n   Reusing the thermochemistry of {} of {} files stored in {}".format(
+                    len(stored), len(files), options.db))
+        pending = [file for file in files if file not in stored]
+
+        # Mirror-image conformers are found from the files as read, so only one of each pair is evaluated; stored
+        # results are compared as they are unless some files are new, whose energies carry no D3 term yet
+        self.enantiomers, structures = [], {}
+        if options.enant:
+            structures = stored
+            if pending:
+                structures = dict((file, initial_structure(file)) for file in files)
+            self.enantiomers = check_enantiomers(files, structures, rmsd_cutoff=options.rmsd if options.rmsd else 0.1)
+        mirror_of = dict((mirror, representative) for mirror, representative in self.enantiomers
+                         if mirror in pending)
+        pending = [file for file in pending if file not in mirror_of]
+
+        # Geometries of the files not evaluated before are parsed once, here rather than in calc_bbe
+        geometries = {}
+        if options.enant and pending:
+            geometries = dict((file, structures[file].xyz) for file in pending)
+        elif (options.ssymm or options.D3 or options.D3BJ) and pending:
+            geometries = dict((file, getoutData(file)) for file in pending)
+
+        # Symmetry numbers of the geometries not analysed before, assigned in one batch
+        ssymm = False
+        if options.ssymm and pending:
+            if warm:
+                sym_cache = warm_cache(('symmetry', cache_path), lambda: symmetry_cache(cache_path))
+            else:
+                sym_cache = symmetry_cache(cache_path)
+            ssymm = symmetry_numbers(geometries, sym_cache, options.nproc)
+            sym_cache.save()
+
+        # Computes the D3 term once per geometry if requested, which is then sent to calc bbe as a correction
+        self.d3_energies = dict((file, getattr(stored[file], 'd3_energy', 0.0) if file in stored else 0.0)
+                                for file in files)
+        if (options.D3 or options.D3BJ) and pending:
+            reference_file = options.d3_reference or d3_reference_path()
+            try:
+                if warm:
+                    reference = warm_cache(('d3_reference', reference_file), lambda: load_d3_reference(reference_file))
+                else:
+                    reference = load_d3_reference(reference_file)
+            except (IOError, OSError, KeyError, ValueError) as e:
+                raise GoodVibesError("\nx  DFT-D3 reference data could not be read from {} ({}).\n   Provide it with "
+                                     "--d3ref or GOODVIBES_D3_REFERENCE, see load_d3_reference for the format.\n"
+                                     "".format(reference_file, e))
+            if warm:
+                d3_energy_cache = warm_cache(('d3', reference_file, cache_path),
+                                             lambda: d3_cache(reference, cache_path))
+            else:
+                d3_energy_cache = d3_cache(reference, cache_path)
+            functionals = dict((file, level.split('/')[0]) for file, level in zip(files, l_o_t))
+            self.d3_energies.update(dispersion_energies(geometries, functionals, d3_energy_cache,
+                                                        'zero' if options.D3 else 'bj', options.ATM))
+            d3_energy_cache.save()
+            # A mirror image has the dispersion energy of its representative
+            for mirror, representative in mirror_of.items():
+                self.d3_energies[mirror] = self.d3_energies[representative]
+
+        # Loop over all specified output files and compute thermochemistry
+        if options.media is not False:
+            try:
+                from .media import solvents
+            except:
+                from media import solvents
+        self.thermo_data = thermo_data = {}
+        meter = progress_meter(len(files)) if meter else False
+        for file in files:
+            if file in stored:
+                bbe = stored[file]
+            elif file in mirror_of:
+                bbe = mirror_image(thermo_data[mirror_of[file]], structures[file], spc_files.get(file))
+            else:
+                conc = options.conc
+                # Check if media correction should be applied
+                if options.media is not False and options.media.lower() in solvents and options.media.lower() == \
+                        os.path.splitext(os.path.basename(file))[0].lower():
+                    mweight = solvents[options.media.lower()][0]
+                    density = solvents[options.media.lower()][1]
+                    conc = self.media_conc = (density * 1000) / mweight
+                bbe = calc_bbe(file, options.QS, options.QH, options.S_freq_cutoff, options.H_freq_cutoff,
+                               options.temperature, conc, options.freq_scale_factor, options.freespace, options.spc,
+                               options.invert, self.d3_energies[file],
+                               cosmo=self.cosmo_solv[file] if self.cosmo_solv else None, ssymm=ssymm and ssymm[file],
+                               mm_freq_scale_factor=options.mm_freq_scale_factor, inertia=options.inertia,
+                               xyz=geometries.get(file))
+                if store:
+                    store.put(file, settings_hash, bbe, spc_files.get(file))
+            thermo_data[file] = bbe
+            if stream:
+                stream.structure(file, bbe, options.temperature, spc=options.spc is not False, qh=options.QH)
+            if meter:
+                meter.update(file)
+        if meter:
+            meter.finish()
+        if store:
+            store.commit()
+
+        # Check if user has chosen to make any low lying imaginary frequencies positive
+        if options.invert is not False:
+            for file in files:
+                inverted_freqs = thermo_data[file].inverted_freqs
+                if len(inverted_freqs) == 1:
+                    log.write("\n\n   The following frequency was made positive and used in calculations: " +
+                              str(inverted_freqs[0]) + " from " + file)
+                elif len(inverted_freqs) > 1:
+                    log.write("\n\n   The following frequencies were made positive and used in calculations: " +
+                              str(inverted_freqs) + " from " + file)
+
+        # Collapse mirror-image conformers into one degenerate structure, then look for duplicates
+        set_degeneracy(thermo_data, self.enantiomers)
+        self.duplicates = (check_dup(files, thermo_data, rmsd_cutoff=options.rmsd) if options.duplicate else []) + \
+            self.enantiomers
+        duplicate_of = dict((dup[0], dup[1]) for dup in reversed(self.duplicates))
+
+        # Boltzmann factors and averaging over clusters
+        if options.boltz is not False or options.ee is not False:
+            self.boltz_facs, self.weighted_free_energy, self.boltz_sum = get_boltz(
+                files, thermo_data, bool(clusters), clusters or [], options.temperature, self.duplicates)
+        if options.boltz is not False:
+            self.populations = dict((file, self.boltz_facs[file] / self.boltz_sum) for file in files
+                                    if file in self.boltz_facs)
+        self.rows = [result_sink.row(file, thermo_data[file], options.temperature, spc=options.spc is not False,
+                                     qh=options.QH, boltz=self.populations.get(file) if self.populations else None)
+                     for file in files if file not in duplicate_of]
+
+    def get_selectivity(self):
+        """
+        Selectivity between the two groups of files given by options.ee, see get_selectivity.
+
+        Returns:
+        dict: excess, ratio_percent, ratio, major and ddg, None if no files matched either group.
+        """
+        ee, er, ratio, dd_free_energy, failed, preference = get_selectivity(
+            self.options.ee, self.files, self.boltz_facs, self.boltz_sum, self.options.temperature, self.log,
+            self.duplicates)
+        self.selectivity = None if failed else dict(excess=ee, ratio_percent=er, ratio=ratio, major=preference,
+                                                    ddg=dd_free_energy)
+        return self.selectivity
+
+    def check_pes(self):
+        """Raise GoodVibesError unless the PES file exists and every file has the thermochemistry it needs."""
+        if not os.path.isfile(self.options.pes):
+            raise GoodVibesError("\nWarning! PES file {} not found\n".format(self.options.pes))
+        for file in self.files:
+            if not hasattr(self.thermo_data[file], "qh_gibbs_free_energy") or (
+                    self.options.spc is not False and not hasattr(self.thermo_data[file], "sp_energy")):
+                raise GoodVibesError("\nWarning! Could not find thermodynamic data for " + file + "\n")
+
+    def get_pes(self):
+        """
+        Relative thermochemistry along the reaction paths of options.pes, see get_pes.
+
+        Returns:
+        get_pes: the relative values.
+        """
+        self.check_pes()
+        self.pes = get_pes(self.options.pes, self.thermo_data, self.log, self.options.temperature, self.options.gconf,
+                           self.options.QH, cosmo=True if self.options.cosmo else None)
+        return self.pes
+
+    def as_dict(self):
+        """The results as plain dicts and lists, e.g. for JSON; pes holds the get_pes lists (Hartree)."""
+        pes = None
+        if self.pes is not None:
+            pes = dict((name, getattr(self.pes, name)) for name in
+                       ('path', 'species', 'units', 'spc_abs', 'e_abs', 'zpe_abs', 'h_abs', 'qh_abs', 's_abs', 'qs_abs',
+                        'g_abs', 'qhg_abs', 'cosmo_qhg_abs', 'spc_zero', 'e_zero', 'zpe_zero', 'h_zero', 'qh_zero',
+                        'ts_zero', 'qhts_zero', 'g_zero', 'qhg_zero', 'cosmo_qhg_zero') if hasattr(self.pes, name))
+        return dict(options=vars(self.options), files=self.files, omitted=self.omitted, rows=self.rows,
+                    duplicates=self.duplicates, populations=self.populations, selectivity=self.selectivity, pes=pes,
+                    messages=self.messages)
+
+
+def default_socket():
+    """
+    Unix socket of the GoodVibes service (see serve).
+
+    Returns:
+    str: GOODVIBES_SOCKET if set, otherwise goodvibes.sock in cache_dir().
+    """
+    return os.environ.get('GOODVIBES_SOCKET') or os.path.join(cache_dir(), 'goodvibes.sock')
+
+
+def service_worker_init():
+    """Loads the scale factor tables, NumPy and the symmetry library once in each worker process of the service."""
+    vib_scale_factors.scaling_data_dict
+    np.zeros(1)
+    try:
+        symmetry_library()
+    except OSError:
+        pass
+
+
+def run_captured(argv):
+    """
+    Runs the command line with the arguments argv and captures what it prints.
+
+    Files evaluated by earlier requests of the same worker are not parsed again (see memory_store).
+
+    Returns:
+    dict: stdout and stderr text and the exit status.
+    """
+    stdout, stderr, status = io.StringIO(), io.StringIO(), 0
+    sys.argv = ['goodvibes'] + list(argv)
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            main(warm=True)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                status = e.code or 0
+            else:
+                stderr.write(str(e.code) + '\n')
+                status = 1
+    return dict(stdout=stdout.getvalue(), stderr=stderr.getvalue(), status=status)
+
+
+def service_request(request):
+    """
+    Carries out one request of the service in a worker process.
+
+    {"argv": [...], "cwd": ...} runs the command line with these arguments in cwd and returns its output and exit status,
+    as sent by goodvibes.client. {"files": [...], "settings": {...}, "cwd": ...} returns analyze(files, settings) as
+    given by analysis.as_dict.
+
+    Parameters:
+    request (dict): the request.
+
+    Returns:
+    str: JSON response, with "ok" false and an "error" message if the request failed.
+    """
+    try:
+        if request.get('cwd'):
+            os.chdir(request['cwd'])
+        if 'argv' in request:
+            if '--serve' in request['argv']:
+                raise GoodVibesError("The service cannot start another service")
+            response = run_captured(request['argv'])
+        elif 'files' in request:
+            response = analyze(request['files'], request.get('settings')).as_dict()
+        else:
+            raise GoodVibesError("Requests need either 'argv' or 'files'")
+        response['ok'] = True
+    except GoodVibesError as e:
+        response = {'ok': False, 'error': str(e).strip()}
+    except Exception as e:
+        # A failed request must not take the worker down
+        response = {'ok': False, 'error': '{}: {}'.format(type(e).__name__, e)}
+    return json.dumps(response, default=lambda value: value.tolist() if hasattr(value, 'tolist') else str(value))
+
+
+def serve(path=None, workers=None):
+    """
+    Runs the GoodVibes service: a local daemon answering requests on a Unix socket until it is stopped.
+
+    Each request and its response are single lines of JSON (see service_request); {"shutdown": true} stops the
+    service. Requests are processed concurrently by a pool of worker processes that live as long as the service, so
+    their parsed files, symmetry library, scale factor tables and other caches (see warm_caches) stay warm.
+
+    Parameters:
+    path (str): socket, default_socket() if None.
+    workers (int): worker processes, one per CPU if None.
+    """
+    path = path or default_socket()
+    workers = workers or os.cpu_count() or 1
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(path)
+        else:
+            raise GoodVibesError("A GoodVibes service is already listening on " + path)
+        finally:
+            probe.close()
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    asyncio.run(run_service(path, workers))
+
+
+async def run_service(path, workers):
+    """Event loop of serve: accepts connections and hands their requests to the worker pool."""
+    from concurrent.futures import ProcessPoolExecutor
+    loop = asyncio.get_running_loop()
+    stop, connections = asyncio.Event(), set()
+
+    async def handle(reader, writer):
+        connections.add(writer)
+        try:
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("not a JSON object")
+                except ValueError as e:
+                    response = json.dumps({'ok': False, 'error': 'Invalid request: {}'.format(e)})
+                else:
+                    if request.get('shutdown'):
+                        stop.set()
+                        response = json.dumps({'ok': True})
+                    else:
+                        response = await loop.run_in_executor(pool, service_request, request)
+                writer.write(response.encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            connections.discard(writer)
+            writer.close()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=service_worker_init) as pool:
+        # The socket is created accessible to the user only; large file lists arrive as one line
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(handle, path=path, limit=2 ** 26)
+        finally:
+            os.umask(umask)
+        if threading.current_thread() is threading.main_thread():
+            import signal
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, stop.set)
+        print("   GoodVibes service listening on {} with {} worker processes".format(path, workers), flush=True)
+        try:
+            async with server:
+                await stop.wait()
+                # Idle clients are disconnected
+                for writer in list(connections):
+                    writer.close()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def command_line_parser():
+    """
+    Command-line options of GoodVibes. Use -h to list all possible arguments and default values.
+
+    Returns:
+    argparse.ArgumentParser: the parser; its defaults are also the defaults of analyze.
+    """
     parser = ArgumentParser()
     parser.add_argument("-q", dest="Q", action="store_true", default=False,
                         help="Quasi-harmonic entropy correction and enthalpy correction applied (default S=Grimme, "
@@ -3023,6 +5784,14 @@ def main():
                         help="Indicates single point corrections (default False)")
     parser.add_argument("--boltz", dest="boltz", action="store_true", default=False,
                         help="Show Boltzmann factors")
+    parser.add_argument("--mc", dest="mc", default=False, type=int, metavar="SAMPLES",
+                        help="Number of Monte-Carlo samples used to estimate 95%% confidence intervals of Boltzmann "
+                             "populations and selectivities")
+    parser.add_argument("--sigma", dest="sigma", default="1.0", type=str, metavar="SIGMA",
+                        help="Free energy uncertainty (kcal/mol) used with --mc, or a file of 'name = sigma' lines "
+                             "keyed by structure name or level of theory (default 1.0)")
+    parser.add_argument("--seed", dest="seed", default=None, type=int, metavar="SEED",
+                        help="Random seed for Monte-Carlo sampling")
     parser.add_argument("--cpu", dest="cputime", action="store_true", default=False,
                         help="Total CPU time")
     parser.add_argument("--d3", dest="D3", action="store_true", default=False,
@@ -3031,10 +5800,36 @@ def main():
                         help="Becke-Johnson damped DFTD3 correction will be computed")
     parser.add_argument("--atm", dest="ATM", action="store_true", default=False,
                         help="Axilrod-Teller-Muto 3-body dispersion correction will be computed")
+    parser.add_argument("--d3ref", dest="d3_reference", default=None, metavar="D3REF",
+                        help="DFT-D3 reference data (.npz) used by --d3/--d3bj (default GOODVIBES_D3_REFERENCE, "
+                             "d3_reference.npz in the GoodVibes cache directory or the data distributed with GoodVibes)")
     parser.add_argument("--xyz", dest="xyz", action="store_true", default=False,
                         help="Write Cartesians to a .xyz file (default False)")
+    parser.add_argument("--xyz_sort", dest="xyz_sort", action="store_true", default=False,
+                        help="Order the .xyz frames by increasing qh-G(T) (default False)")
+    parser.add_argument("--xyz_min_pop", dest="xyz_min_pop", default=None, type=float, metavar="XYZ_MIN_POP",
+                        help="Only write structures to the .xyz file whose Boltzmann population is at least this "
+                             "fraction, e.g. 0.01 (default None)")
+    parser.add_argument("--xyz_annotate", dest="xyz_annotate", action="store_true", default=False,
+                        help="Add qh-G(T) and the Boltzmann population to the .xyz comment lines (default False)")
     parser.add_argument("--csv", dest="csv", action="store_true", default=False,
-                        help="Write .csv output file format")
+                        help="Write results to a .csv file as well (same as --results Goodvibes_<output>.csv)")
+    parser.add_argument("--quiet", dest="quiet", action="store_true", default=False,
+                        help="Only show a progress line in the terminal; results are still written to the output "
+                             "files")
+    parser.add_argument("--jsonl", dest="jsonl", default=False, metavar="JSONL",
+                        help="Stream results to a JSON Lines file as each structure is evaluated, followed by "
+                             "Boltzmann, selectivity and PES summaries")
+    parser.add_argument("--db", dest="db", default=False, metavar="DB",
+                        help="SQLite project database: stores parsed inputs and thermochemistry, and reuses them for "
+                             "files and settings seen before")
+    parser.add_argument("--serve", dest="serve", nargs='?', const=True, default=False, metavar="SOCKET",
+                        help="Run as a local service answering requests (e.g. from python -m goodvibes.client) on a "
+                             "Unix socket, default GOODVIBES_SOCKET or ~/.goodvibes/goodvibes.sock")
+    parser.add_argument("--workers", dest="workers", default=None, type=int, metavar="WORKERS",
+                        help="Worker processes of the --serve service (default one per CPU)")
+    parser.add_argument("--results", dest="results", default=False, metavar="RESULTS",
+                        help="Write one row of results per structure (and temperature) to a .csv, .jsonl or .npz file")
     parser.add_argument("--imag", dest="imag_freq", action="store_true", default=False,
                         help="Print imaginary frequencies (default False)")
     parser.add_argument("--invertifreq", dest="invert", nargs='?', const=True, default=False,
@@ -3043,6 +5838,13 @@ def main():
                         help="Solvent (H2O, toluene, DMF, AcOH, chloroform) (default none)")
     parser.add_argument("--dup", dest="duplicate", action="store_true", default=False,
                         help="Remove possible duplicates from thermochemical analysis")
+    parser.add_argument("--rmsd", dest="rmsd", default=None, type=float, metavar="RMSD",
+                        help="Identify duplicates by heavy-atom RMSD (Angstrom) after alignment instead of by "
+                             "frequencies (implies --dup)")
+    parser.add_argument("--enant", dest="enant", action="store_true", default=False,
+                        help="Collapse mirror-image conformers into a single structure with a degeneracy of 2 "
+                             "(matched by heavy-atom RMSD, tolerance from --rmsd or 0.1 Angstrom); only one of each "
+                             "pair is evaluated. Cannot be combined with --ee")
     parser.add_argument("--cosmo", dest="cosmo", default=False, metavar="COSMO-RS",
                         help="Filename of a COSMO-RS .tab output file")
     parser.add_argument("--cosmo_int", dest="cosmo_int", default=False, metavar="COSMO-RS",
@@ -3052,6 +5854,9 @@ def main():
                         help="Change the default name of the output file to GoodVibes_\"output\".dat")
     parser.add_argument("--pes", dest="pes", default=False, metavar="PES",
                         help="Tabulate relative values")
+    parser.add_argument("--span", dest="span", nargs='?', const=True, default=False, metavar="TI",
+                        help="Energetic span analysis (TOF-determining states, degree of TOF control) of the PES "
+                             "pathways, optionally over a temperature grid: initial temp, final temp, step size (K)")
     parser.add_argument("--nogconf", dest="gconf", action="store_false", default=True,
                         help="Calculate a free-energy correction related to multi-configurational space (default "
                              "calculate Gconf)")
@@ -3061,6 +5866,13 @@ def main():
     parser.add_argument("--check", dest="check", action="store_true", default=False,
                         help="Checks if calculations were done with the same program, level of theory and solvent, "
                              "as well as detects potential duplicates")
+    parser.add_argument("--check-only", "--check_only", dest="check_only", action="store_true", default=False,
+                        help="Only validate the output files (termination, program, level of theory, solvation, "
+                             "charge/multiplicity, imaginary frequencies) from their heads and tails, without "
+                             "computing thermochemistry; also writes a JSON report")
+    parser.add_argument("--geom_tol", dest="geom_tol", default=0.01, type=float, metavar="GEOM_TOL",
+                        help="Largest atomic deviation (Angstrom) between aligned frequency and single-point "
+                             "geometries accepted by --check (default 0.01)")
     parser.add_argument("--media", dest="media", default=False, metavar="MEDIA",
                         help="Entropy correction for standard concentration of solvents")
     parser.add_argument("--custom_ext", type=str, default='',
@@ -3071,13 +5883,40 @@ def main():
                         help="Graph a reaction profile based on free energies calculated. ")
     parser.add_argument("--ssymm", dest='ssymm', action="store_true", default=False,
                         help="Turn on the symmetry correction.")
+    parser.add_argument("--nproc", dest="nproc", default=1, type=int, metavar="NPROC",
+                        help="Number of processes used to assign point groups for --ssymm (default 1)")
     parser.add_argument("--bav", dest='inertia', default="global",type=str,choices=['global','conf'],
                         help="Choice of how the moment of inertia is computed. Options = 'global' or 'conf'."
                             "'global' will use the same moment of inertia for all input molecules of 10*10-44,"
                             "'conf' will compute moment of inertia from parsed rotational constants from each Gaussian output file.")
+    return parser
 
-    # Parse Arguments
+
+def main(warm=False):
+    try:
+        run_command_line(warm)
+    except GoodVibesError as e:
+        sys.exit(str(e))
+
+
+def run_command_line(warm=False):
+    """
+    GoodVibes command line, see command_line_parser.
+
+    Parameters:
+    warm (bool): keep parsed files, thermochemistry, symmetry numbers and D3 energies in warm_caches, as in the
+                 service (see run_captured).
+    """
+    files = []
+    clusters = []
+    command = '   Requested: '
+    clustering = False
+    # Get command line inputs. Use -h to list all possible arguments and default values
+    parser = command_line_parser()
     (options, args) = parser.parse_known_args()
+    if options.serve:
+        serve(None if options.serve is True else options.serve, options.workers)
+        return
     # If requested, turn on head-gordon enthalpy correction
     if options.Q: options.QH = True
     if options.QH:
@@ -3099,9 +5938,30 @@ def main():
         options.invert = -1 * options.invert
 
     # Start a log for the results
-    log = Logger("Goodvibes", options.output, options.csv)
+    log = Logger("Goodvibes", options.output, quiet=options.quiet)
+    # Collect machine-readable results if requested
+    if options.csv and not options.results:
+        options.results = 'Goodvibes_{}.csv'.format(options.output)
+    results = False
+    if options.results:
+        try:
+            results = result_sink(options.results)
+        except ValueError as e:
+            log.fatal("\n   FATAL ERROR: " + str(e))
+    stream = jsonl_stream(options.jsonl) if options.jsonl else False
+    db = project_db(options.db) if options.db else False
     # Initialize the total CPU time
     total_cpu_time, add_days = datetime(100, 1, 1, 00, 00, 00, 00), 0
+    # Monte-Carlo uncertainties are reported for Boltzmann populations
+    if options.rmsd is not None:
+        options.duplicate = True
+    if options.mc:
+        if options.ee is False:
+            options.boltz = True
+        try:
+            sigma_text = "sigma = {} kcal/mol".format(float(options.sigma))
+        except ValueError:
+            sigma_text = "sigma from " + options.sigma
     if len(args) > 1:
         for elem in args:
             if elem == 'clust:':
@@ -3160,266 +6020,23 @@ def main():
         options.conc = ATMOS / (GAS_CONSTANT * options.temperature)
         log.write("   Pressure = 1 atm")
     log.write('\n   All energetic values below shown in Hartree unless otherwise specified.')
-    # Initial read of files, 
-    # Grab level of theory, solvation model, check for Normal Termination
-    l_o_t, s_m, progress, spc_progress, orientation, grid = [], [], {}, {}, {}, {}
-    for file in files:
-        lot_sm_prog = read_initial(file)
-        l_o_t.append(lot_sm_prog[0])
-        s_m.append(lot_sm_prog[1])
-        progress[file] = lot_sm_prog[2]
-        orientation[file] = lot_sm_prog[3]
-        grid[file] = lot_sm_prog[4]
-        #check spc files for normal termination
-        if options.spc is not False and options.spc != 'link':
-            name, ext = os.path.splitext(file)
-            if os.path.exists(name + '_' + options.spc + '.log'): 
-                spc_file = name + '_' + options.spc + '.log'
-            elif os.path.exists(name + '_' + options.spc + '.out'):
-                spc_file = name + '_' + options.spc + '.out'
-            lot_sm_prog = read_initial(spc_file)
-            spc_progress[spc_file] = lot_sm_prog[2]
-    
-    remove_key = []
-    # Remove problem files and print errors
-    for i, key in enumerate(files):
-        if progress[key] == 'Error':
-            log.write("\n\nx  Warning! Error termination found in file {}. This file will be omitted from further "
-                      "calculations.".format(key))
-            remove_key.append([i, key])
-        elif progress[key] == 'Incomplete':
-            log.write("\n\nx  Warning! File {} may not have terminated normally or the calculation may still be "
-                      "running. This file will be omitted from further calculations.".format(key))
-            remove_key.append([i, key])
-    #check spc files for normal termination
-    if spc_progress:
-        for key in spc_progress:
-            if spc_progress[key] == 'Error':
-                sys.exit("\n\nx  ERROR! Error termination found in file {} calculations.".format(key))
-            elif spc_progress[key] == 'Incomplete':
-                sys.exit("\n\nx  ERROR! File {} may not have terminated normally or the "
-                    "calculation may still be running.".format(key))
-                          
-    for [i, key] in list(reversed(remove_key)):
-        files.remove(key)
-        del l_o_t[i]
-        del s_m[i]
-        del orientation[key]
-        del grid[key]
-    if len(files) == 0:
-        sys.exit("\n\nPlease try again with normally terminated output files.\nFor help, use option '-h'\n")
-    # Attempt to automatically obtain frequency scale factor,
-    # Application of freq scale factors requires all outputs to be same level of theory 
-    if options.freq_scale_factor is not False:
-        if 'ONIOM' not in l_o_t[0]:
-            log.write("\n\n   User-defined vibrational scale factor " + str(options.freq_scale_factor) + " for " +
-                      l_o_t[0] + " level of theory")
-        else:
-            log.write("\n\n   User-defined vibrational scale factor " + str(options.freq_scale_factor) +
-                      " for QM region of " + l_o_t[0])
-    else:
-        # Look for vibrational scaling factor automatically
-        if all_same(l_o_t):
-            level = l_o_t[0].upper()
-            for data in (scaling_data_dict, scaling_data_dict_mod):
-                if level in data:
-                    options.freq_scale_factor = data[level].zpe_fac
-                    ref = scaling_refs[data[level].zpe_ref]
-                    log.write("\n\no  Found vibrational scaling factor of {:.3f} for {} level of theory\n"
-                              "   REF: {}".format(options.freq_scale_factor, l_o_t[0], ref))
-                    break
-        else:  # Print files and different levels of theory found
-            files_l_o_t, levels_l_o_t, filtered_calcs_l_o_t = [], [], []
-            for file in files:
-                files_l_o_t.append(file)
-            for i in l_o_t:
-                levels_l_o_t.append(i)
-            filtered_calcs_l_o_t.append(files_l_o_t)
-            filtered_calcs_l_o_t.append(levels_l_o_t)
-            print_check_fails(log, filtered_calcs_l_o_t[1], filtered_calcs_l_o_t[0], "levels of theory")
-
-    # Exit program if a comparison of Boltzmann factors is requested and level of theory is not uniform across all files
-    if not all_same(l_o_t) and (options.boltz is not False or options.ee is not False):
-        sys.exit("\n\nERROR: When comparing files using Boltzmann factors (boltz or ee input options), the level of "
-                 "theory used should be the same for all files.\n ")
-    # Exit program if molecular mechanics scaling factor is given and all files are not ONIOM calculations
-    if options.mm_freq_scale_factor is not False:
-        if all_same(l_o_t) and 'ONIOM' in l_o_t[0]:
-            log.write("\n\n   User-defined vibrational scale factor " +
-                      str(options.mm_freq_scale_factor) + " for MM region of " + l_o_t[0])
-            log.write("\n   REF: {}".format(oniom_scale_ref))
-        else:
-            sys.exit("\n   Option --vmm is only for use in ONIOM calculation output files.\n   "
-                     " help use option '-h'\n")
-
-    if options.freq_scale_factor is False:
-        options.freq_scale_factor = 1.0  # If no scaling factor is found use 1.0
-        if all_same(l_o_t):
-            log.write("\n\n   Using vibrational scale factor {} for {} level of "
-                      "theory".format(options.freq_scale_factor, l_o_t[0]))
-        else:
-            log.write("\n\n   Using vibrational scale factor {}: differing levels of theory "
-                      "detected.".format(options.freq_scale_factor))
-    # Checks to see whether the available free space of a requested solvent is defined
-    freespace = get_free_space(options.freespace)
-    if freespace != 1000.0:
-        log.write("\n   Specified solvent " + options.freespace + ": free volume " + str(
-            "%.3f" % (freespace / 10.0)) + " (mol/l) corrects the translational entropy")
-
-    # Check for implicit solvation
-    printed_solv_warn = False
-    for i in s_m:
-        if ('smd' in i.lower() or 'cpcm' in i.lower()) and not printed_solv_warn:
-            log.write("\n\n   Caution! Implicit solvation (SMD/CPCM) detected. Enthalpic and entropic terms cannot be "
-                      "safely separated. Use them at your own risk!")
-            printed_solv_warn = True
-
-    # COSMO-RS temperature interval
-    if options.cosmo_int:
-        args = options.cosmo_int.split(',')
-        cfile = args[0]
-        cinterval = args[1:]
-        log.write('\n\n   Reading COSMO-RS file: ' + cfile + ' over a T range of ' + cinterval[0] + '-' +
-                  cinterval[1] + ' K.')
-
-        t_interval, gsolv_dicts = cosmo_rs_out(cfile, files, interval=cinterval)
-        options.temperature_interval = True
-
-    elif options.cosmo is not False:  # Read from COSMO-RS output
-        try:
-            cosmo_solv = cosmo_rs_out(options.cosmo, files)
-            log.write('\n\n   Reading COSMO-RS file: ' + options.cosmo)
-        except ValueError:
-            cosmo_solv = None
-            log.write('\n\n   Warning! COSMO-RS file ' + options.cosmo + ' requested but not found')
-
-    if options.freq_cutoff != 100.0:
-        options.S_freq_cutoff = options.freq_cutoff
-        options.H_freq_cutoff = options.freq_cutoff
-
-    # Summary of the quasi-harmonic treatment; print out the relevant reference
-    log.write("\n\n   Entropic quasi-harmonic treatment: frequency cut-off value of " + str(
-        options.S_freq_cutoff) + " wavenumbers will be applied.")
-    if options.QS == "grimme":
-        log.write("\n   QS = Grimme: Using a mixture of RRHO and Free-rotor vibrational entropies.")
-        qs_ref = grimme_ref
-    elif options.QS == "truhlar":
-        log.write("\n   QS = Truhlar: Using an RRHO treatment where low frequencies are adjusted to the cut-off value.")
-        qs_ref = truhlar_ref
-    else:
-        log.fatal("\n   FATAL ERROR: Unknown quasi-harmonic model " + options.QS + " specified (QS must = grimme or truhlar).")
-    log.write("\n   REF: " + qs_ref + '\n')
-
-    # Check if qh-H correction should be applied
-    if options.QH:
-        log.write("\n\n   Enthalpy quasi-harmonic treatment: frequency cut-off value of " + str(
-            options.H_freq_cutoff) + " wavenumbers will be applied.")
-        log.write("\n   QH = Head-Gordon: Using an RRHO treatement with an approximation term for vibrational energy.")
-        qh_ref = head_gordon_ref
-        log.write("\n   REF: " + qh_ref + '\n')
-
-    # Check if D3 corrections should be applied
-    if options.D3:
-        log.write("\n\n   D3-Dispersion energy with zero-damping will be calculated and included in the energy and enthalpy terms.")
-        log.write("\n   REF: " + d3_ref + '\n')
-    if options.D3BJ:
-        log.write("\n\n   D3-Dispersion energy with Becke-Johnson damping will be calculated and added to the energy terms.")
-        log.write("\n   REF: " + d3bj_ref + '\n')
-    if options.ATM:
-        log.write("\n   The repulsive Axilrod-Teller-Muto 3-body term will be included in the dispersion correction.")
-        log.write("\n   REF: " + atm_ref + '\n')
-
-    # Check if entropy symmetry correction should be applied
-    if options.ssymm:
-        log.write('\n\n   Ssymm requested. Symmetry contribution to entropy to be calculated using S. Patchkovskii\'s \n   open source software "Brute Force Symmetry Analyzer" available under GNU General Public License.')
-        log.write('\n   REF: (C) 1996, 2003 S. Patchkovskii, Serguei.Patchkovskii@sympatico.ca')
-        log.write('\n\n   Atomic radii used to calculate internal symmetry based on Cambridge Structural Database covalent radii.')
-        log.write("\n   REF: " + csd_ref + '\n')
-
-    # Whether single-point energies are to be used
-    if options.spc:
-        log.write("\n   Combining final single point energy with thermal corrections.")
-    # Solvent correction message
-    if options.media:
-        log.write("\n   Applying standard concentration correction (based on density at 20C) to solvent media.")
-
-    # Check for special options 
-    inverted_freqs, inverted_files = [], []
-    if options.ssymm:
-        ssymm_option = options.ssymm
-    else:
-        ssymm_option = False
-    if options.mm_freq_scale_factor is not False:
-        vmm_option = options.mm_freq_scale_factor
-    else:
-        vmm_option = False
-
-    # Loop over all specified output files and compute thermochemistry
-    for file in files:
-        if options.cosmo:
-            cosmo_option = cosmo_solv[file]
-        else:
-            cosmo_option = None
-
-        # computes D3 term if requested, which is then sent to calc bbe as a correction
-        d3_energy = 0.0
-        if options.D3 or options.D3BJ:
-            verbose, intermolecular, pairwise, abc_term = False, False, False, False
-            s6, rs6, s8, bj_a1, bj_a2 = 0.0, 0.0, 0.0, 0.0, 0.0
-            functional = level_of_theory(file).split('/')[0]
-            if options.D3:
-                damp = 'zero'
-            elif options.D3BJ:
-                damp = 'bj'
-            if options.ATM: abc_term = True
-            try:
-                fileData = getoutData(file)
-                d3_calc = D3.calcD3(fileData, functional, s6, rs6, s8, bj_a1, bj_a2, damp, abc_term, intermolecular,
-                                    pairwise, verbose)
-                d3_energy = (d3_calc.attractive_r6_vdw + d3_calc.attractive_r8_vdw + d3_calc.repulsive_abc) / KCAL_TO_AU
-            except:
-                log.write('\n   ! Dispersion Correction Failed')
-                d3_energy = 0.0
-        conc = options.conc
-        #check if media correction should be applied
-        if options.media != False:
-            try:
-                from .media import solvents
-            except:
-                from media import solvents
-            if options.media.lower() in solvents and options.media.lower() == \
-                    os.path.splitext(os.path.basename(file))[0].lower():
-                mweight = solvents[options.media.lower()][0]
-                density = solvents[options.media.lower()][1]
-                conc = (density * 1000) / mweight
-                media_conc = conc
-        bbe = calc_bbe(file, options.QS, options.QH, options.S_freq_cutoff, options.H_freq_cutoff, options.temperature,
-                       conc, options.freq_scale_factor, options.freespace, options.spc, options.invert,
-                       d3_energy, cosmo=cosmo_option, ssymm=ssymm_option, mm_freq_scale_factor=vmm_option, inertia=options.inertia)
-
-        # Populate bbe_vals with indivual bbe entries for each file
-        bbe_vals.append(bbe)
-
-    # Creates a new dictionary object thermo_data, which attaches the bbe data to each file-name
+    # Validation only: no thermochemistry
+    if options.check_only:
+        check_only(log, files, options, '   ' + '*' * 128)
+        log.finalize()
+        if options.xyz: xyz.finalize()
+        return
+    # Evaluate the files; the rest of the command line only prints the results
+    result = analysis(files, options, log, store=db or (memory_store() if warm else None), warm=warm,
+                      clusters=clusters if clustering else None, stream=stream, meter=options.quiet)
+    files, thermo_data, l_o_t, dup_list = result.files, result.thermo_data, result.levels_of_theory, result.duplicates
     file_list = [file for file in files]
-    thermo_data = dict(zip(file_list, bbe_vals))  # The collected thermochemical data for all files
     interval_bbe_data, interval_thermo_data = [], []
-
-    inverted_freqs, inverted_files = [], []
-    for file in files:
-        if len(thermo_data[file].inverted_freqs) > 0:
-            inverted_freqs.append(thermo_data[file].inverted_freqs)
-            inverted_files.append(file)
-
-    # Check if user has chosen to make any low lying imaginary frequencies positive
-    if options.invert is not False:
-        for i, file in enumerate(inverted_files):
-            if len(inverted_freqs[i]) == 1:
-                log.write("\n\n   The following frequency was made positive and used in calculations: " +
-                          str(inverted_freqs[i][0]) + " from " + file)
-            elif len(inverted_freqs[i]) > 1:
-                log.write("\n\n   The following frequencies were made positive and used in calculations: " +
-                          str(inverted_freqs[i]) + " from " + file)
+    if options.media is not False:
+        try:
+            from .media import solvents
+        except:
+            from media import solvents
 
     # Adjust printing according to options requested
     if options.spc is not False: stars += '*' * 14
@@ -3434,54 +6051,56 @@ def main():
             log.write("\n\n   ")
             if options.QH:
                 log.write('{:<39} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
-                          '{:>13}'.format("Structure", "E", "ZPE", "H", "qh-H", "T.S", "T.qh-S", "G(T)", "qh-G(T)"),
-                          thermodata=True)
+                          '{:>13}'.format("Structure", "E", "ZPE", "H", "qh-H", "T.S", "T.qh-S", "G(T)", "qh-G(T)"))
             else:
                 log.write('{:<39} {:>13} {:>10} {:>13} {:>10} {:>10} {:>13} {:>13}'.format("Structure", "E", "ZPE", "H",
                                                                                            "T.S", "T.qh-S", "G(T)",
-                                                                                           "qh-G(T)"), thermodata=True)
+                                                                                           "qh-G(T)"))
         else:
             log.write("\n\n   ")
             if options.QH:
                 log.write('{:<39} {:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
                           '{:>13}'.format("Structure", "E_SPC", "E", "ZPE", "H_SPC", "qh-H_SPC", "T.S", "T.qh-S",
-                                          "G(T)_SPC", "qh-G(T)_SPC"), thermodata=True)
+                                          "G(T)_SPC", "qh-G(T)_SPC"))
             else:
                 log.write('{:<39} {:>13} {:>13} {:>10} {:>13} {:>10} {:>10} {:>13} '
                           '{:>13}'.format("Structure", "E_SPC", "E", "ZPE", "H_SPC", "T.S", "T.qh-S", "G(T)_SPC",
-                                          "qh-G(T)_SPC"), thermodata=True)
+                                          "qh-G(T)_SPC"))
         if options.cosmo is not False:
-            log.write('{:>13} {:>16}'.format("COSMO-RS", "COSMO-qh-G(T)"), thermodata=True)
+            log.write('{:>13} {:>16}'.format("COSMO-RS", "COSMO-qh-G(T)"))
         if options.boltz is True:
-            log.write('{:>7}'.format("Boltz"), thermodata=True)
+            log.write('{:>7}'.format("Boltz"))
         if options.imag_freq is True:
-            log.write('{:>9}'.format("im freq"), thermodata=True)
+            log.write('{:>9}'.format("im freq"))
         if options.ssymm:
-            log.write('{:>13}'.format("Point Group"), thermodata=True)
+            log.write('{:>13}'.format("Point Group"))
         log.write("\n" + stars + "")
 
-        # Look for duplicates or enantiomers
-        if options.duplicate:
-            dup_list = check_dup(files, thermo_data)
-        else:
-            dup_list = []
-
         # Boltzmann factors and averaging over clusters
-        if options.boltz != False:
-            boltz_facs, weighted_free_energy, boltz_sum = get_boltz(files, thermo_data, clustering, clusters,
-                                                                    options.temperature, dup_list)
+        boltz_facs, weighted_free_energy, boltz_sum = result.boltz_facs, result.weighted_free_energy, result.boltz_sum
+        if options.boltz != False and stream:
+            stream.boltzmann(files, boltz_facs, boltz_sum, weighted_free_energy, options.temperature)
+
+        duplicate_of = {}
+        for dup in dup_list:
+            duplicate_of.setdefault(dup[0], dup[1])
+        # Clusters are summarized after their last member is printed
+        cluster_ends = {}
+        if clustering:
+            for n, cluster in enumerate(clusters):
+                if len(cluster) > 0:
+                    cluster_ends.setdefault(cluster[-1], []).append(n)
 
         for file in files:  # Loop over the output files and compute thermochemistry
-            duplicate = False
-            if len(dup_list) != 0:
-                for dup in dup_list:
-                    if dup[0] == file:
-                        duplicate = True
-                        log.write('\nx  {} is a duplicate or enantiomer of {}'.format(dup[0].rsplit('.', 1)[0],
-                                                                                      dup[1].rsplit('.', 1)[0]))
-                        break
+            duplicate = file in duplicate_of
+            if duplicate:
+                log.write('\nx  {} is a duplicate or enantiomer of {}'.format(file.rsplit('.', 1)[0],
+                                                                              duplicate_of[file].rsplit('.', 1)[0]))
             if not duplicate:
                 bbe = thermo_data[file]
+                if results:
+                    results.add(file, bbe, options.temperature, spc=options.spc is not False, qh=options.QH,
+                                boltz=boltz_facs[file] / boltz_sum if options.boltz is True else None)
                 if options.cputime != False:  # Add up CPU times
                     if hasattr(bbe, "cpu"):
                         if bbe.cpu != None:
@@ -3492,18 +6111,6 @@ def main():
                 if total_cpu_time.month > 1:
                     add_days += 31
 
-                if options.xyz:  # Write Cartesians
-                    xyzdata = getoutData(file)
-                    xyz.write_text(str(len(xyzdata.atom_types)))
-                    if hasattr(bbe, "scf_energy"):
-                        xyz.write_text(
-                            '{:<39} {:>13} {:13.6f}'.format(os.path.splitext(os.path.basename(file))[0], 'Eopt',
-                                                            bbe.scf_energy))
-                    else:
-                        xyz.write_text('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
-                    if hasattr(xyzdata, 'cartesians') and hasattr(xyzdata, 'atom_types'):
-                        xyz.write_coords(xyzdata.atom_types, xyzdata.cartesians)
-
                 # Check for possible error in Gaussian calculation of linear molecules which can return 2 rotational constants instead of 3
                 if bbe.linear_warning:
                     log.write("\nx  " + '{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
@@ -3513,15 +6120,15 @@ def main():
                         if options.spc is not False:
                             if bbe.sp_energy != '!':
                                 log.write("\no  ")
-                                log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]), thermodata=True)
-                                log.write(' {:13.6f}'.format(bbe.sp_energy), thermodata=True)
+                                log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
+                                log.write(' {:13.6f}'.format(bbe.sp_energy))
                             if bbe.sp_energy == '!':
                                 log.write("\nx  ")
-                                log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]), thermodata=True)
-                                log.write(' {:>13}'.format('----'), thermodata=True)
+                                log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
+                                log.write(' {:>13}'.format('----'))
                         else:
                             log.write("\no  ")
-                            log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]), thermodata=True)
+                            log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
                     # Gaussian SPC file handling
                     if hasattr(bbe, "scf_energy") and not hasattr(bbe, "gibbs_free_energy"):
                         log.write("\nx  " + '{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
@@ -3529,7 +6136,7 @@ def main():
                     elif not hasattr(bbe, "scf_energy") and not hasattr(bbe, "gibbs_free_energy"):
                         log.write("\nx  " + '{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
                     if hasattr(bbe, "scf_energy"):
-                        log.write(' {:13.6f}'.format(bbe.scf_energy), thermodata=True)
+                        log.write(' {:13.6f}'.format(bbe.scf_energy))
                     # No freqs found
                     if not hasattr(bbe, "gibbs_free_energy"):
                         log.write("   Warning! Couldn't find frequency information ...")
@@ -3540,27 +6147,27 @@ def main():
                                 log.write(' {:10.6f} {:13.6f} {:13.6f} {:10.6f} {:10.6f} {:13.6f} {:13.6f}'.format(
                                     bbe.zpe, bbe.enthalpy, bbe.qh_enthalpy, (options.temperature * bbe.entropy),
                                     (options.temperature * bbe.qh_entropy), bbe.gibbs_free_energy,
-                                    bbe.qh_gibbs_free_energy), thermodata=True)
+                                    bbe.qh_gibbs_free_energy))
                             else:
                                 log.write(' {:10.6f} {:13.6f} {:10.6f} {:10.6f} {:13.6f} '
                                           '{:13.6f}'.format(bbe.zpe, bbe.enthalpy,
                                                             (options.temperature * bbe.entropy),
                                                             (options.temperature * bbe.qh_entropy),
-                                                            bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy),
-                                          thermodata=True)
+                                                            bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy))
 
                         if options.media is not False and options.media.lower() in solvents and options.media.lower() == \
                                 os.path.splitext(os.path.basename(file))[0].lower():
-                            log.write("  Solvent: {:4.2f}M ".format(media_conc))
+                            log.write("  Solvent: {:4.2f}M ".format(result.media_conc))
                         
                 # Append requested options to end of output
-                if options.cosmo and cosmo_solv is not None:
-                    log.write('{:13.6f} {:16.6f}'.format(cosmo_solv[file], bbe.qh_gibbs_free_energy + cosmo_solv[file]))
+                if options.cosmo and result.cosmo_solv is not None:
+                    log.write('{:13.6f} {:16.6f}'.format(result.cosmo_solv[file],
+                                                         bbe.qh_gibbs_free_energy + result.cosmo_solv[file]))
                 if options.boltz is True:
-                    log.write('{:7.3f}'.format(boltz_facs[file] / boltz_sum), thermodata=True)
+                    log.write('{:7.3f}'.format(boltz_facs[file] / boltz_sum))
                 if options.imag_freq is True and hasattr(bbe, "im_frequency_wn"):
                     for freq in bbe.im_frequency_wn:
-                        log.write('{:9.2f}'.format(freq), thermodata=True)
+                        log.write('{:9.2f}'.format(freq))
                 if options.ssymm:
                     if hasattr(bbe, "qh_gibbs_free_energy"):
                         log.write('{:>13}'.format(bbe.point_group))
@@ -3569,23 +6176,51 @@ def main():
             # Cluster files if requested
             if clustering:
                 dashes = "-" * (len(stars) - 3)
-                for n, cluster in enumerate(clusters):
-                    for id, structure in enumerate(cluster):
-                        if structure == file:
-                            if id == len(cluster) - 1:
-                                log.write("\n   " + dashes)
-                                log.write("\n   " + '{name:<{var_width}} {gval:13.6f} {weight:6.2f}'.format(
-                                    name='Boltzmann-weighted Cluster ' + alphabet[n].upper(), var_width=len(stars) - 24,
-                                    gval=weighted_free_energy['cluster-' + alphabet[n].upper()] / boltz_facs[
-                                        'cluster-' + alphabet[n].upper()],
-                                    weight=100 * boltz_facs['cluster-' + alphabet[n].upper()] / boltz_sum),
-                                          thermodata=True)
-                                log.write("\n   " + dashes)
+                for n in cluster_ends.get(file, []):
+                    label = cluster_label(n)
+                    log.write("\n   " + dashes)
+                    log.write("\n   " + '{name:<{var_width}} {gval:13.6f} {weight:6.2f}'.format(
+                        name='Boltzmann-weighted Cluster ' + label, var_width=len(stars) - 24,
+                        gval=weighted_free_energy['cluster-' + label] / boltz_facs['cluster-' + label],
+                        weight=100 * boltz_facs['cluster-' + label] / boltz_sum))
+                    log.write("\n   " + dashes)
         log.write("\n" + stars + "\n")
 
+        # Write Cartesians of the unique structures
+        if options.xyz:
+            xyz_files = [file for file in files if file not in duplicate_of]
+            populations = None
+            if options.xyz_min_pop is not None or options.xyz_annotate:
+                if options.boltz is False:
+                    boltz_facs, weighted_free_energy, boltz_sum = get_boltz(files, thermo_data, clustering, clusters,
+                                                                            options.temperature, dup_list)
+                populations = dict((file, boltz_facs[file] / boltz_sum) for file in xyz_files if file in boltz_facs)
+            for frame in xyz_ensemble(xyz_files, thermo_data, populations, options.xyz_sort, options.xyz_min_pop,
+                                      options.xyz_annotate):
+                xyz.write_frame(*frame)
+
+        # Uncertainty of Boltzmann populations from sampled free energies
+        if options.mc and options.boltz is True:
+            mc_files, mc_energies, mc_sigma = get_mc_input(files, thermo_data, dup_list, options.sigma, l_o_t,
+                                                           options.temperature)
+            mc_populations = mc_boltz(mc_energies, mc_sigma, options.temperature, options.mc, options.seed)
+            mean, low, high = confidence_interval(mc_populations)
+            nominal = boltz_populations(mc_energies, options.temperature)
+            mc_stars = "   " + '*' * 95
+            log.write("\n   Monte-Carlo uncertainty of Boltzmann populations: {} samples, {}".format(
+                options.mc, sigma_text))
+            log.write("\n\n   " + '{:<39} {:>13} {:>13} {:>13} {:>13}'.format("Structure", "Boltz", "Mean", "2.5%",
+                                                                              "97.5%"))
+            log.write("\n" + mc_stars)
+            for i, file in enumerate(mc_files):
+                log.write("\no  " + '{:<39} {:13.3f} {:13.3f} {:13.3f} {:13.3f}'.format(
+                    os.path.splitext(os.path.basename(file))[0], nominal[i], mean[i], low[i], high[i]))
+            log.write("\n" + mc_stars + "\n")
+
     # Perform checks for consistent options provided in calculation files (level of theory)
     if options.check:
-        check_files(log, files, thermo_data, options, stars, l_o_t, s_m, orientation, grid)
+        check_files(log, files, thermo_data, options, stars, l_o_t, result.solvation_models, result.orientation,
+                    result.grid, result.spc_levels_of_theory)
 
     # Running a variable temperature analysis of the enthalpy, entropy and the free energy
     elif options.temperature_interval:
@@ -3600,38 +6235,40 @@ def main():
             log.write("\n   T init:  %.1f,  T final:  %.1f,  T interval: %.1f" % (
                 temperature_interval[0], temperature_interval[1], temperature_interval[2]))
         else:
-            interval = t_interval
+            interval = result.t_interval
             log.write("\n   T init:  %.1f,   T final: %.1f" % (interval[0], interval[-1]))
 
         if options.QH:
             qh_print_format = "\n\n   {:<39} {:>13} {:>24} {:>13} {:>10} {:>10} {:>13} {:>13}"
             if options.spc and options.cosmo_int:
                 log.write(qh_print_format.format("Structure", "Temp/K", "H_SPC", "qh-H_SPC", "T.S", "T.qh-S",
-                                                 "G(T)_SPC", "COSMO-RS-qh-G(T)_SPC"), thermodata=True)
+                                                 "G(T)_SPC", "COSMO-RS-qh-G(T)_SPC"))
             elif options.cosmo_int:
                 log.write(qh_print_format.format("Structure", "Temp/K", "H", "qh-H", "T.S", "T.qh-S", "G(T)",
-                                                 "qh-G(T)", "COSMO-RS-qh-G(T)"), thermodata=True)
+                                                 "qh-G(T)", "COSMO-RS-qh-G(T)"))
             elif options.spc:
                 log.write(qh_print_format.format("Structure", "Temp/K", "H_SPC", "qh-H_SPC", "T.S", "T.qh-S",
-                                                 "G(T)_SPC", "qh-G(T)_SPC"), thermodata=True)
+                                                 "G(T)_SPC", "qh-G(T)_SPC"))
             else:
                 log.write(qh_print_format.format("Structure", "Temp/K", "H", "qh-H", "T.S", "T.qh-S", "G(T)",
-                                                 "qh-G(T)"), thermodata=True)
+                                                 "qh-G(T)"))
         else:
             print_format_3 = '\n\n   {:<39} {:>13} {:>24} {:>10} {:>10} {:>13} {:>13}'
             if options.spc and options.cosmo_int:
                 log.write(print_format_3.format("Structure", "Temp/K", "H_SPC", "T.S", "T.qh-S", "G(T)_SPC",
-                                                "COSMO-RS-qh-G(T)_SPC"), thermodata=True)
+                                                "COSMO-RS-qh-G(T)_SPC"))
             elif options.cosmo_int:
                 log.write(print_format_3.format("Structure", "Temp/K", "H", "T.S", "T.qh-S", "G(T)", "qh-G(T)",
-                                                "COSMO-RS-qh-G(T)"), thermodata=True)
+                                                "COSMO-RS-qh-G(T)"))
             elif options.spc:
                 log.write(print_format_3.format("Structure", "Temp/K", "H_SPC", "T.S", "T.qh-S", "G(T)_SPC",
-                                                "qh-G(T)_SPC"), thermodata=True)
+                                                "qh-G(T)_SPC"))
             else:
-                log.write(print_format_3.format("Structure", "Temp/K", "H", "T.S", "T.qh-S", "G(T)", "qh-G(T)"),
-                          thermodata=True)
+                log.write(print_format_3.format("Structure", "Temp/K", "H", "T.S", "T.qh-S", "G(T)", "qh-G(T)"))
 
+        # Mirror images take the thermochemistry of their representative at each temperature
+        mirror_of = dict((mirror, files.index(representative)) for mirror, representative in result.enantiomers)
+        meter = progress_meter(len(files), label='Temperature interval') if options.quiet else False
         for h, file in enumerate(files):  # Temperature interval
             log.write("\n" + stars)
             interval_bbe_data.append([])
@@ -3645,17 +6282,24 @@ def main():
                 if options.cosmo_int is False:
                     cosmo_option = False
                 else:
-                    cosmo_option = gsolv_dicts[i][file]
-                if options.cosmo_int is False:
-                    # haven't implemented D3 for this option
+                    cosmo_option = result.gsolv_dicts[i][file]
+                if file in mirror_of:
+                    bbe = mirror_image(interval_bbe_data[mirror_of[file]][i], thermo_data[file],
+                                       result.spc_files.get(file))
+                else:
                     bbe = calc_bbe(file, options.QS, options.QH, options.S_freq_cutoff, options.H_freq_cutoff, temp,
                                    conc, options.freq_scale_factor, options.freespace, options.spc, options.invert,
-                                   0.0, cosmo=cosmo_option, inertia=options.inertia)
+                                   result.d3_energies[file], cosmo=cosmo_option, inertia=options.inertia)
+                bbe.degeneracy = getattr(thermo_data[file], "degeneracy", 1)
                 interval_bbe_data[h].append(bbe)
+                if results:
+                    results.add(file, bbe, temp, spc=options.spc is not False, qh=options.QH)
+                if stream:
+                    stream.structure(file, bbe, temp, spc=options.spc is not False, qh=options.QH)
                 linear_warning.append(bbe.linear_warning)
                 if linear_warning == [['Warning! Potential invalid calculation of linear molecule from Gaussian.']]:
                     log.write("\nx  ")
-                    log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]), thermodata=True)
+                    log.write('{:<39}'.format(os.path.splitext(os.path.basename(file))[0]))
                     log.write('             Warning! Potential invalid calculation of linear molecule from Gaussian ...')
                 else:
                     # Gaussian spc files
@@ -3668,8 +6312,7 @@ def main():
                         log.write("Warning! Couldn't find frequency information ...")
                     else:
                         log.write("\no  ")
-                        log.write('{:<39} {:13.1f}'.format(os.path.splitext(os.path.basename(file))[0], temp),
-                                  thermodata=True)
+                        log.write('{:<39} {:13.1f}'.format(os.path.splitext(os.path.basename(file))[0], temp))
                         # if not options.media:
                         if all(getattr(bbe, attrib) for attrib in
                                ["enthalpy", "entropy", "qh_entropy", "gibbs_free_energy", "qh_gibbs_free_energy"]):
@@ -3677,28 +6320,28 @@ def main():
                                 if options.cosmo_int:
                                     log.write(' {:24.6f} {:13.6f} {:10.6f} {:10.6f} {:13.6f} {:13.6f}'.format(
                                         bbe.enthalpy, bbe.qh_enthalpy, (temp * bbe.entropy),
-                                        (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.cosmo_qhg),
-                                        thermodata=True)
+                                        (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.cosmo_qhg))
                                 else:
                                     log.write(' {:24.6f} {:13.6f} {:10.6f} {:10.6f} {:13.6f} {:13.6f}'.format(
                                         bbe.enthalpy, bbe.qh_enthalpy, (temp * bbe.entropy),
-                                        (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy),
-                                        thermodata=True)
+                                        (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy))
                             else:
                                 if options.cosmo_int:
                                     log.write(' {:24.6f} {:10.6f} {:10.6f} {:13.6f} {:13.6f}'.format(bbe.enthalpy, (
                                             temp * bbe.entropy), (temp * bbe.qh_entropy), bbe.gibbs_free_energy,
-                                                                                                     bbe.cosmo_qhg),
-                                              thermodata=True)
+                                                                                                     bbe.cosmo_qhg))
                                 else:
                                     log.write(' {:24.6f} {:10.6f} {:10.6f} {:13.6f} {:13.6f}'.format(bbe.enthalpy, (
-                                            temp * bbe.entropy), (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy),
-                                              thermodata=True)
+                                            temp * bbe.entropy), (temp * bbe.qh_entropy), bbe.gibbs_free_energy, bbe.qh_gibbs_free_energy))
                         if options.media is not False and options.media.lower() in solvents and options.media.lower() == \
                                 os.path.splitext(os.path.basename(file))[0].lower():
-                            log.write("  Solvent: {:4.2f}M ".format(media_conc))
+                            log.write("  Solvent: {:4.2f}M ".format(result.media_conc))
                             
             log.write("\n" + stars + "\n")
+            if meter:
+                meter.update(file)
+        if meter:
+            meter.finish()
 
     # Print CPU usage if requested
     if options.cputime:
@@ -3710,13 +6353,7 @@ def main():
     if options.pes:
         if options.gconf:
             log.write('\n   Gconf correction requested to be applied to below relative values using quasi-harmonic Boltzmann factors\n')
-        for key in thermo_data:
-            if not hasattr(thermo_data[key], "qh_gibbs_free_energy"):
-                pes_error = "\nWarning! Could not find thermodynamic data for " + key + "\n"
-                sys.exit(pes_error)
-            if not hasattr(thermo_data[key], "sp_energy") and options.spc is not False:
-                pes_error = "\nWarning! Could not find thermodynamic data for " + key + "\n"
-                sys.exit(pes_error)
+        result.check_pes()
         # Interval applied to PES
         if options.temperature_interval:
             stars = stars + '*' * 22
@@ -3766,39 +6403,37 @@ def main():
                         if options.QH and options.cosmo_int:
                             log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} {:>13} '
                                       '{:>13}'.format(" DE", "DZPE", "DH", "qh-DH", "T.DS", "T.qh-DS", "DG(T)",
-                                                      "qh-DG(T)", 'COSMO-qh-G(T)'), thermodata=True)
+                                                      "qh-DG(T)", 'COSMO-qh-G(T)'))
                         elif options.QH:
                             log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
                                       '{:>13}'.format(" DE", "DZPE", "DH", "qh-DH", "T.DS", "T.qh-DS", "DG(T)",
-                                                      "qh-DG(T)"), thermodata=True)
+                                                      "qh-DG(T)"))
                         elif options.cosmo_int:
                             log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
                                       '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)",
-                                                      'COSMO-qh-G(T)'), thermodata=True)
+                                                      'COSMO-qh-G(T)'))
                         else:
                             log.write('{:>13} {:>10} {:>13} {:>10} {:>10} {:>13} '
-                                      '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"),
-                                      thermodata=True)
+                                      '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"))
                     else:
                         log.write("\n   " + '{:<40}'.format("RXN: " + path + " (" + pes.units + ")  at T: " +
                                                             str(temp)))
                         if options.QH and options.cosmo_int:
                             log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} {:>14} {:>14}'.format(
                                 " DE_SPC", "DE", "DZPE", "DH_SPC", "qh-DH_SPC", "T.DS", "T.qh-DS", "DG(T)_SPC",
-                                "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'), thermodata=True)
+                                "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'))
                         elif options.QH:
                             log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} '
                                       '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "qh-DH_SPC", "T.DS",
-                                                      "T.qh-DS", "DG(T)_SPC", "qh-DG(T)_SPC"), thermodata=True)
+                                                      "T.qh-DS", "DG(T)_SPC", "qh-DG(T)_SPC"))
                         elif options.cosmo_int:
                             log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} '
                                       '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "T.DS", "T.qh-DS",
-                                                      "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'),
-                                      thermodata=True)
+                                                      "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'))
                         else:
                             log.write('{:>13} {:>13} {:>10} {:>13} {:>10} {:>10} {:>14} '
                                       '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "T.DS", "T.qh-DS",
-                                                      "DG(T)_SPC", "qh-DG(T)_SPC"), thermodata=True)
+                                                      "DG(T)_SPC", "qh-DG(T)_SPC"))
                     log.write("\n" + stars)
 
                     for l, e_abs in enumerate(pes.e_abs[k]):
@@ -3813,6 +6448,12 @@ def main():
                         if options.cosmo_int:
                             species.append(pes.cosmo_qhg_abs[k][l])
                         relative = [species[x] - zero_vals[x] for x in range(len(zero_vals))]
+                        if stream:
+                            stream.pes(path, pes.species[k][l], temp, pes.units, relative, options.spc is not False,
+                                       options.QH, options.cosmo_int is not False)
+                        if results:
+                            results.add_pes(path, pes.species[k][l], temp, pes.units, relative,
+                                            options.spc is not False, options.QH, options.cosmo_int is not False)
                         if pes.units == 'kJ/mol':
                             formatted_list = [J_TO_AU / 1000.0 * x for x in relative]
                         else:
@@ -3826,42 +6467,41 @@ def main():
                                        '{:13.2f} {:13.2f}'
                             if options.QH and options.cosmo_int:
                                 if pes.dec == 1:
-                                    log.write(format_1.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_1.format(pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
-                                    log.write(format_2.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_2.format(pes.species[k][l], *formatted_list))
                             elif options.QH or options.cosmo_int:
                                 if pes.dec == 1:
-                                    log.write(format_1.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_1.format(pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
-                                    log.write(format_2.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_2.format(pes.species[k][l], *formatted_list))
                             else:
                                 if pes.dec == 1:
-                                    log.write(format_1.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_1.format(pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
-                                    log.write(format_2.format(pes.species[k][l], *formatted_list), thermodata=True)
+                                    log.write(format_2.format(pes.species[k][l], *formatted_list))
                         else:
                             if options.QH and options.cosmo_int:
                                 if pes.dec == 1:
                                     log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} '
-                                              '{:13.1f} {:13.1f} {:13.1f}'.format(pes.species[k][l], *formatted_list),
-                                              thermodata=True)
+                                              '{:13.1f} {:13.1f} {:13.1f}'.format(pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
                                     log.write('{:<39} {:13.1f} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} {:13.2f} {:13.2f}'.format(
-                                            pes.species[k][l], *formatted_list), thermodata=True)
+                                            pes.species[k][l], *formatted_list))
                             elif options.QH or options.cosmo_int:
                                 if pes.dec == 1:
                                     log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} {:13.1f}'.format(
-                                            pes.species[k][l], *formatted_list), thermodata=True)
+                                            pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
                                     log.write('{:<39} {:13.1f} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} {:13.2f}'.format(
-                                            pes.species[k][l], *formatted_list), thermodata=True)
+                                            pes.species[k][l], *formatted_list))
                             else:
                                 if pes.dec == 1:
                                     log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} {:13.1f}'.format(
-                                            pes.species[k][l], *formatted_list), thermodata=True)
+                                            pes.species[k][l], *formatted_list))
                                 if pes.dec == 2:
                                     log.write('{:<39} {:13.2f} {:13.2f} {:10.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} {:13.2f}'.format(
-                                            pes.species[k][l], *formatted_list), thermodata=True)
+                                            pes.species[k][l], *formatted_list))
                         if pes.boltz:
                             boltz = [math.exp(-relative[1] * J_TO_AU / GAS_CONSTANT / options.temperature) / e_sum,
                                      math.exp(-relative[3] * J_TO_AU / GAS_CONSTANT / options.temperature) / h_sum,
@@ -3882,10 +6522,7 @@ def main():
                     log.write("\n" + stars + "\n")
                 j += 1
         else:
-            if options.cosmo:
-                pes = get_pes(options.pes, thermo_data, log, options.temperature, options.gconf, options.QH, cosmo=True)
-            else:
-                pes = get_pes(options.pes, thermo_data, log, options.temperature, options.gconf, options.QH)
+            pes = result.get_pes()
             # Output the relative energy data
             for i, path in enumerate(pes.path):
                 if options.QH:
@@ -3924,37 +6561,35 @@ def main():
                     if options.QH and options.cosmo:
                         log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} {:>13} '
                                   '{:>13}'.format(" DE", "DZPE", "DH", "qh-DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)",
-                                                  'COSMO-qh-G(T)'), thermodata=True)
+                                                  'COSMO-qh-G(T)'))
                     elif options.QH:
                         log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
-                                  '{:>13}'.format(" DE", "DZPE", "DH", "qh-DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"),
-                                  thermodata=True)
+                                  '{:>13}'.format(" DE", "DZPE", "DH", "qh-DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"))
                     elif options.cosmo:
                         log.write('{:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>13} '
                                   '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)",
-                                                  'COSMO-qh-G(T)'), thermodata=True)
+                                                  'COSMO-qh-G(T)'))
                     else:
                         log.write('{:>13} {:>10} {:>13} {:>10} {:>10} {:>13} '
-                                  '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"),
-                                  thermodata=True)
+                                  '{:>13}'.format(" DE", "DZPE", "DH", "T.DS", "T.qh-DS", "DG(T)", "qh-DG(T)"))
                 else:
                     log.write("\n   " + '{:<40}'.format("RXN: " + path + " (" + pes.units + ") ", ))
                     if options.QH and options.cosmo:
                         log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} {:>14} '
                                   '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "qh-DH_SPC", "T.DS", "T.qh-DS",
-                                                  "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'), thermodata=True)
+                                                  "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'))
                     elif options.QH:
                         log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} '
                                   '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "qh-DH_SPC", "T.DS", "T.qh-DS",
-                                                  "DG(T)_SPC", "qh-DG(T)_SPC"), thermodata=True)
+                                                  "DG(T)_SPC", "qh-DG(T)_SPC"))
                     elif options.cosmo:
                         log.write('{:>13} {:>13} {:>10} {:>13} {:>13} {:>10} {:>10} {:>14} '
                                   '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "T.DS", "T.qh-DS",
-                                                  "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'), thermodata=True)
+                                                  "DG(T)_SPC", "qh-DG(T)_SPC", 'COSMO-qh-G(T)_SPC'))
                     else:
                         log.write('{:>13} {:>13} {:>10} {:>13} {:>10} {:>10} {:>14} '
                                   '{:>14}'.format(" DE_SPC", "DE", "DZPE", "DH_SPC", "T.DS", "T.qh-DS", "DG(T)_SPC",
-                                                  "qh-DG(T)_SPC"), thermodata=True)
+                                                  "qh-DG(T)_SPC"))
                 log.write("\n" + stars)
 
                 for j, e_abs in enumerate(pes.e_abs[i]):
@@ -3969,6 +6604,12 @@ def main():
                     if options.cosmo:
                         species.append(pes.cosmo_qhg_abs[i][j])
                     relative = [species[x] - zero_vals[x] for x in range(len(zero_vals))]
+                    if stream:
+                        stream.pes(path, pes.species[i][j], options.temperature, pes.units, relative,
+                                   options.spc is not False, options.QH, options.cosmo is not False)
+                    if results:
+                        results.add_pes(path, pes.species[i][j], options.temperature, pes.units, relative,
+                                        options.spc is not False, options.QH, options.cosmo is not False)
                     if pes.units == 'kJ/mol':
                         formatted_list = [J_TO_AU / 1000.0 * x for x in relative]
                     else:
@@ -3979,52 +6620,46 @@ def main():
                         if options.QH and options.cosmo:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} '
-                                          '{:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} '
-                                          '{:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list))
                         elif options.QH or options.cosmo:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} '
-                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} '
-                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list))
                         else:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:10.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} '
-                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.2f} {:10.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} '
-                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list))
                     else:
                         if options.QH and options.cosmo:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} '
-                                          '{:13.1f} {:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.1f} {:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.1f} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} '
-                                          '{:13.2f} {:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.2f} {:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list))
                         elif options.QH or options.cosmo:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:13.1f} {:10.1f} {:10.1f} '
-                                          '{:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.1f} {:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.1f} {:13.2f} {:10.2f} {:13.2f} {:13.2f} {:10.2f} {:10.2f} '
-                                          '{:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list),
-                                          thermodata=True)
+                                          '{:13.2f} {:13.2f}'.format(pes.species[i][j], *formatted_list))
                         else:
                             if pes.dec == 1:
                                 log.write('{:<39} {:13.1f} {:13.1f} {:10.1f} {:13.1f} {:10.1f} {:10.1f} {:13.1f} '
-                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.1f}'.format(pes.species[i][j], *formatted_list))
                             if pes.dec == 2:
                                 log.write('{:<39} {:13.2f} {:13.2f} {:10.2f} {:13.2f} {:10.2f} {:10.2f} {:13.2f} '
-                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list), thermodata=True)
+                                          '{:13.2f}'.format(pes.species[i][j], *formatted_list))
                     if pes.boltz:
                         boltz = [math.exp(-relative[1] * J_TO_AU / GAS_CONSTANT / options.temperature) / e_sum,
                                  math.exp(-relative[3] * J_TO_AU / GAS_CONSTANT / options.temperature) / h_sum,
@@ -4042,19 +6677,85 @@ def main():
                         log.write("\n" + stars + "\n   " + '{:<39} {:27.1f} {:24.1f} {:35.1f} {:13.1f} '.format('ee (%)', *ee))
                 log.write("\n" + stars + "\n")
 
+    # Energetic span analysis of catalytic cycles
+    if options.span is not False:
+        if options.pes is False:
+            log.write("\n   Warning! An energetic span analysis requires a PES file, use the --pes option.\n")
+        else:
+            if options.span is True:
+                span_temps = [options.temperature]
+            else:
+                span_interval = [float(temp) for temp in options.span.split(',')]
+                if len(span_interval) == 2:
+                    span_interval.append((span_interval[1] - span_interval[0]) / 10.0)
+                if span_interval[2] > 0:
+                    span_temps = list(np.arange(span_interval[0], span_interval[1] + span_interval[2] / 2.0,
+                                                span_interval[2]))
+                else:
+                    span_temps = [span_interval[0]]
+            if options.temperature_interval:
+                pes = get_pes(options.pes, thermo_data, log, options.temperature, options.gconf, options.QH)
+            span = get_span(pes, span_temps, options.QH)
+            if pes.units == 'kJ/mol':
+                conversion = J_TO_AU / 1000.0
+            else:
+                conversion = KCAL_TO_AU
+            span_stars = "   " + '*' * 142
+            log.write("\n   Energetic span analysis of reaction pathways ({}) using qh-G(T) = H - T.qh-S from the "
+                      "values at {} K".format(pes.units, options.temperature))
+            log.write("\n   REF: " + span_ref + "\n")
+            for i, path in enumerate(pes.path):
+                log.write("\n   " + '{:<39} {:>10} {:>10} {:>13} {:>24} {:>8} {:>24} {:>8}'.format(
+                    "RXN: " + path, "DGr", "dE", "TOF (1/s)", "TDTS", "X(TDTS)", "TDI", "X(TDI)"))
+                log.write("\n" + span_stars)
+                for t, temp in enumerate(span.temperatures):
+                    if np.isnan(span.span[t, i]):
+                        log.write("\nx  " + '{:<39}'.format("T = {:.2f} K".format(temp)) +
+                                  "   Warning! Pathway needs at least one transition state and one intermediate")
+                        continue
+                    tdts, tdi = span.tdts[t, i], span.tdi[t, i]
+                    log.write("\no  " + '{:<39} {:10.2f} {:10.2f} {:13.3e} {:>24} {:8.3f} {:>24} {:8.3f}'.format(
+                        "T = {:.2f} K".format(temp), span.dgr[t, i] * conversion, span.span[t, i] * conversion,
+                        span.tof[t, i], pes.species[i][tdts], span.x_tof[t, i, tdts], pes.species[i][tdi],
+                        span.x_tof[t, i, tdi]))
+                log.write("\n" + span_stars + "\n")
+
     # Compute enantiomeric excess
     if options.ee is not False:
         selec_stars = "   " + '*' * 109
-        boltz_facs, weighted_free_energy, boltz_sum = get_boltz(files, thermo_data, clustering, clusters,
-                                                                options.temperature, dup_list)
-        ee, er, ratio, dd_free_energy, failed, preference = get_selectivity(options.ee, files, boltz_facs, boltz_sum,
-                                                                            options.temperature, log, dup_list)
-        if not failed:
-            log.write("\n   " + '{:<39} {:>13} {:>13} {:>13} {:>13} {:>13}'.format("Selectivity", "Excess (%)", "Ratio (%)", "Ratio", "Major Iso", "ddG"), thermodata=True)
+        selectivity = result.get_selectivity()
+        if selectivity:
+            ee, er, ratio, preference, dd_free_energy = [selectivity[key] for key in
+                                                         ('excess', 'ratio_percent', 'ratio', 'major', 'ddg')]
+            log.write("\n   " + '{:<39} {:>13} {:>13} {:>13} {:>13} {:>13}'.format("Selectivity", "Excess (%)", "Ratio (%)", "Ratio", "Major Iso", "ddG"))
             log.write("\n" + selec_stars)
             log.write('\no {:<40} {:13.2f} {:>13} {:>13} {:>13} {:13.2f}'.format('', ee, er, ratio, preference,
-                                                                                 dd_free_energy), thermodata=True)
+                                                                                 dd_free_energy))
             log.write("\n" + selec_stars + "\n")
+            if stream:
+                stream.write('selectivity', temperature=options.temperature, excess=ee, ratio_percent=er, ratio=ratio,
+                             major=preference, ddg=dd_free_energy)
+            if results:
+                results.add_selectivity(options.temperature, ee, er, ratio, preference, dd_free_energy)
+            if options.mc:
+                a_files, b_files, A, B = get_selectivity_files(options.ee, files, log)
+                mc_files, mc_energies, mc_sigma = get_mc_input(files, thermo_data, dup_list, options.sigma, l_o_t,
+                                                               options.temperature)
+                mc_populations = mc_boltz(mc_energies, mc_sigma, options.temperature, options.mc, options.seed)
+                a_mask = np.array([file in a_files for file in mc_files], dtype=bool)
+                b_mask = np.array([file in b_files for file in mc_files], dtype=bool)
+                mc_ee, mc_ddg = mc_selectivity(mc_populations, a_mask, b_mask, options.temperature,
+                                               sign=1.0 if preference == A else -1.0)
+                ee_ci, ddg_ci = confidence_interval(mc_ee), confidence_interval(mc_ddg)
+                log.write("\n   Monte-Carlo uncertainty of selectivity: {} samples, {}".format(
+                    options.mc, sigma_text))
+                mc_stars = selec_stars + '*' * 14
+                log.write("\n\n   " + '{:<39} {:>13} {:>13} {:>13} {:>13} {:>13} {:>13}'.format(
+                    "Selectivity", "Excess (%)", "2.5%", "97.5%", "ddG", "2.5%", "97.5%"))
+                log.write("\n" + mc_stars)
+                log.write('\no {:<40} {:13.2f} {:13.2f} {:13.2f} {:13.2f} {:13.2f} {:13.2f}'.format(
+                    preference, ee_ci[0], ee_ci[1], ee_ci[2], ddg_ci[0], ddg_ci[1], ddg_ci[2]))
+                log.write("\n" + mc_stars + "\n")
     # Graph reaction profiles
     if options.graph is not False:
         try:
@@ -4076,6 +6777,9 @@ def main():
 
     # Close the log
     log.finalize()
+    if results: results.write()
+    if stream: stream.close()
+    if db: db.close()
     if options.xyz: xyz.finalize()
 
 
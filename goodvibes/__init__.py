@@ -0,0 +1,9 @@
+# The library API is imported on first use, so that the command-line client starts without loading GoodVibes
+__all__ = ['analyze', 'analysis', 'GoodVibesError']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import GoodVibes
+        return getattr(GoodVibes, name)
+    raise AttributeError("module 'goodvibes' has no attribute '{}'".format(name))
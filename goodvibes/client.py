@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Thin client of the GoodVibes service started with `python -m goodvibes --serve`.
+
+    python -m goodvibes.client [GoodVibes options] <output_file(s)>
+
+forwards the command line to the service, which runs it in the current directory in one of its warm worker
+processes; the output and exit status are those of `python -m goodvibes` with the same arguments. Only the standard
+library is imported, so the client starts as fast as the interpreter. GOODVIBES_SOCKET selects the socket.
+"""
+from __future__ import print_function
+
+import json
+import os
+import socket
+import sys
+
+
+def default_socket():
+    """Socket of the service, as GoodVibes.default_socket (not imported, to keep the client light)."""
+    cache = os.environ.get('GOODVIBES_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.goodvibes')
+    return os.environ.get('GOODVIBES_SOCKET') or os.path.join(cache, 'goodvibes.sock')
+
+
+def request(message, path=None):
+    """
+    Send one request to the service and wait for its response.
+
+    Parameters:
+    message (dict): the request, see GoodVibes.service_request.
+    path (str): socket of the service, default_socket() if None.
+
+    Returns:
+    dict: the response.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path or default_socket())
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        reply = sock.makefile('rb').readline()
+    finally:
+        sock.close()
+    if not reply:
+        raise ConnectionError("the service closed the connection")
+    return json.loads(reply.decode())
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = default_socket()
+    try:
+        response = request({'argv': argv, 'cwd': os.getcwd()}, path)
+    except (OSError, ValueError) as e:
+        sys.exit("GoodVibes service not available on {} ({}).\nStart it with: python -m goodvibes --serve".format(
+            path, e))
+    if not response.get('ok'):
+        sys.exit(response.get('error'))
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['status']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,10 @@
 #include <string.h>
 #include <math.h>
 
+#ifdef _WIN32
+#define strtok_r strtok_s
+#endif
+
 #ifndef M_PI
 #define M_PI 3.1415926535897932384626433832795028841971694
 #endif
@@ -68,8 +72,6 @@ typedef struct {
  *
  */
 
-char *pgroup;
-
 typedef struct _SYMMETRY_ELEMENT_ {
   void    (*transform_atom)( struct _SYMMETRY_ELEMENT_ *el, ATOM *from, ATOM *to ) ;
   int *   transform ;     /*   Correspondence table for the transformation         */
@@ -87,44 +89,55 @@ typedef struct {
   int     (*check)( void ) ;  /* Additional verification routine, not used         */
 } POINT_GROUP ;
 
-double                 ToleranceSame         = 1e-3 ;
-double                 TolerancePrimary      = 5e-2 ;
-double                 ToleranceFinal        = 0.1 ;    //edited this value from 1e-4
-double                 MaxOptStep            = 5e-1 ;
-double                 MinOptStep            = 1e-7 ;
-double                 GradientStep          = 1e-7 ;
-double                 OptChangeThreshold    = 1e-10 ;
-double                 CenterOfSomething[ DIMENSION ] ;
-double *               DistanceFromCenter    = NULL ;
-int                    verbose               = 0 ;
-int                    MaxOptCycles          = 200 ;
-int                    OptChangeHits         = 5 ;
-int                    MaxAxisOrder          = 20 ;
-int                    AtomsCount            = 0 ;
-ATOM *                 Atoms                 = NULL ;
-int                    PlanesCount           = 0 ;
-SYMMETRY_ELEMENT **    Planes                = NULL ;
-SYMMETRY_ELEMENT *     MolecularPlane        = NULL ;
-int                    InversionCentersCount = 0 ;
-SYMMETRY_ELEMENT **    InversionCenters      = NULL ;
-int                    NormalAxesCount       = 0 ;
-SYMMETRY_ELEMENT **    NormalAxes            = NULL ;
-int                    ImproperAxesCount     = 0 ;
-SYMMETRY_ELEMENT **    ImproperAxes          = NULL ;
-int *                  NormalAxesCounts      = NULL ;
-int *                  ImproperAxesCounts    = NULL ;
-int                    BadOptimization       = 0 ;
-char *                 SymmetryCode          = "" ;
 /*
- *    Statistics
+ *  Tuning parameters, shared by all callers and never modified
  */
-long                   StatTotal             = 0 ;
-long                   StatEarly             = 0 ;
-long                   StatPairs             = 0 ;
-long                   StatDups              = 0 ;
-long                   StatOrder             = 0 ;
-long                   StatOpt               = 0 ;
-long                   StatAccept            = 0 ;
+static const double    ToleranceSame         = 1e-3 ;
+static const double    TolerancePrimary      = 5e-2 ;
+static const double    ToleranceFinal        = 0.1 ;    //edited this value from 1e-4
+static const double    MaxOptStep            = 5e-1 ;
+static const double    MinOptStep            = 1e-7 ;
+static const double    GradientStep          = 1e-7 ;
+static const double    OptChangeThreshold    = 1e-10 ;
+static const int       verbose               = 0 ;
+static const int       MaxOptCycles          = 200 ;
+static const int       OptChangeHits         = 5 ;
+static const int       MaxAxisOrder          = 20 ;
+
+/*
+ *  Everything a single analysis modifies lives in its own context, so
+ *  that concurrent calls from several threads do not interfere.
+ */
+typedef struct {
+  double                 CenterOfSomething[ DIMENSION ] ;
+  double *               DistanceFromCenter ;
+  int                    AtomsCount ;
+  ATOM *                 Atoms ;
+  int                    PlanesCount ;
+  SYMMETRY_ELEMENT **    Planes ;
+  SYMMETRY_ELEMENT *     MolecularPlane ;
+  int                    InversionCentersCount ;
+  SYMMETRY_ELEMENT **    InversionCenters ;
+  int                    NormalAxesCount ;
+  SYMMETRY_ELEMENT **    NormalAxes ;
+  int                    ImproperAxesCount ;
+  SYMMETRY_ELEMENT **    ImproperAxes ;
+  int *                  NormalAxesCounts ;
+  int *                  ImproperAxesCounts ;
+  int                    BadOptimization ;
+  char *                 SymmetryCode ;
+  char                   pgroup[ 16 ] ;
+  /*
+   *    Statistics
+   */
+  long                   StatTotal ;
+  long                   StatEarly ;
+  long                   StatPairs ;
+  long                   StatDups ;
+  long                   StatOrder ;
+  long                   StatOpt ;
+  long                   StatAccept ;
+} SYMMETRY_CONTEXT ;
 
 /*
  *    Point groups I know about
@@ -204,10 +217,10 @@ pow2( double x )
 }
 
 int
-establish_pairs( SYMMETRY_ELEMENT *elem )
+establish_pairs( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem )
 {
   int               i, j, k, best_j ;
-  char *            atom_used = calloc( AtomsCount, 1 ) ;
+  char *            atom_used = calloc( ctx->AtomsCount, 1 ) ;
   double            distance, best_distance ;
   ATOM              symmetric ;
 
@@ -215,19 +228,19 @@ establish_pairs( SYMMETRY_ELEMENT *elem )
     fprintf( stderr, "Out of memory for tagging array in establish_pairs()\n" ) ;
     exit( EXIT_FAILURE ) ;
   }
-  for( i = 0 ; i < AtomsCount ; i++ ){
-    if( elem->transform[i] >= AtomsCount ){ /* No symmetric atom yet          */
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
+    if( elem->transform[i] >= ctx->AtomsCount ){ /* No symmetric atom yet          */
       if( verbose > 2 ) printf( "        looking for a pair for %d\n", i ) ;
-      elem->transform_atom( elem, Atoms+i, &symmetric ) ;
+      elem->transform_atom( elem, ctx->Atoms+i, &symmetric ) ;
       if( verbose > 2 ) printf( "        new coordinates are: (%g,%g,%g)\n",
 				symmetric.x[0], symmetric.x[1], symmetric.x[2] ) ;
       best_j        = i ;
       best_distance = 2*TolerancePrimary ;/* Performance value we'll reject */
-      for( j = 0 ; j < AtomsCount ; j++ ){
-	if( Atoms[j].type != symmetric.type || atom_used[j] )
+      for( j = 0 ; j < ctx->AtomsCount ; j++ ){
+	if( ctx->Atoms[j].type != symmetric.type || atom_used[j] )
 	  continue ;
 	for( k = 0, distance = 0 ; k < DIMENSION ; k++ ){
-	  distance += pow2( symmetric.x[k] - Atoms[j].x[k] ) ;
+	  distance += pow2( symmetric.x[k] - ctx->Atoms[j].x[k] ) ;
 	}
 	distance = sqrt( distance ) ;
 	if( verbose > 2 ) printf( "        distance to %d is %g\n", j, distance ) ;
@@ -252,12 +265,12 @@ establish_pairs( SYMMETRY_ELEMENT *elem )
 }
 
 int
-check_transform_order( SYMMETRY_ELEMENT *elem )
+check_transform_order( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem )
 {
   int             i, j, k ;
   void            rotate_reflect_atom( SYMMETRY_ELEMENT *, ATOM *, ATOM *) ;
 
-  for( i = 0 ; i < AtomsCount ; i++ ){
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
     if( elem->transform[i] == i )   /* Identity transform is Ok for any order */
       continue ;
     if( elem->transform_atom == rotate_reflect_atom ){
@@ -289,21 +302,21 @@ check_transform_order( SYMMETRY_ELEMENT *elem )
 }
 
 int
-same_transform( SYMMETRY_ELEMENT *a, SYMMETRY_ELEMENT *b )
+same_transform( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *a, SYMMETRY_ELEMENT *b )
 {
   int               i, j ;
   int               code ;
 
   if( ( a->order != b->order ) || ( a->nparam != b->nparam ) || ( a->transform_atom != b->transform_atom ) )
     return 0 ;
-  for( i = 0, code = 1 ; i < AtomsCount ; i++ ){
+  for( i = 0, code = 1 ; i < ctx->AtomsCount ; i++ ){
     if( a->transform[i] != b->transform[i] ){
       code = 0 ;
       break ;
     }
   }
   if( code == 0 && a->order > 2 ){  /* b can also be a reverse transformation for a */
-    for( i = 0 ; i < AtomsCount ; i++ ){
+    for( i = 0 ; i < ctx->AtomsCount ; i++ ){
       j = a->transform[i] ;
       if( b->transform[j] != i )
 	return 0 ;
@@ -314,7 +327,7 @@ same_transform( SYMMETRY_ELEMENT *a, SYMMETRY_ELEMENT *b )
 }
 
 SYMMETRY_ELEMENT *
-alloc_symmetry_element( void )
+alloc_symmetry_element( SYMMETRY_CONTEXT *ctx )
 {
   SYMMETRY_ELEMENT * elem = calloc( 1, sizeof( SYMMETRY_ELEMENT ) ) ;
   int                i ;
@@ -323,13 +336,13 @@ alloc_symmetry_element( void )
     fprintf( stderr, "Out of memory allocating symmetry element\n" ) ;
     exit( EXIT_FAILURE ) ;
   }
-  elem->transform = calloc( AtomsCount, sizeof( int ) ) ;
+  elem->transform = calloc( ctx->AtomsCount, sizeof( int ) ) ;
   if( elem->transform == NULL ){
     fprintf( stderr, "Out of memory allocating transform table for symmetry element\n" ) ;
     exit( EXIT_FAILURE ) ;
   }
-  for( i = 0 ; i < AtomsCount ; i++ ){
-    elem->transform[i] = AtomsCount + 1 ; /* An impossible value */
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
+    elem->transform[i] = ctx->AtomsCount + 1 ; /* An impossible value */
   }
   return elem ;
 }
@@ -345,17 +358,17 @@ destroy_symmetry_element( SYMMETRY_ELEMENT *elem )
 }
 
 int
-check_transform_quality( SYMMETRY_ELEMENT *elem )
+check_transform_quality( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem )
 {
   int               i, j, k ;
   ATOM              symmetric ;
   double            r, max_r ;
 
-  for( i = 0, max_r = 0 ; i < AtomsCount ; i++ ){
+  for( i = 0, max_r = 0 ; i < ctx->AtomsCount ; i++ ){
     j = elem->transform[i] ;
-    elem->transform_atom( elem, Atoms + i, &symmetric ) ;
+    elem->transform_atom( elem, ctx->Atoms + i, &symmetric ) ;
     for( k = 0, r = 0 ; k < DIMENSION ; k++ ){
-      r += pow2( symmetric.x[k] - Atoms[j].x[k] ) ;
+      r += pow2( symmetric.x[k] - ctx->Atoms[j].x[k] ) ;
     }
     r = sqrt( r ) ;
     if( r > ToleranceFinal ){
@@ -369,7 +382,7 @@ check_transform_quality( SYMMETRY_ELEMENT *elem )
 }
 
 double
-eval_optimization_target_function( SYMMETRY_ELEMENT *elem, int *finish )
+eval_optimization_target_function( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem, int *finish )
 {
   int               i, j, k ;
   ATOM              symmetric ;
@@ -407,11 +420,11 @@ eval_optimization_target_function( SYMMETRY_ELEMENT *elem, int *finish )
       elem->direction[k] /= r ;
     }
   }
-  for( i = 0, target = maxr = 0 ; i < AtomsCount ; i++ ){
-    elem->transform_atom( elem, Atoms + i, &symmetric ) ;
+  for( i = 0, target = maxr = 0 ; i < ctx->AtomsCount ; i++ ){
+    elem->transform_atom( elem, ctx->Atoms + i, &symmetric ) ;
     j = elem->transform[i] ;
     for( k = 0, r = 0 ; k < DIMENSION ; k++ ){
-      r += pow2( Atoms[j].x[k] - symmetric.x[k] ) ;
+      r += pow2( ctx->Atoms[j].x[k] - symmetric.x[k] ) ;
     }
     if( r > maxr ) maxr = r ;
     target += r ;
@@ -437,7 +450,7 @@ set_params( SYMMETRY_ELEMENT *elem, double values[] )
 }
 
 void
-optimize_transformation_params( SYMMETRY_ELEMENT *elem )
+optimize_transformation_params( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem )
 {
   double            values[ MAXPARAM ] ;
   double            grad  [ MAXPARAM ] ;
@@ -457,7 +470,7 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
   f = 0 ;
   do {
     fold = f ;
-    f    = eval_optimization_target_function( elem, &finish ) ;
+    f    = eval_optimization_target_function( ctx, elem, &finish ) ;
     /* Evaluate function, gradient and diagonal force constants */
     if( verbose > 1 ) printf( "            function value = %g\n", f ) ;
     if( finish ){
@@ -477,10 +490,10 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
     for( i = 0 ; i < vars ; i++ ){
       values[i] -= GradientStep ;
       set_params( elem, values ) ;
-      fdn        = eval_optimization_target_function( elem, NULL ) ;
+      fdn        = eval_optimization_target_function( ctx, elem, NULL ) ;
       values[i] += 2*GradientStep ;
       set_params( elem, values ) ;
-      fup        = eval_optimization_target_function( elem, NULL ) ;
+      fup        = eval_optimization_target_function( ctx, elem, NULL ) ;
       values[i] -= GradientStep ;
       grad[i]    = ( fup - fdn ) / ( 2 * GradientStep ) ;
       force[i]   = ( fup + fdn - 2*f ) / ( GradientStep * GradientStep ) ;
@@ -505,7 +518,7 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
 	values[i] += step[i] ;
       }
       set_params( elem, values ) ;
-      fnew = eval_optimization_target_function( elem, NULL ) ;
+      fnew = eval_optimization_target_function( ctx, elem, NULL ) ;
       if( fnew < f )
 	break ;
       for( i = 0 ; i < vars ; i++ ){
@@ -519,7 +532,7 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
       for( i = 0 ; i < vars ; i++ )
 	values[i] += step[i] ;
       set_params( elem, values ) ;
-      fnew2 = eval_optimization_target_function( elem, NULL ) ;
+      fnew2 = eval_optimization_target_function( ctx, elem, NULL ) ;
       if( verbose > 1 ) printf( "        interpolation base points: %g, %g, %g\n", f, fnew, fnew2 ) ;
       for( i = 0 ; i < vars ; i++ )
 	values[i] -= 2*step[i] ;
@@ -548,8 +561,8 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
       set_params( elem, values ) ;
     }
   } while( snorm > MinOptStep && ++cycle < MaxOptCycles ) ;
-  f = eval_optimization_target_function( elem, NULL ) ;
-  if( cycle >= MaxOptCycles ) BadOptimization = 1 ;
+  f = eval_optimization_target_function( ctx, elem, NULL ) ;
+  if( cycle >= MaxOptCycles ) ctx->BadOptimization = 1 ;
   if( verbose > 0 ) {
     if( cycle >= MaxOptCycles )
       printf( "        maximum number of optimization cycles made\n" ) ;
@@ -558,56 +571,56 @@ optimize_transformation_params( SYMMETRY_ELEMENT *elem )
 }
 
 int
-refine_symmetry_element( SYMMETRY_ELEMENT *elem, int build_table )
+refine_symmetry_element( SYMMETRY_CONTEXT *ctx, SYMMETRY_ELEMENT *elem, int build_table )
 {
   int               i ;
 
 
-  if( build_table && (establish_pairs( elem ) < 0) ){
-    StatPairs++ ;
+  if( build_table && (establish_pairs( ctx, elem ) < 0) ){
+    ctx->StatPairs++ ;
     if( verbose > 0 ) printf( "        no transformation correspondence table can be constructed\n" ) ;
     return -1 ;
   }
-  for( i = 0 ; i < PlanesCount ; i++ ){
-    if( same_transform( Planes[i], elem ) ){
-      StatDups++ ;
+  for( i = 0 ; i < ctx->PlanesCount ; i++ ){
+    if( same_transform( ctx, ctx->Planes[i], elem ) ){
+      ctx->StatDups++ ;
       if( verbose > 0 ) printf( "        transformation is identical to plane %d\n", i ) ;
       return -1 ;
     }
   }
-  for( i = 0 ; i < InversionCentersCount ; i++ ){
-    if( same_transform( InversionCenters[i], elem ) ){
-      StatDups++ ;
+  for( i = 0 ; i < ctx->InversionCentersCount ; i++ ){
+    if( same_transform( ctx, ctx->InversionCenters[i], elem ) ){
+      ctx->StatDups++ ;
       if( verbose > 0 ) printf( "        transformation is identical to inversion center %d\n", i ) ;
       return -1 ;
     }
   }
-  for( i = 0 ; i < NormalAxesCount ; i++ ){
-    if( same_transform( NormalAxes[i], elem ) ){
-      StatDups++ ;
+  for( i = 0 ; i < ctx->NormalAxesCount ; i++ ){
+    if( same_transform( ctx, ctx->NormalAxes[i], elem ) ){
+      ctx->StatDups++ ;
       if( verbose > 0 ) printf( "        transformation is identical to normal axis %d\n", i ) ;
       return -1 ;
     }
   }
-  for( i = 0 ; i < ImproperAxesCount ; i++ ){
-    if( same_transform( ImproperAxes[i], elem ) ){
-      StatDups++ ;
+  for( i = 0 ; i < ctx->ImproperAxesCount ; i++ ){
+    if( same_transform( ctx, ctx->ImproperAxes[i], elem ) ){
+      ctx->StatDups++ ;
       if( verbose > 0 ) printf( "        transformation is identical to improper axis %d\n", i ) ;
       return -1 ;
     }
   }
-  if( check_transform_order( elem ) < 0 ){
-    StatOrder++ ;
+  if( check_transform_order( ctx, elem ) < 0 ){
+    ctx->StatOrder++ ;
     if( verbose > 0 ) printf( "        incorrect transformation order\n" ) ;
     return -1 ;
   }
-  optimize_transformation_params( elem ) ;
-  if( check_transform_quality( elem ) < 0 ){
-    StatOpt++ ;
+  optimize_transformation_params( ctx, elem ) ;
+  if( check_transform_quality( ctx, elem ) < 0 ){
+    ctx->StatOpt++ ;
     if( verbose > 0 ) printf( "        refined transformation does not pass the numeric threshold\n" ) ;
     return -1 ;
   }
-  StatAccept++ ;
+  ctx->StatAccept++ ;
   return 0 ;
 }
 
@@ -631,20 +644,20 @@ mirror_atom( SYMMETRY_ELEMENT *plane, ATOM *from, ATOM *to )
 }
 
 SYMMETRY_ELEMENT *
-init_mirror_plane( int i, int j )
+init_mirror_plane( SYMMETRY_CONTEXT *ctx, int i, int j )
 {
-  SYMMETRY_ELEMENT * plane = alloc_symmetry_element() ;
+  SYMMETRY_ELEMENT * plane = alloc_symmetry_element( ctx ) ;
   double             dx[ DIMENSION ], midpoint[ DIMENSION ], rab, r ;
   int                k ;
 
   if( verbose > 0 ) printf( "Trying mirror plane for atoms %d,%d\n", i, j ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   plane->transform_atom = mirror_atom ;
   plane->order          = 2 ;
   plane->nparam         = 4 ;
   for( k = 0, rab = 0 ; k < DIMENSION ; k++ ){
-    dx[k]       = Atoms[i].x[k] - Atoms[j].x[k] ;
-    midpoint[k] = ( Atoms[i].x[k] + Atoms[j].x[k] ) / 2.0 ;
+    dx[k]       = ctx->Atoms[i].x[k] - ctx->Atoms[j].x[k] ;
+    midpoint[k] = ( ctx->Atoms[i].x[k] + ctx->Atoms[j].x[k] ) / 2.0 ;
     rab        += dx[k]*dx[k] ;
   }
   rab = sqrt(rab) ;
@@ -664,7 +677,7 @@ init_mirror_plane( int i, int j )
   }
   plane->distance = r ;
   if( verbose > 0 ) printf( "    initial plane is at %g from the origin\n", r ) ;
-  if( refine_symmetry_element( plane, 1 ) < 0 ){
+  if( refine_symmetry_element( ctx, plane, 1 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the plane\n" ) ;
     destroy_symmetry_element( plane ) ;
     return NULL ;
@@ -673,9 +686,9 @@ init_mirror_plane( int i, int j )
 }
 
 SYMMETRY_ELEMENT *
-init_ultimate_plane( void )
+init_ultimate_plane( SYMMETRY_CONTEXT *ctx )
 {
-  SYMMETRY_ELEMENT * plane = alloc_symmetry_element() ;
+  SYMMETRY_ELEMENT * plane = alloc_symmetry_element( ctx ) ;
   double             d0[ DIMENSION ], d1[ DIMENSION ], d2[ DIMENSION ] ;
   double             p[ DIMENSION ] ;
   double             r, s0, s1, s2 ;
@@ -683,17 +696,17 @@ init_ultimate_plane( void )
   int                i, j, k ;
 
   if( verbose > 0 ) printf( "Trying whole-molecule mirror plane\n" ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   plane->transform_atom = mirror_atom ;
   plane->order          = 1 ;
   plane->nparam         = 4 ;
   for( k = 0 ; k < DIMENSION ; k++ )
     d0[k] = d1[k] = d2[k] = 0 ;
   d0[0] = 1 ; d1[1] = 1 ; d2[2] = 1 ;
-  for( i = 1 ; i < AtomsCount ; i++ ){
+  for( i = 1 ; i < ctx->AtomsCount ; i++ ){
     for( j = 0 ; j < i ; j++ ){
       for( k = 0, r = 0 ; k < DIMENSION ; k++ ){
-	p[k] = Atoms[i].x[k] - Atoms[j].x[k] ;
+	p[k] = ctx->Atoms[i].x[k] - ctx->Atoms[j].x[k] ;
 	r   += p[k]*p[k] ;
       }
       r = sqrt(r) ;
@@ -736,11 +749,11 @@ init_ultimate_plane( void )
     plane->normal[0] = 1 ;
   }
   for( k = 0, r = 0 ; k < DIMENSION ; k++ )
-    r += CenterOfSomething[k]*plane->normal[k] ;
+    r += ctx->CenterOfSomething[k]*plane->normal[k] ;
   plane->distance = r ;
-  for( k = 0 ; k < AtomsCount ; k++ )
+  for( k = 0 ; k < ctx->AtomsCount ; k++ )
     plane->transform[k] = k ;
-  if( refine_symmetry_element( plane, 0 ) < 0 ){
+  if( refine_symmetry_element( ctx, plane, 0 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the plane\n" ) ;
     destroy_symmetry_element( plane ) ;
     return NULL ;
@@ -762,23 +775,23 @@ invert_atom( SYMMETRY_ELEMENT *center, ATOM *from, ATOM *to )
 }
 
 SYMMETRY_ELEMENT *
-init_inversion_center( void )
+init_inversion_center( SYMMETRY_CONTEXT *ctx )
 {
-  SYMMETRY_ELEMENT * center = alloc_symmetry_element() ;
+  SYMMETRY_ELEMENT * center = alloc_symmetry_element( ctx ) ;
   int                k ;
   double             r ;
 
   if( verbose > 0 ) printf( "Trying inversion center at the center of something\n" ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   center->transform_atom = invert_atom ;
   center->order          = 2 ;
   center->nparam         = 4 ;
   for( k = 0, r = 0 ; k < DIMENSION ; k++ )
-    r += CenterOfSomething[k]*CenterOfSomething[k] ;
+    r += ctx->CenterOfSomething[k]*ctx->CenterOfSomething[k] ;
   r = sqrt(r) ;
   if( r > 0 ){
     for( k = 0 ; k < DIMENSION ; k++ )
-      center->normal[k] = CenterOfSomething[k]/r ;
+      center->normal[k] = ctx->CenterOfSomething[k]/r ;
   }
   else {
     center->normal[0] = 1 ;
@@ -787,7 +800,7 @@ init_inversion_center( void )
   }
   center->distance = r ;
   if( verbose > 0 ) printf( "    initial inversion center is at %g from the origin\n", r ) ;
-  if( refine_symmetry_element( center, 1 ) < 0 ){
+  if( refine_symmetry_element( ctx, center, 1 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the inversion center\n" ) ;
     destroy_symmetry_element( center ) ;
     return NULL ;
@@ -831,23 +844,23 @@ rotate_atom( SYMMETRY_ELEMENT *axis, ATOM *from, ATOM *to )
 }
 
 SYMMETRY_ELEMENT *
-init_ultimate_axis(void)
+init_ultimate_axis( SYMMETRY_CONTEXT *ctx )
 {
-  SYMMETRY_ELEMENT * axis = alloc_symmetry_element() ;
+  SYMMETRY_ELEMENT * axis = alloc_symmetry_element( ctx ) ;
   double             dir[ DIMENSION ], rel[ DIMENSION ] ;
   double             s ;
   int                i, k ;
 
   if( verbose > 0 ) printf( "Trying infinity axis\n" ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   axis->transform_atom = rotate_atom ;
   axis->order          = 0 ;
   axis->nparam         = 7 ;
   for( k = 0 ; k < DIMENSION ; k++ )
     dir[k] = 0 ;
-  for( i = 0 ; i < AtomsCount ; i++ ){
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
     for( k = 0, s = 0 ; k < DIMENSION ; k++ ){
-      rel[k] = Atoms[i].x[k] - CenterOfSomething[k] ;
+      rel[k] = ctx->Atoms[i].x[k] - ctx->CenterOfSomething[k] ;
       s     += rel[k]*dir[k] ;
     }
     if( s >= 0 )
@@ -866,20 +879,20 @@ init_ultimate_axis(void)
   for( k = 0 ; k < DIMENSION ; k++ )
     axis->direction[k] = dir[k] ;
   for( k = 0, s = 0 ; k < DIMENSION ; k++ )
-    s += pow2( CenterOfSomething[k] ) ;
+    s += pow2( ctx->CenterOfSomething[k] ) ;
   s = sqrt(s) ;
   if( s > 0 )
     for( k = 0 ; k < DIMENSION ; k++ )
-      axis->normal[k] = CenterOfSomething[k]/s ;
+      axis->normal[k] = ctx->CenterOfSomething[k]/s ;
   else {
     for( k = 1 ; k < DIMENSION ; k++ )
       axis->normal[k] = 0 ;
     axis->normal[0] = 1 ;
   }
   axis->distance = s ;
-  for( k = 0 ; k < AtomsCount ; k++ )
+  for( k = 0 ; k < ctx->AtomsCount ; k++ )
     axis->transform[k] = k ;
-  if( refine_symmetry_element( axis, 0 ) < 0 ){
+  if( refine_symmetry_element( ctx, axis, 0 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the infinity axis\n" ) ;
     destroy_symmetry_element( axis ) ;
     return NULL ;
@@ -889,7 +902,7 @@ init_ultimate_axis(void)
 
 
 SYMMETRY_ELEMENT *
-init_c2_axis( int i, int j, double support[ DIMENSION ] )
+init_c2_axis( SYMMETRY_CONTEXT *ctx, int i, int j, double support[ DIMENSION ] )
 {
   SYMMETRY_ELEMENT * axis ;
   int                k ;
@@ -899,29 +912,29 @@ init_c2_axis( int i, int j, double support[ DIMENSION ] )
   if( verbose > 0 )
     printf( "Trying c2 axis for the pair (%d,%d) with the support (%g,%g,%g)\n",
 	    i, j, support[0], support[1], support[2] ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   /* First, do a quick sanity check */
   for( k = 0, ris = rjs = 0 ; k < DIMENSION ; k++ ){
-    ris += pow2( Atoms[i].x[k] - support[k] ) ;
-    rjs += pow2( Atoms[j].x[k] - support[k] ) ;
+    ris += pow2( ctx->Atoms[i].x[k] - support[k] ) ;
+    rjs += pow2( ctx->Atoms[j].x[k] - support[k] ) ;
   }
   ris = sqrt( ris ) ;
   rjs = sqrt( rjs ) ;
   if( fabs( ris - rjs ) > TolerancePrimary ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    Support can't actually define a rotation axis\n" ) ;
     return NULL ;
   }
-  axis                 = alloc_symmetry_element() ;
+  axis                 = alloc_symmetry_element( ctx ) ;
   axis->transform_atom = rotate_atom ;
   axis->order          = 2 ;
   axis->nparam         = 7 ;
   for( k = 0, r = 0 ; k < DIMENSION ; k++ )
-    r += CenterOfSomething[k]*CenterOfSomething[k] ;
+    r += ctx->CenterOfSomething[k]*ctx->CenterOfSomething[k] ;
   r = sqrt(r) ;
   if( r > 0 ){
     for( k = 0 ; k < DIMENSION ; k++ )
-      axis->normal[k] = CenterOfSomething[k]/r ;
+      axis->normal[k] = ctx->CenterOfSomething[k]/r ;
   }
   else {
     axis->normal[0] = 1 ;
@@ -930,20 +943,20 @@ init_c2_axis( int i, int j, double support[ DIMENSION ] )
   }
   axis->distance = r ;
   for( k = 0, r = 0 ; k < DIMENSION ; k++ ){
-    center[k] = ( Atoms[i].x[k] + Atoms[j].x[k] ) / 2 - support[k] ;
+    center[k] = ( ctx->Atoms[i].x[k] + ctx->Atoms[j].x[k] ) / 2 - support[k] ;
     r        += center[k]*center[k] ;
   }
   r = sqrt(r) ;
   if( r <= TolerancePrimary ){ /* c2 is underdefined, let's do something special */
-    if( MolecularPlane != NULL ){
+    if( ctx->MolecularPlane != NULL ){
       if( verbose > 0 ) printf( "    c2 is underdefined, but there is a molecular plane\n" ) ;
       for( k = 0 ; k < DIMENSION ; k++ )
-	axis->direction[k] = MolecularPlane->normal[k] ;
+	axis->direction[k] = ctx->MolecularPlane->normal[k] ;
     }
     else {
       if( verbose > 0 ) printf( "    c2 is underdefined, trying random direction\n" ) ;
       for( k = 0 ; k < DIMENSION ; k++ )
-	center[k] = Atoms[i].x[k] - Atoms[j].x[k] ;
+	center[k] = ctx->Atoms[i].x[k] - ctx->Atoms[j].x[k] ;
       if( fabs( center[2] ) + fabs( center[1] ) > ToleranceSame ){
 	axis->direction[0] =  0 ;
 	axis->direction[1] =  center[2] ;
@@ -965,7 +978,7 @@ init_c2_axis( int i, int j, double support[ DIMENSION ] )
     for( k = 0 ; k < DIMENSION ; k++ )
       axis->direction[k] = center[k]/r ;
   }
-  if( refine_symmetry_element( axis, 1 ) < 0 ){
+  if( refine_symmetry_element( ctx, axis, 1 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the c2 axis\n" ) ;
     destroy_symmetry_element( axis ) ;
     return NULL ;
@@ -974,7 +987,7 @@ init_c2_axis( int i, int j, double support[ DIMENSION ] )
 }
 
 SYMMETRY_ELEMENT *
-init_axis_parameters( double a[3], double b[3], double c[3] )
+init_axis_parameters( SYMMETRY_CONTEXT *ctx, double a[3], double b[3], double c[3] )
 {
   SYMMETRY_ELEMENT * axis ;
   int                i, order, sign ;
@@ -989,7 +1002,7 @@ init_axis_parameters( double a[3], double b[3], double c[3] )
   }
   ra = sqrt(ra) ; rb  = sqrt(rb) ; rc  = sqrt(rc) ;
   if( fabs( ra - rb ) > TolerancePrimary || fabs( ra - rc ) > TolerancePrimary || fabs( rb - rc ) > TolerancePrimary ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    points are not on a sphere\n" ) ;
     return NULL ;
   }
@@ -1002,12 +1015,12 @@ init_axis_parameters( double a[3], double b[3], double c[3] )
   rac = sqrt(rac) ;
   rbc = sqrt(rbc) ;
   if( fabs( rab - rbc ) > TolerancePrimary ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    points can't be rotation-equivalent\n" ) ;
     return NULL ;
   }
   if( rab <= ToleranceSame || rbc <= ToleranceSame || rac <= ToleranceSame ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    rotation is underdefined by these points\n" ) ;
     return NULL ;
   }
@@ -1015,25 +1028,25 @@ init_axis_parameters( double a[3], double b[3], double c[3] )
   angle = M_PI - 2*asin( rac/(2*rab) ) ;
   if( verbose > 1 ) printf( "    rotation angle is %f\n", angle ) ;
   if( fabs(angle) <= M_PI/(MaxAxisOrder+1) ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    atoms are too close to a straight line\n" ) ;
     return NULL ;
   }
   order = floor( (2*M_PI)/angle + 0.5 ) ;
   if( order <= 2 || order > MaxAxisOrder ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    rotation axis order (%d) is not from 3 to %d\n", order, MaxAxisOrder ) ;
     return NULL ;
   }
-  axis = alloc_symmetry_element() ;
+  axis = alloc_symmetry_element( ctx ) ;
   axis->order          = order ;
   axis->nparam         = 7 ;
   for( i = 0, r = 0 ; i < DIMENSION ; i++ )
-    r += CenterOfSomething[i]*CenterOfSomething[i] ;
+    r += ctx->CenterOfSomething[i]*ctx->CenterOfSomething[i] ;
   r = sqrt(r) ;
   if( r > 0 ){
     for( i = 0 ; i < DIMENSION ; i++ )
-      axis->normal[i] = CenterOfSomething[i]/r ;
+      axis->normal[i] = ctx->CenterOfSomething[i]/r ;
   }
   else {
     axis->normal[0] = 1 ;
@@ -1074,26 +1087,26 @@ init_axis_parameters( double a[3], double b[3], double c[3] )
 }
 
 SYMMETRY_ELEMENT *
-init_higher_axis( int ia, int ib, int ic )
+init_higher_axis( SYMMETRY_CONTEXT *ctx, int ia, int ib, int ic )
 {
   SYMMETRY_ELEMENT * axis ;
   double             a[ DIMENSION ], b[ DIMENSION ], c[ DIMENSION ] ;
   int                i ;
 
   if( verbose > 0 ) printf( "Trying cn axis for the triplet (%d,%d,%d)\n", ia, ib, ic ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   /* Do a quick check of geometry validity */
   for( i = 0 ; i < DIMENSION ; i++ ){
-    a[i] = Atoms[ia].x[i] - CenterOfSomething[i] ;
-    b[i] = Atoms[ib].x[i] - CenterOfSomething[i] ;
-    c[i] = Atoms[ic].x[i] - CenterOfSomething[i] ;
+    a[i] = ctx->Atoms[ia].x[i] - ctx->CenterOfSomething[i] ;
+    b[i] = ctx->Atoms[ib].x[i] - ctx->CenterOfSomething[i] ;
+    c[i] = ctx->Atoms[ic].x[i] - ctx->CenterOfSomething[i] ;
   }
-  if( ( axis = init_axis_parameters( a, b, c ) ) == NULL ){
+  if( ( axis = init_axis_parameters( ctx, a, b, c ) ) == NULL ){
     if( verbose > 0 ) printf( "    no coherrent axis is defined by the points\n" ) ;
     return NULL ;
   }
   axis->transform_atom = rotate_atom ;
-  if( refine_symmetry_element( axis, 1 ) < 0 ){
+  if( refine_symmetry_element( ctx, axis, 1 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the c%d axis\n", axis->order ) ;
     destroy_symmetry_element( axis ) ;
     return NULL ;
@@ -1139,7 +1152,7 @@ rotate_reflect_atom( SYMMETRY_ELEMENT *axis, ATOM *from, ATOM *to )
 }
 
 SYMMETRY_ELEMENT *
-init_improper_axis( int ia, int ib, int ic )
+init_improper_axis( SYMMETRY_CONTEXT *ctx, int ia, int ib, int ic )
 {
   SYMMETRY_ELEMENT * axis ;
   double             a[ DIMENSION ], b[ DIMENSION ], c[ DIMENSION ] ;
@@ -1148,12 +1161,12 @@ init_improper_axis( int ia, int ib, int ic )
   int                i ;
 
   if( verbose > 0 ) printf( "Trying sn axis for the triplet (%d,%d,%d)\n", ia, ib, ic ) ;
-  StatTotal++ ;
+  ctx->StatTotal++ ;
   /* First, reduce the problem to Cn case */
   for( i = 0 ; i < DIMENSION ; i++ ){
-    a[i] = Atoms[ia].x[i] - CenterOfSomething[i] ;
-    b[i] = Atoms[ib].x[i] - CenterOfSomething[i] ;
-    c[i] = Atoms[ic].x[i] - CenterOfSomething[i] ;
+    a[i] = ctx->Atoms[ia].x[i] - ctx->CenterOfSomething[i] ;
+    b[i] = ctx->Atoms[ib].x[i] - ctx->CenterOfSomething[i] ;
+    c[i] = ctx->Atoms[ic].x[i] - ctx->CenterOfSomething[i] ;
   }
   for( i = 0, r = 0 ; i < DIMENSION ; i++ ){
     centerpoint[i] = a[i] + c[i] + 2*b[i] ;
@@ -1161,7 +1174,7 @@ init_improper_axis( int ia, int ib, int ic )
   }
   r = sqrt(r) ;
   if( r <= ToleranceSame ){
-    StatEarly++ ;
+    ctx->StatEarly++ ;
     if( verbose > 0 ) printf( "    atoms can not define improper axis of the order more than 2\n" ) ;
     return NULL ;
   }
@@ -1172,12 +1185,12 @@ init_improper_axis( int ia, int ib, int ic )
   for( i = 0 ; i < DIMENSION ; i++ )
     b[i] = 2*r*centerpoint[i] - b[i] ;
   /* Do a quick check of geometry validity */
-  if( ( axis = init_axis_parameters( a, b, c ) ) == NULL ){
+  if( ( axis = init_axis_parameters( ctx, a, b, c ) ) == NULL ){
     if( verbose > 0 ) printf( "    no coherrent improper axis is defined by the points\n" ) ;
     return NULL ;
   }
   axis->transform_atom = rotate_reflect_atom ;
-  if( refine_symmetry_element( axis, 1 ) < 0 ){
+  if( refine_symmetry_element( ctx, axis, 1 ) < 0 ){
     if( verbose > 0 ) printf( "    refinement failed for the s%d axis\n", axis->order ) ;
     destroy_symmetry_element( axis ) ;
     return NULL ;
@@ -1190,7 +1203,7 @@ init_improper_axis( int ia, int ib, int ic )
  */
 
 void
-find_center_of_something( void )
+find_center_of_something( SYMMETRY_CONTEXT *ctx )
 {
   int                i, j ;
   double             coord_sum[ DIMENSION ] ;
@@ -1198,95 +1211,95 @@ find_center_of_something( void )
 
   for( j = 0 ; j < DIMENSION ; j++ )
     coord_sum[j] = 0 ;
-  for( i = 0 ; i < AtomsCount ; i++ ){
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
     for( j = 0 ; j < DIMENSION ; j++ )
-      coord_sum[j] += Atoms[i].x[j] ;
+      coord_sum[j] += ctx->Atoms[i].x[j] ;
   }
   for( j = 0 ; j < DIMENSION ; j++ )
-    CenterOfSomething[j] = coord_sum[j]/AtomsCount ;
+    ctx->CenterOfSomething[j] = coord_sum[j]/ctx->AtomsCount ;
   if( verbose > 0 )
     printf( "Center of something is at %15.10f, %15.10f, %15.10f\n",
-	    CenterOfSomething[0], CenterOfSomething[1], CenterOfSomething[2] ) ;
-  DistanceFromCenter = (double *) calloc( AtomsCount, sizeof( double ) ) ;
-  if( DistanceFromCenter == NULL ){
+	    ctx->CenterOfSomething[0], ctx->CenterOfSomething[1], ctx->CenterOfSomething[2] ) ;
+  ctx->DistanceFromCenter = (double *) calloc( ctx->AtomsCount, sizeof( double ) ) ;
+  if( ctx->DistanceFromCenter == NULL ){
     fprintf( stderr, "Unable to allocate array for the distances\n" ) ;
     exit( EXIT_FAILURE ) ;
   }
-  for( i = 0 ; i < AtomsCount ; i++ ){
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
     for( j = 0, r = 0 ; j < DIMENSION ; j++ )
-      r += pow2( Atoms[i].x[j] - CenterOfSomething[j] ) ;
-    DistanceFromCenter[i] = r ;
+      r += pow2( ctx->Atoms[i].x[j] - ctx->CenterOfSomething[j] ) ;
+    ctx->DistanceFromCenter[i] = r ;
   }
 }
 
 void
-find_planes(void)
+find_planes( SYMMETRY_CONTEXT *ctx )
 {
   int                i, j ;
   SYMMETRY_ELEMENT * plane ;
 
-  plane = init_ultimate_plane() ;
+  plane = init_ultimate_plane( ctx ) ;
   if( plane != NULL ){
-    MolecularPlane = plane ;
-    PlanesCount++ ;
-    Planes = (SYMMETRY_ELEMENT **) realloc( Planes, sizeof( SYMMETRY_ELEMENT* ) * PlanesCount ) ;
-    if( Planes == NULL ){
+    ctx->MolecularPlane = plane ;
+    ctx->PlanesCount++ ;
+    ctx->Planes = (SYMMETRY_ELEMENT **) realloc( ctx->Planes, sizeof( SYMMETRY_ELEMENT* ) * ctx->PlanesCount ) ;
+    if( ctx->Planes == NULL ){
       perror( "Out of memory in find_planes" ) ;
       exit( EXIT_FAILURE ) ;
     }
-    Planes[ PlanesCount - 1 ] = plane ;
+    ctx->Planes[ ctx->PlanesCount - 1 ] = plane ;
   }
-  for( i = 1 ; i < AtomsCount ; i++ ){
+  for( i = 1 ; i < ctx->AtomsCount ; i++ ){
     for( j = 0 ; j < i ; j++ ){
-      if( Atoms[i].type != Atoms[j].type )
+      if( ctx->Atoms[i].type != ctx->Atoms[j].type )
 	continue ;
-      if( ( plane = init_mirror_plane( i, j ) ) != NULL ){
-	PlanesCount++ ;
-	Planes = (SYMMETRY_ELEMENT **) realloc( Planes, sizeof( SYMMETRY_ELEMENT* ) * PlanesCount ) ;
-	if( Planes == NULL ){
+      if( ( plane = init_mirror_plane( ctx, i, j ) ) != NULL ){
+	ctx->PlanesCount++ ;
+	ctx->Planes = (SYMMETRY_ELEMENT **) realloc( ctx->Planes, sizeof( SYMMETRY_ELEMENT* ) * ctx->PlanesCount ) ;
+	if( ctx->Planes == NULL ){
 	  perror( "Out of memory in find_planes" ) ;
 	  exit( EXIT_FAILURE ) ;
 	}
-	Planes[ PlanesCount - 1 ] = plane ;
+	ctx->Planes[ ctx->PlanesCount - 1 ] = plane ;
       }
     }
   }
 }
 
 void
-find_inversion_centers(void)
+find_inversion_centers( SYMMETRY_CONTEXT *ctx )
 {
   SYMMETRY_ELEMENT * center ;
 
-  if( ( center = init_inversion_center() ) != NULL ){
-    InversionCenters = (SYMMETRY_ELEMENT **) calloc( 1, sizeof( SYMMETRY_ELEMENT* ) ) ;
-    InversionCenters[0]   = center ;
-    InversionCentersCount = 1 ;
+  if( ( center = init_inversion_center( ctx ) ) != NULL ){
+    ctx->InversionCenters = (SYMMETRY_ELEMENT **) calloc( 1, sizeof( SYMMETRY_ELEMENT* ) ) ;
+    ctx->InversionCenters[0]   = center ;
+    ctx->InversionCentersCount = 1 ;
   }
 }
 
 void
-find_infinity_axis(void)
+find_infinity_axis( SYMMETRY_CONTEXT *ctx )
 {
   SYMMETRY_ELEMENT * axis ;
 
-  if( ( axis = init_ultimate_axis() ) != NULL ){
-    NormalAxesCount++ ;
-    NormalAxes = (SYMMETRY_ELEMENT **) realloc( NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * NormalAxesCount ) ;
-    if( NormalAxes == NULL ){
+  if( ( axis = init_ultimate_axis( ctx ) ) != NULL ){
+    ctx->NormalAxesCount++ ;
+    ctx->NormalAxes = (SYMMETRY_ELEMENT **) realloc( ctx->NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->NormalAxesCount ) ;
+    if( ctx->NormalAxes == NULL ){
       perror( "Out of memory in find_infinity_axes()" ) ;
       exit( EXIT_FAILURE ) ;
     }
-    NormalAxes[ NormalAxesCount - 1 ] = axis ;
+    ctx->NormalAxes[ ctx->NormalAxesCount - 1 ] = axis ;
   }
 }
 
 void
-find_c2_axes(void)
+find_c2_axes( SYMMETRY_CONTEXT *ctx )
 {
   int                i, j, k, l, m ;
   double             center[ DIMENSION ] ;
-  double *           distances = calloc( AtomsCount, sizeof( double ) ) ;
+  double *           distances = calloc( ctx->AtomsCount, sizeof( double ) ) ;
   double             r ;
   SYMMETRY_ELEMENT * axis ;
 
@@ -1294,29 +1307,29 @@ find_c2_axes(void)
     fprintf( stderr, "Out of memory in find_c2_axes()\n" ) ;
     exit( EXIT_FAILURE ) ;
   }
-  for( i = 1 ; i < AtomsCount ; i++ ){
+  for( i = 1 ; i < ctx->AtomsCount ; i++ ){
     for( j = 0 ; j < i ; j++ ){
-      if( Atoms[i].type != Atoms[j].type )
+      if( ctx->Atoms[i].type != ctx->Atoms[j].type )
 	continue ;
-      if( fabs( DistanceFromCenter[i] - DistanceFromCenter[j] ) > TolerancePrimary )
+      if( fabs( ctx->DistanceFromCenter[i] - ctx->DistanceFromCenter[j] ) > TolerancePrimary )
 	continue ; /* A very cheap, but quite effective check */
       /*
        *   First, let's try to get it cheap and use CenterOfSomething
        */
       for( k = 0, r = 0 ; k < DIMENSION ; k++ ){
-	center[k] = ( Atoms[i].x[k] + Atoms[j].x[k] ) / 2 ;
-	r        += pow2( center[k] - CenterOfSomething[k] ) ;
+	center[k] = ( ctx->Atoms[i].x[k] + ctx->Atoms[j].x[k] ) / 2 ;
+	r        += pow2( center[k] - ctx->CenterOfSomething[k] ) ;
       }
       r = sqrt(r) ;
       if( r > 5*TolerancePrimary ){ /* It's Ok to use CenterOfSomething */
-	if( ( axis = init_c2_axis( i, j, CenterOfSomething ) ) != NULL ){
-	  NormalAxesCount++ ;
-	  NormalAxes = (SYMMETRY_ELEMENT **) realloc( NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * NormalAxesCount ) ;
-	  if( NormalAxes == NULL ){
+	if( ( axis = init_c2_axis( ctx, i, j, ctx->CenterOfSomething ) ) != NULL ){
+	  ctx->NormalAxesCount++ ;
+	  ctx->NormalAxes = (SYMMETRY_ELEMENT **) realloc( ctx->NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->NormalAxesCount ) ;
+	  if( ctx->NormalAxes == NULL ){
 	    perror( "Out of memory in find_c2_axes" ) ;
 	    exit( EXIT_FAILURE ) ;
 	  }
-	  NormalAxes[ NormalAxesCount - 1 ] = axis ;
+	  ctx->NormalAxes[ ctx->NormalAxesCount - 1 ] = axis ;
 	}
 	continue ;
       }
@@ -1324,42 +1337,42 @@ find_c2_axes(void)
        *  Now, C2 axis can either pass through an atom, or through the
          *  middle of the other pair.
          */
-      for( k = 0 ; k < AtomsCount ; k++ ){
-	if( ( axis = init_c2_axis( i, j, Atoms[k].x ) ) != NULL ){
-	  NormalAxesCount++ ;
-	  NormalAxes = (SYMMETRY_ELEMENT **) realloc( NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * NormalAxesCount ) ;
-	  if( NormalAxes == NULL ){
+      for( k = 0 ; k < ctx->AtomsCount ; k++ ){
+	if( ( axis = init_c2_axis( ctx, i, j, ctx->Atoms[k].x ) ) != NULL ){
+	  ctx->NormalAxesCount++ ;
+	  ctx->NormalAxes = (SYMMETRY_ELEMENT **) realloc( ctx->NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->NormalAxesCount ) ;
+	  if( ctx->NormalAxes == NULL ){
 	    perror( "Out of memory in find_c2_axes" ) ;
 	    exit( EXIT_FAILURE ) ;
 	  }
-	  NormalAxes[ NormalAxesCount - 1 ] = axis ;
+	  ctx->NormalAxes[ ctx->NormalAxesCount - 1 ] = axis ;
 	}
       }
       /*
        *  Prepare data for an additional pre-screening check
        */
-      for( k = 0 ; k < AtomsCount ; k++ ){
+      for( k = 0 ; k < ctx->AtomsCount ; k++ ){
 	for( l = 0, r = 0 ; l < DIMENSION ; l++ )
-	  r += pow2( Atoms[k].x[l] - center[l] ) ;
+	  r += pow2( ctx->Atoms[k].x[l] - center[l] ) ;
 	distances[k] = sqrt(r) ;
       }
-      for( k = 0 ; k < AtomsCount ; k++ ){
-	for( l = 0 ; l < AtomsCount ; l++ ){
-	  if( Atoms[k].type != Atoms[l].type )
+      for( k = 0 ; k < ctx->AtomsCount ; k++ ){
+	for( l = 0 ; l < ctx->AtomsCount ; l++ ){
+	  if( ctx->Atoms[k].type != ctx->Atoms[l].type )
 	    continue ;
-	  if( fabs( DistanceFromCenter[k] - DistanceFromCenter[l] ) > TolerancePrimary ||
+	  if( fabs( ctx->DistanceFromCenter[k] - ctx->DistanceFromCenter[l] ) > TolerancePrimary ||
 	      fabs( distances[k] - distances[l] ) > TolerancePrimary )
 	    continue ; /* We really need this one to run reasonably fast! */
 	  for( m = 0 ; m < DIMENSION ; m++ )
-	    center[m] = ( Atoms[k].x[m] + Atoms[l].x[m] ) / 2 ;
-	  if( ( axis = init_c2_axis( i, j, center ) ) != NULL ){
-	    NormalAxesCount++ ;
-	    NormalAxes = (SYMMETRY_ELEMENT **) realloc( NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * NormalAxesCount ) ;
-	    if( NormalAxes == NULL ){
+	    center[m] = ( ctx->Atoms[k].x[m] + ctx->Atoms[l].x[m] ) / 2 ;
+	  if( ( axis = init_c2_axis( ctx, i, j, center ) ) != NULL ){
+	    ctx->NormalAxesCount++ ;
+	    ctx->NormalAxes = (SYMMETRY_ELEMENT **) realloc( ctx->NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->NormalAxesCount ) ;
+	    if( ctx->NormalAxes == NULL ){
 	      perror( "Out of memory in find_c2_axes" ) ;
 	      exit( EXIT_FAILURE ) ;
 	    }
-	    NormalAxes[ NormalAxesCount - 1 ] = axis ;
+	    ctx->NormalAxes[ ctx->NormalAxesCount - 1 ] = axis ;
 	  }
 	}
       }
@@ -1369,31 +1382,31 @@ find_c2_axes(void)
 }
 
 void
-find_higher_axes(void)
+find_higher_axes( SYMMETRY_CONTEXT *ctx )
 {
   int                i, j, k ;
   SYMMETRY_ELEMENT * axis ;
 
-  for( i = 0 ; i < AtomsCount ; i++ ){
-    for( j = i + 1 ; j < AtomsCount ; j++ ){
-      if( Atoms[i].type != Atoms[j].type )
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
+    for( j = i + 1 ; j < ctx->AtomsCount ; j++ ){
+      if( ctx->Atoms[i].type != ctx->Atoms[j].type )
 	continue ;
-      if( fabs( DistanceFromCenter[i] - DistanceFromCenter[j] ) > TolerancePrimary )
+      if( fabs( ctx->DistanceFromCenter[i] - ctx->DistanceFromCenter[j] ) > TolerancePrimary )
 	continue ; /* A very cheap, but quite effective check */
-      for( k = 0 ; k < AtomsCount ; k++ ){
-	if( Atoms[i].type != Atoms[k].type )
+      for( k = 0 ; k < ctx->AtomsCount ; k++ ){
+	if( ctx->Atoms[i].type != ctx->Atoms[k].type )
 	  continue ;
-	if( ( fabs( DistanceFromCenter[i] - DistanceFromCenter[k] ) > TolerancePrimary ) ||
-	    ( fabs( DistanceFromCenter[j] - DistanceFromCenter[k] ) > TolerancePrimary ) )
+	if( ( fabs( ctx->DistanceFromCenter[i] - ctx->DistanceFromCenter[k] ) > TolerancePrimary ) ||
+	    ( fabs( ctx->DistanceFromCenter[j] - ctx->DistanceFromCenter[k] ) > TolerancePrimary ) )
 	  continue ;
-	if( ( axis = init_higher_axis( i, j, k ) ) != NULL ){
-	  NormalAxesCount++ ;
-	  NormalAxes = (SYMMETRY_ELEMENT **) realloc( NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * NormalAxesCount ) ;
-	  if( NormalAxes == NULL ){
+	if( ( axis = init_higher_axis( ctx, i, j, k ) ) != NULL ){
+	  ctx->NormalAxesCount++ ;
+	  ctx->NormalAxes = (SYMMETRY_ELEMENT **) realloc( ctx->NormalAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->NormalAxesCount ) ;
+	  if( ctx->NormalAxes == NULL ){
 	    perror( "Out of memory in find_higher_axes" ) ;
 	    exit( EXIT_FAILURE ) ;
 	  }
-	  NormalAxes[ NormalAxesCount - 1 ] = axis ;
+	  ctx->NormalAxes[ ctx->NormalAxesCount - 1 ] = axis ;
 	}
       }
     }
@@ -1401,22 +1414,22 @@ find_higher_axes(void)
 }
 
 void
-find_improper_axes(void)
+find_improper_axes( SYMMETRY_CONTEXT *ctx )
 {
   int                i, j, k ;
   SYMMETRY_ELEMENT * axis ;
 
-  for( i = 0 ; i < AtomsCount ; i++ ){
-    for( j = i + 1 ; j < AtomsCount ; j++ ){
-      for( k = 0 ; k < AtomsCount ; k++ ){
-	if( ( axis = init_improper_axis( i, j, k ) ) != NULL ){
-	  ImproperAxesCount++ ;
-	  ImproperAxes = (SYMMETRY_ELEMENT **) realloc( ImproperAxes, sizeof( SYMMETRY_ELEMENT* ) * ImproperAxesCount ) ;
-	  if( ImproperAxes == NULL ){
+  for( i = 0 ; i < ctx->AtomsCount ; i++ ){
+    for( j = i + 1 ; j < ctx->AtomsCount ; j++ ){
+      for( k = 0 ; k < ctx->AtomsCount ; k++ ){
+	if( ( axis = init_improper_axis( ctx, i, j, k ) ) != NULL ){
+	  ctx->ImproperAxesCount++ ;
+	  ctx->ImproperAxes = (SYMMETRY_ELEMENT **) realloc( ctx->ImproperAxes, sizeof( SYMMETRY_ELEMENT* ) * ctx->ImproperAxesCount ) ;
+	  if( ctx->ImproperAxes == NULL ){
 	    perror( "Out of memory in find_higher_axes" ) ;
 	    exit( EXIT_FAILURE ) ;
 	  }
-	  ImproperAxes[ ImproperAxesCount - 1 ] = axis ;
+	  ctx->ImproperAxes[ ctx->ImproperAxesCount - 1 ] = axis ;
 	}
       }
     }
@@ -1424,91 +1437,91 @@ find_improper_axes(void)
 }
 
 void
-report_planes( void )
+report_planes( SYMMETRY_CONTEXT *ctx )
 {
   int           i ;
 
-  if( PlanesCount == 0 )
+  if( ctx->PlanesCount == 0 )
     printf( "There are no planes of symmetry in the molecule\n" ) ;
   else {
-    if( PlanesCount == 1 )
+    if( ctx->PlanesCount == 1 )
       printf( "There is a plane of symmetry in the molecule\n" ) ;
-    else printf( "There are %d planes of symmetry in the molecule\n", PlanesCount ) ;
+    else printf( "There are %d planes of symmetry in the molecule\n", ctx->PlanesCount ) ;
     printf( "     Residual          Direction of the normal           Distance\n" ) ;
-    for( i = 0 ; i < PlanesCount ; i++ ){
-      printf( "%3d %8.4e ", i, Planes[i]->maxdev ) ;
-      printf( "(%11.8f,%11.8f,%11.8f) ", Planes[i]->normal[0], Planes[i]->normal[1], Planes[i]->normal[2] ) ;
-      printf( "%14.8f\n", Planes[i]->distance ) ;
+    for( i = 0 ; i < ctx->PlanesCount ; i++ ){
+      printf( "%3d %8.4e ", i, ctx->Planes[i]->maxdev ) ;
+      printf( "(%11.8f,%11.8f,%11.8f) ", ctx->Planes[i]->normal[0], ctx->Planes[i]->normal[1], ctx->Planes[i]->normal[2] ) ;
+      printf( "%14.8f\n", ctx->Planes[i]->distance ) ;
     }
   }
 }
 
 void
-report_inversion_centers( void )
+report_inversion_centers( SYMMETRY_CONTEXT *ctx )
 {
-  if( InversionCentersCount == 0 )
+  if( ctx->InversionCentersCount == 0 )
     printf( "There is no inversion center in the molecule\n" ) ;
   else {
     printf( "There in an inversion center in the molecule\n" ) ;
     printf( "     Residual                      Position\n" ) ;
-    printf( "   %8.4e ", InversionCenters[0]->maxdev ) ;
+    printf( "   %8.4e ", ctx->InversionCenters[0]->maxdev ) ;
     printf( "(%14.8f,%14.8f,%14.8f)\n",
-	    InversionCenters[0]->distance * InversionCenters[0]->normal[0],
-	    InversionCenters[0]->distance * InversionCenters[0]->normal[1],
-	    InversionCenters[0]->distance * InversionCenters[0]->normal[2] ) ;
+	    ctx->InversionCenters[0]->distance * ctx->InversionCenters[0]->normal[0],
+	    ctx->InversionCenters[0]->distance * ctx->InversionCenters[0]->normal[1],
+	    ctx->InversionCenters[0]->distance * ctx->InversionCenters[0]->normal[2] ) ;
   }
 }
 
 void
-report_axes( void )
+report_axes( SYMMETRY_CONTEXT *ctx )
 {
   int           i ;
 
-  if( NormalAxesCount == 0 )
+  if( ctx->NormalAxesCount == 0 )
     printf( "There are no normal axes in the molecule\n" ) ;
   else {
-    if( NormalAxesCount == 1 )
+    if( ctx->NormalAxesCount == 1 )
       printf( "There is a normal axis in the molecule\n" ) ;
-    else printf( "There are %d normal axes in the molecule\n", NormalAxesCount ) ;
+    else printf( "There are %d normal axes in the molecule\n", ctx->NormalAxesCount ) ;
     printf( "     Residual  Order         Direction of the axis                         Supporting point\n" ) ;
-    for( i = 0 ; i < NormalAxesCount ; i++ ){
-      printf( "%3d %8.4e ", i, NormalAxes[i]->maxdev ) ;
-      if( NormalAxes[i]->order == 0 )
+    for( i = 0 ; i < ctx->NormalAxesCount ; i++ ){
+      printf( "%3d %8.4e ", i, ctx->NormalAxes[i]->maxdev ) ;
+      if( ctx->NormalAxes[i]->order == 0 )
 	printf( "Inf " ) ;
-      else printf( "%3d ", NormalAxes[i]->order ) ;
+      else printf( "%3d ", ctx->NormalAxes[i]->order ) ;
       printf( "(%11.8f,%11.8f,%11.8f) ",
-	      NormalAxes[i]->direction[0], NormalAxes[i]->direction[1], NormalAxes[i]->direction[2] ) ;
+	      ctx->NormalAxes[i]->direction[0], ctx->NormalAxes[i]->direction[1], ctx->NormalAxes[i]->direction[2] ) ;
       printf( "(%14.8f,%14.8f,%14.8f)\n",
-	      NormalAxes[0]->distance * NormalAxes[0]->normal[0],
-	      NormalAxes[0]->distance * NormalAxes[0]->normal[1],
-	      NormalAxes[0]->distance * NormalAxes[0]->normal[2] ) ;
+	      ctx->NormalAxes[0]->distance * ctx->NormalAxes[0]->normal[0],
+	      ctx->NormalAxes[0]->distance * ctx->NormalAxes[0]->normal[1],
+	      ctx->NormalAxes[0]->distance * ctx->NormalAxes[0]->normal[2] ) ;
     }
   }
 }
 
 void
-report_improper_axes( void )
+report_improper_axes( SYMMETRY_CONTEXT *ctx )
 {
   int           i ;
 
-  if( ImproperAxesCount == 0 )
+  if( ctx->ImproperAxesCount == 0 )
     printf( "There are no improper axes in the molecule\n" ) ;
   else {
-    if( ImproperAxesCount == 1 )
+    if( ctx->ImproperAxesCount == 1 )
       printf( "There is an improper axis in the molecule\n" ) ;
-    else printf( "There are %d improper axes in the molecule\n", ImproperAxesCount ) ;
+    else printf( "There are %d improper axes in the molecule\n", ctx->ImproperAxesCount ) ;
     printf( "     Residual  Order         Direction of the axis                         Supporting point\n" ) ;
-    for( i = 0 ; i < ImproperAxesCount ; i++ ){
-      printf( "%3d %8.4e ", i, ImproperAxes[i]->maxdev ) ;
-      if( ImproperAxes[i]->order == 0 )
+    for( i = 0 ; i < ctx->ImproperAxesCount ; i++ ){
+      printf( "%3d %8.4e ", i, ctx->ImproperAxes[i]->maxdev ) ;
+      if( ctx->ImproperAxes[i]->order == 0 )
 	printf( "Inf " ) ;
-      else printf( "%3d ", ImproperAxes[i]->order ) ;
+      else printf( "%3d ", ctx->ImproperAxes[i]->order ) ;
       printf( "(%11.8f,%11.8f,%11.8f) ",
-	      ImproperAxes[i]->direction[0], ImproperAxes[i]->direction[1], ImproperAxes[i]->direction[2] ) ;
+	      ctx->ImproperAxes[i]->direction[0], ctx->ImproperAxes[i]->direction[1], ctx->ImproperAxes[i]->direction[2] ) ;
       printf( "(%14.8f,%14.8f,%14.8f)\n",
-	      ImproperAxes[0]->distance * ImproperAxes[0]->normal[0],
-	      ImproperAxes[0]->distance * ImproperAxes[0]->normal[1],
-	      ImproperAxes[0]->distance * ImproperAxes[0]->normal[2] ) ;
+	      ctx->ImproperAxes[0]->distance * ctx->ImproperAxes[0]->normal[0],
+	      ctx->ImproperAxes[0]->distance * ctx->ImproperAxes[0]->normal[1],
+	      ctx->ImproperAxes[0]->distance * ctx->ImproperAxes[0]->normal[2] ) ;
     }
   }
 }
@@ -1517,7 +1530,7 @@ report_improper_axes( void )
  *  General symmetry handling
  */
 void
-report_and_reset_counters( void )
+report_and_reset_counters( SYMMETRY_CONTEXT *ctx )
 {
   printf( "  %10ld candidates examined\n"
 	          "  %10ld removed early\n"
@@ -1526,20 +1539,20 @@ report_and_reset_counters( void )
 	          "  %10ld removed because of the wrong transformation order\n"
 	          "  %10ld removed after unsuccessful optimization\n"
 	  "  %10ld accepted\n",
-	  StatTotal, StatEarly, StatPairs, StatDups, StatOrder, StatOpt, StatAccept ) ;
-  StatTotal = StatEarly = StatPairs = StatDups = StatOrder = StatOpt = StatAccept = 0 ;
+	  ctx->StatTotal, ctx->StatEarly, ctx->StatPairs, ctx->StatDups, ctx->StatOrder, ctx->StatOpt, ctx->StatAccept ) ;
+  ctx->StatTotal = ctx->StatEarly = ctx->StatPairs = ctx->StatDups = ctx->StatOrder = ctx->StatOpt = ctx->StatAccept = 0 ;
 }
 
 void
-find_symmetry_elements( void )
+find_symmetry_elements( SYMMETRY_CONTEXT *ctx )
 {
-  find_center_of_something() ;
-  find_inversion_centers() ;
-  find_planes() ;
-  find_infinity_axis() ;
-  find_c2_axes() ;
-  find_higher_axes() ;
-  find_improper_axes() ;
+  find_center_of_something( ctx ) ;
+  find_inversion_centers( ctx ) ;
+  find_planes( ctx ) ;
+  find_infinity_axis( ctx ) ;
+  find_c2_axes( ctx ) ;
+  find_higher_axes( ctx ) ;
+  find_improper_axes( ctx ) ;
 }
 
 int
@@ -1558,81 +1571,82 @@ compare_axes( const void *a, const void *b )
 }
 
 void
-sort_symmetry_elements( void )
+sort_symmetry_elements( SYMMETRY_CONTEXT *ctx )
 {
-  if( PlanesCount > 1 ){
-    qsort( Planes, PlanesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
+  if( ctx->PlanesCount > 1 ){
+    qsort( ctx->Planes, ctx->PlanesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
   }
-  if( NormalAxesCount > 1 ){
-    qsort( NormalAxes, NormalAxesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
+  if( ctx->NormalAxesCount > 1 ){
+    qsort( ctx->NormalAxes, ctx->NormalAxesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
   }
-  if( ImproperAxesCount > 1 ){
-    qsort( ImproperAxes, ImproperAxesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
+  if( ctx->ImproperAxesCount > 1 ){
+    qsort( ctx->ImproperAxes, ctx->ImproperAxesCount, sizeof( SYMMETRY_ELEMENT * ), compare_axes ) ;
   }
 }
 
 void
-report_symmetry_elements_verbose( void )
+report_symmetry_elements_verbose( SYMMETRY_CONTEXT *ctx )
 {
-  report_inversion_centers() ;
-  report_axes() ;
-  report_improper_axes() ;
-  report_planes() ;
+  report_inversion_centers( ctx ) ;
+  report_axes( ctx ) ;
+  report_improper_axes( ctx ) ;
+  report_planes( ctx ) ;
 }
 
 void
-summarize_symmetry_elements( void )
+summarize_symmetry_elements( SYMMETRY_CONTEXT *ctx )
 {
   int          i ;
 
-  NormalAxesCounts   = (int*) calloc( MaxAxisOrder+1, sizeof( int ) ) ;
-  ImproperAxesCounts = (int*) calloc( MaxAxisOrder+1, sizeof( int ) ) ;
-  for( i = 0 ; i < NormalAxesCount ; i++ )
-    NormalAxesCounts[ NormalAxes[i]->order ]++ ;
-  for( i = 0 ; i < ImproperAxesCount ; i++ )
-    ImproperAxesCounts[ ImproperAxes[i]->order ]++ ;
+  ctx->NormalAxesCounts   = (int*) calloc( MaxAxisOrder+1, sizeof( int ) ) ;
+  ctx->ImproperAxesCounts = (int*) calloc( MaxAxisOrder+1, sizeof( int ) ) ;
+  for( i = 0 ; i < ctx->NormalAxesCount ; i++ )
+    ctx->NormalAxesCounts[ ctx->NormalAxes[i]->order ]++ ;
+  for( i = 0 ; i < ctx->ImproperAxesCount ; i++ )
+    ctx->ImproperAxesCounts[ ctx->ImproperAxes[i]->order ]++ ;
 }
 
 void
-report_symmetry_elements_brief( void )
+report_symmetry_elements_brief( SYMMETRY_CONTEXT *ctx )
 {
   int          i ;
-  char *       symmetry_code = calloc( 1, 10*(PlanesCount+NormalAxesCount+ImproperAxesCount+InversionCentersCount+2) ) ;
+  char *       symmetry_code = calloc( 1, 10*(ctx->PlanesCount+ctx->NormalAxesCount+ctx->ImproperAxesCount+ctx->InversionCentersCount+2) ) ;
   char         buf[ 100 ] ;
 
   if( symmetry_code == NULL ){
     exit( EXIT_FAILURE ) ;
   }
-  if( PlanesCount + NormalAxesCount + ImproperAxesCount + InversionCentersCount != 0 ) {
-    if( InversionCentersCount > 0 ) strcat( symmetry_code, "(i) " ) ;
-    if( NormalAxesCounts[0] == 1 )
+  if( ctx->PlanesCount + ctx->NormalAxesCount + ctx->ImproperAxesCount + ctx->InversionCentersCount != 0 ) {
+    if( ctx->InversionCentersCount > 0 ) strcat( symmetry_code, "(i) " ) ;
+    if( ctx->NormalAxesCounts[0] == 1 )
       strcat( symmetry_code, "(Cinf) " ) ;
-    if( NormalAxesCounts[0] >  1 ) {
+    if( ctx->NormalAxesCounts[0] >  1 ) {
+      sprintf( buf, "%d*(Cinf) ", ctx->NormalAxesCounts[0] ) ;
       strcat( symmetry_code, buf ) ;
     }
     for( i = MaxAxisOrder ; i >= 2 ; i-- ){
-      if( NormalAxesCounts[i] == 1 ){ sprintf( buf, "(C%d) ", i ) ; strcat( symmetry_code, buf ) ; }
-      if( NormalAxesCounts[i] >  1 ){ sprintf( buf, "%d*(C%d) ", NormalAxesCounts[i], i ) ; strcat( symmetry_code, buf ) ; }
+      if( ctx->NormalAxesCounts[i] == 1 ){ sprintf( buf, "(C%d) ", i ) ; strcat( symmetry_code, buf ) ; }
+      if( ctx->NormalAxesCounts[i] >  1 ){ sprintf( buf, "%d*(C%d) ", ctx->NormalAxesCounts[i], i ) ; strcat( symmetry_code, buf ) ; }
     }
     for( i = MaxAxisOrder ; i >= 2 ; i-- ){
-      if( ImproperAxesCounts[i] == 1 ){ sprintf( buf, "(S%d) ", i ) ; strcat( symmetry_code, buf ) ; }
-      if( ImproperAxesCounts[i] >  1 ){ sprintf( buf, "%d*(S%d) ", ImproperAxesCounts[i], i ) ; strcat( symmetry_code, buf ) ; }
+      if( ctx->ImproperAxesCounts[i] == 1 ){ sprintf( buf, "(S%d) ", i ) ; strcat( symmetry_code, buf ) ; }
+      if( ctx->ImproperAxesCounts[i] >  1 ){ sprintf( buf, "%d*(S%d) ", ctx->ImproperAxesCounts[i], i ) ; strcat( symmetry_code, buf ) ; }
     }
-    if( PlanesCount == 1 ) strcat( symmetry_code, "(sigma) " ) ;
-    if( PlanesCount >  1 ){ sprintf( buf, "%d*(sigma) ", PlanesCount ) ; strcat( symmetry_code, buf ) ; }
+    if( ctx->PlanesCount == 1 ) strcat( symmetry_code, "(sigma) " ) ;
+    if( ctx->PlanesCount >  1 ){ sprintf( buf, "%d*(sigma) ", ctx->PlanesCount ) ; strcat( symmetry_code, buf ) ; }
   }
-  SymmetryCode = symmetry_code ;
+  ctx->SymmetryCode = symmetry_code ;
 }
 
 void
-identify_point_group( void )
+identify_point_group( SYMMETRY_CONTEXT *ctx )
 {
   int            i ;
   int            last_matching = -1 ;
   int            matching_count = 0 ;
 
   for( i = 0 ; i < PointGroupsCount ; i++ ){
-    if( strcmp( SymmetryCode, PointGroups[i].symmetry_code ) == 0 ){
+    if( strcmp( ctx->SymmetryCode, PointGroups[i].symmetry_code ) == 0 ){
       if( PointGroups[i].check() == 1 ){
 	last_matching = i ;
 	matching_count++ ;
@@ -1649,14 +1663,13 @@ identify_point_group( void )
   }
   if( matching_count >  1 ){
     for( i = 0 ; i < PointGroupsCount ; i++ ){
-      if( ( strcmp( SymmetryCode, PointGroups[i].symmetry_code ) == 0 ) && ( PointGroups[i].check() == 1 ) ){
+      if( ( strcmp( ctx->SymmetryCode, PointGroups[i].symmetry_code ) == 0 ) && ( PointGroups[i].check() == 1 ) ){
 	printf( "    %s\n", PointGroups[i].group_name ) ;
       }
     }
   }
   if( matching_count == 1 ){
-    pgroup = malloc( sizeof(char) * strlen(PointGroups[last_matching].group_name));
-    strcpy(pgroup, PointGroups[last_matching].group_name);
+    strncpy( ctx->pgroup, PointGroups[last_matching].group_name, sizeof( ctx->pgroup ) - 1 ) ;
   }
 }
 
@@ -1665,46 +1678,164 @@ identify_point_group( void )
  */
 
 int
-read_coordinates( char *in )
+read_coordinates( SYMMETRY_CONTEXT *ctx, char *in )
 {
   int i = 0 ;
+  char *save = NULL ;
+
+  char *token = strtok_r(in, "\n", &save) ;
+  if( token == NULL || sscanf( token, "%d", &ctx->AtomsCount) != 1 || ctx->AtomsCount <= 0 )
+    return -1 ;
 
-  char *token = strtok(in, "\n") ;
-  sscanf( token, "%d", &AtomsCount) ;
-  
-  Atoms = calloc( AtomsCount, sizeof( ATOM ) ) ;
-  token = strtok(NULL, "\n") ;
+  ctx->Atoms = calloc( ctx->AtomsCount, sizeof( ATOM ) ) ;
+  if( ctx->Atoms == NULL )
+    return -1 ;
+  token = strtok_r(NULL, "\n", &save) ;
 
-  while (token != NULL)
+  while (token != NULL && i < ctx->AtomsCount)
   {
-    if( sscanf( token, "%d %lg %lg %lg\n", &Atoms[i].type, &Atoms[i].x[0], &Atoms[i].x[1], &Atoms[i].x[2] ) != 4 ){
+    if( sscanf( token, "%d %lg %lg %lg\n", &ctx->Atoms[i].type, &ctx->Atoms[i].x[0], &ctx->Atoms[i].x[1], &ctx->Atoms[i].x[2] ) != 4 ){
       fprintf( stderr, "Error reading description of the atom %d\n", i ) ;
       return -1 ;
     }
     i = i+1;
-    token = strtok(NULL, "\n");
+    token = strtok_r(NULL, "\n", &save);
   }
+  if( i != ctx->AtomsCount )
+    return -1 ;
   return 0 ;
 }
 
-char*
-symmetry( char in[] )
+void
+free_element_list( SYMMETRY_ELEMENT **list, int count )
 {
-  if( read_coordinates( in ) < 0 ){
-    fprintf( stderr, "Error reading in atomic coordinates\n" ) ;
-    exit( EXIT_FAILURE ) ;
-  }
+  int i ;
 
+  if( list == NULL ) return ;
+  for( i = 0 ; i < count ; i++ )
+    destroy_symmetry_element( list[i] ) ;
+  free( list ) ;
+}
 
-  find_symmetry_elements() ;
-  sort_symmetry_elements() ;
-  summarize_symmetry_elements() ;
-  if( BadOptimization )
+void
+free_context( SYMMETRY_CONTEXT *ctx )
+{
+  free_element_list( ctx->Planes, ctx->PlanesCount ) ;
+  free_element_list( ctx->InversionCenters, ctx->InversionCentersCount ) ;
+  free_element_list( ctx->NormalAxes, ctx->NormalAxesCount ) ;
+  free_element_list( ctx->ImproperAxes, ctx->ImproperAxesCount ) ;
+  free( ctx->DistanceFromCenter ) ;
+  free( ctx->Atoms ) ;
+  free( ctx->NormalAxesCounts ) ;
+  free( ctx->ImproperAxesCounts ) ;
+  free( ctx->SymmetryCode ) ;
+}
+
+/*
+ *  Runs the analysis on the atoms already loaded into ctx and writes the
+ *  point group into out. Returns 0 on success and 1 if no unique point
+ *  group was found, in which case out is left empty.
+ */
+int
+analyze_context( SYMMETRY_CONTEXT *ctx, char *out, int outlen )
+{
+  int code ;
+
+  find_symmetry_elements( ctx ) ;
+  sort_symmetry_elements( ctx ) ;
+  summarize_symmetry_elements( ctx ) ;
+  if( ctx->BadOptimization && verbose > 0 )
     printf( "Refinement of some symmetry elements was terminated before convergence was reached.\n"
 	    "Some symmetry elements may remain unidentified.\n" ) ;
-  report_symmetry_elements_brief() ;
-  identify_point_group() ;
-  return pgroup;
+  report_symmetry_elements_brief( ctx ) ;
+  identify_point_group( ctx ) ;
+
+  code = ctx->pgroup[0] == '\0' ? 1 : 0 ;
+  strncpy( out, ctx->pgroup, outlen - 1 ) ;
+  out[ outlen - 1 ] = '\0' ;
+  return code ;
 }
-  
 
+/*
+ *  Reentrant entry point: identifies the point group of the molecule given
+ *  as "N\nZ x y z\n..." text and writes its name into out. Returns 0 on
+ *  success, 1 if no unique point group was found (out is left empty) and
+ *  -1 if the coordinates could not be read. The input is not modified.
+ */
+int
+symmetry_r( const char *in, char *out, int outlen )
+{
+  SYMMETRY_CONTEXT ctx ;
+  char *           text ;
+  int              code ;
+
+  if( out == NULL || outlen <= 0 ) return -1 ;
+  out[0] = '\0' ;
+  memset( &ctx, 0, sizeof( ctx ) ) ;
+  text = malloc( strlen( in ) + 1 ) ;
+  if( text == NULL ) return -1 ;
+  strcpy( text, in ) ;
+  if( read_coordinates( &ctx, text ) < 0 ){
+    free( text ) ;
+    free_context( &ctx ) ;
+    return -1 ;
+  }
+  free( text ) ;
+  code = analyze_context( &ctx, out, outlen ) ;
+  free_context( &ctx ) ;
+  return code ;
+}
+
+/*
+ *  Batch entry point. Molecule m consists of atoms offsets[m] up to
+ *  offsets[m+1], with atomic numbers in atom_nums and Cartesian
+ *  coordinates in coords (three doubles per atom). Its point group is
+ *  written to groups + m*grouplen, empty if none could be assigned.
+ *  Returns the number of molecules with an assigned point group, or -1
+ *  on invalid arguments.
+ */
+int
+symmetry_batch( int nmols, const int *offsets, const int *atom_nums, const double *coords,
+                char *groups, int grouplen )
+{
+  SYMMETRY_CONTEXT ctx ;
+  int              m, i, k ;
+  int              found = 0 ;
+
+  if( nmols < 0 || offsets == NULL || groups == NULL || grouplen <= 0 ) return -1 ;
+  for( m = 0 ; m < nmols ; m++ ){
+    char * out = groups + (size_t) m * grouplen ;
+
+    out[0] = '\0' ;
+    if( offsets[m+1] <= offsets[m] ) continue ;
+    memset( &ctx, 0, sizeof( ctx ) ) ;
+    ctx.AtomsCount = offsets[m+1] - offsets[m] ;
+    ctx.Atoms = calloc( ctx.AtomsCount, sizeof( ATOM ) ) ;
+    if( ctx.Atoms == NULL ) return -1 ;
+    for( i = 0 ; i < ctx.AtomsCount ; i++ ){
+      ctx.Atoms[i].type = atom_nums[ offsets[m] + i ] ;
+      for( k = 0 ; k < DIMENSION ; k++ )
+        ctx.Atoms[i].x[k] = coords[ DIMENSION * (size_t)( offsets[m] + i ) + k ] ;
+    }
+    if( analyze_context( &ctx, out, grouplen ) == 0 )
+      found++ ;
+    free_context( &ctx ) ;
+  }
+  return found ;
+}
+
+/*
+ *  Original entry point, kept for existing callers. The result lives in a
+ *  static buffer, so this one is not safe to call from several threads.
+ */
+char*
+symmetry( char in[] )
+{
+  static char pgroup[ 16 ] ;
+
+  if( symmetry_r( in, pgroup, sizeof( pgroup ) ) < 0 ){
+    fprintf( stderr, "Error reading in atomic coordinates\n" ) ;
+    exit( EXIT_FAILURE ) ;
+  }
+  return pgroup ;
+}
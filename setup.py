@@ -1,5 +1,7 @@
-from setuptools import setup
+from setuptools import Distribution, setup
+from setuptools.command.build_py import build_py
 import io
+import sys
 
 # read the contents of your README file
 from os import path
@@ -7,6 +9,46 @@ this_directory = path.abspath(path.dirname(__file__))
 with io.open(path.join(this_directory, 'README.md'), encoding='utf-8') as f:
     long_description = f.read()
 
+
+class build_symmetry(build_py):
+    """Compiles goodvibes/share/symmetry.c into the point group library GoodVibes loads on this platform."""
+    def run(self):
+        build_py.run(self)
+        from distutils.ccompiler import new_compiler
+        from distutils.errors import CCompilerError, DistutilsError
+        from distutils.sysconfig import customize_compiler
+        if sys.platform.startswith('linux'):
+            name = 'symmetry_linux.so'
+        elif sys.platform.startswith('darwin'):
+            name = 'symmetry_mac.dylib'
+        else:
+            name = 'symmetry_windows.dll'
+        compiler = new_compiler()
+        customize_compiler(compiler)
+        try:
+            objects = compiler.compile([path.join('goodvibes', 'share', 'symmetry.c')], output_dir=self.build_temp)
+            compiler.link_shared_object(objects, path.join(self.build_lib, 'goodvibes', 'share', name),
+                                        libraries=[] if sys.platform.startswith('win') else ['m'],
+                                        export_symbols=['symmetry', 'symmetry_r', 'symmetry_batch'])
+        except (CCompilerError, DistutilsError, OSError) as e:
+            # The library shipped in goodvibes/share is installed instead
+            self.warn("could not compile {} ({}), installing the prebuilt library".format(name, e))
+
+    def initialize_options(self):
+        build_py.initialize_options(self)
+        self.build_temp = None
+
+    def finalize_options(self):
+        build_py.finalize_options(self)
+        self.set_undefined_options('build', ('build_temp', 'build_temp'))
+
+
+class platform_distribution(Distribution):
+    """Wheels hold the compiled library, so they are specific to the platform."""
+    def has_ext_modules(self):
+        return True
+
+
 setup(
   name='goodvibes',
   packages=['goodvibes'],
@@ -21,6 +63,9 @@ setup(
   keywords=['compchem', 'thermochemistry', 'gaussian', 'vibrational-entropies', 'temperature'],
   classifiers=[],
   install_requires=["numpy", ],
-  python_requires='>=2.6',
+  python_requires='>=3.7',
   include_package_data=True,
+  package_data={'goodvibes': ['share/*.c', 'share/*.so', 'share/*.dylib', 'share/*.dll', 'share/*.npz']},
+  cmdclass={'build_py': build_symmetry},
+  distclass=platform_distribution,
 )
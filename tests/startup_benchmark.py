@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Start-up time of the GoodVibes command line.
+
+Runs each command repeatedly in a fresh interpreter (in a temporary folder, so no output is left behind) and prints
+the best and median wall time next to a bare interpreter start. GoodVibes is run once per job in many workflows,
+so `python -m goodvibes file.log` should stay close to the interpreter itself.
+
+Usage: python tests/startup_benchmark.py [-n REPEAT] [output files]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = os.path.normpath(os.path.join(HERE, '..'))
+EXAMPLES = os.path.join(PACKAGE, 'goodvibes', 'examples')
+
+
+def wall_times(args, repeat, cwd, env):
+    """Wall time (s) of each of repeat runs of the interpreter with args."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-W', 'ignore'] + args, cwd=cwd, env=env, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = ArgumentParser(description="Start-up time of the GoodVibes command line")
+    parser.add_argument("-n", dest="repeat", type=int, default=10, help="Runs of each command (default 10)")
+    parser.add_argument("files", nargs='*', default=[os.path.join(EXAMPLES, 'ethane.out')],
+                        help="Output files to evaluate (default the ethane example)")
+    options = parser.parse_args()
+    env = dict(os.environ, PYTHONPATH=PACKAGE + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    files = [os.path.abspath(file) for file in options.files]
+    commands = [('python', ['-c', 'pass']),
+                ('import goodvibes', ['-c', 'import goodvibes']),
+                ('goodvibes -h', ['-m', 'goodvibes', '-h']),
+                ('goodvibes ' + ' '.join(os.path.basename(file) for file in files), ['-m', 'goodvibes'] + files)]
+    with tempfile.TemporaryDirectory() as cwd:
+        # Warm up: byte-compile and fill the file system cache
+        wall_times(commands[-1][1], 1, cwd, env)
+        print('{:<40} {:>10} {:>10}'.format('Command', 'Best (ms)', 'Median (ms)'))
+        for name, args in commands:
+            times = wall_times(args, options.repeat, cwd, env)
+            print('{:<40} {:10.1f} {:10.1f}'.format(name[:40], 1000 * min(times), 1000 * statistics.median(times)))
+
+
+if __name__ == "__main__":
+    main()
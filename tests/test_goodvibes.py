@@ -2,8 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import pytest
 import math
+from types import SimpleNamespace
 from goodvibes import GoodVibes as GV
 from conftest import datapath
 from goodvibes.media import solvents
@@ -320,7 +322,7 @@ def test_pes(E, ZPE, H, TS, TqhS, GT, qhGT):
     precision = 2
     files = ['pes/Int-III_Oax_cis_a.log', 'pes/Int-II_Oax_cis_a.log', 'pes/Int-I_Oax.log', 'pes/TolS.log', 'pes/TolSH.log']
     files = [datapath(file) for file in files]
-    log = GV.Logger("GoodVibes",'test',False)
+    log = GV.Logger("GoodVibes",'test')
 
     bbe_vals = []
     for file in files: # loop over all specified output files and compute thermochemistry
@@ -348,3 +350,891 @@ def test_pes(E, ZPE, H, TS, TqhS, GT, qhGT):
             assert  qhGT[j] == round(formatted_list[6], precision)
     log.finalize()
     
+
+@pytest.mark.parametrize("n, label", [
+    (0, 'A'), (25, 'Z'), (26, 'AA'), (27, 'AB'), (701, 'ZZ'), (702, 'AAA')
+])
+def test_cluster_label(n, label):
+    assert GV.cluster_label(n) == label
+
+@pytest.mark.parametrize("energies, clusters, dups, temp", [
+    ([-100.0, -100.001, -100.0005, -99.999], [[0, 1], [2, 3]], [], 298.15),
+    ([-100.0, -100.001, -100.0005, -99.999], [[0], [1, 2], [3]], [[2, 1]], 298.15),
+    ([-50.0, -50.002, -50.003], [[2, 0], [1]], [], 1000.0)
+])
+def test_boltz_clustering(energies, clusters, dups, temp):
+    files = ['conf_{}.log'.format(i) for i in range(len(energies))]
+    thermo_data = dict((file, SimpleNamespace(qh_gibbs_free_energy=g)) for file, g in zip(files, energies))
+    clusters = [[files[i] for i in cluster] for cluster in clusters]
+    dup_list = [[files[i], files[j]] for i, j in dups]
+    boltz_facs, weighted_free_energy, boltz_sum = GV.get_boltz(files, thermo_data, True, clusters, temp, dup_list)
+
+    duplicates = [dup[0] for dup in dup_list]
+    facs = [0.0 if file in duplicates else math.exp(-(g - min(energies)) * GV.J_TO_AU / GV.GAS_CONSTANT / temp)
+            for file, g in zip(files, energies)]
+    assert sum(facs) == pytest.approx(boltz_sum)
+    for n, cluster in enumerate(clusters):
+        label = 'cluster-' + GV.cluster_label(n)
+        cluster_facs = [facs[files.index(file)] for file in cluster]
+        weighted = sum(f * energies[files.index(file)] for f, file in zip(cluster_facs, cluster))
+        assert sum(cluster_facs) == pytest.approx(boltz_facs[label])
+        assert weighted == pytest.approx(weighted_free_energy[label])
+
+@pytest.mark.parametrize("energies, temp", [
+    ([-100.0, -100.001, -100.0005], 298.15),
+    ([-50.0, -50.002, -50.003, -49.999], 1000.0)
+])
+def test_mc_boltz(energies, temp):
+    populations = GV.mc_boltz(energies, 0.0, temp, 10)
+    nominal = GV.boltz_populations(energies, temp)
+    facs = [math.exp(-(g - min(energies)) * GV.J_TO_AU / GV.GAS_CONSTANT / temp) for g in energies]
+    assert nominal == pytest.approx([f / sum(facs) for f in facs])
+    # Without uncertainty every sample reproduces the nominal populations
+    assert populations.shape == (10, len(energies))
+    for sample in populations:
+        assert sample == pytest.approx(nominal)
+    # Noisy samples remain normalized and are reproducible for a given seed
+    populations = GV.mc_boltz(energies, 1.0, temp, 1000, seed=7, chunk_size=64)
+    assert populations.sum(axis=1) == pytest.approx(1.0)
+    assert populations == pytest.approx(GV.mc_boltz(energies, 1.0, temp, 1000, seed=7))
+    mean, low, high = GV.confidence_interval(populations)
+    assert all(low <= mean) and all(mean <= high)
+
+def test_mc_selectivity():
+    temp = 298.15
+    populations = GV.boltz_populations([[-100.0, -100.001], [-100.001, -100.0]], temp)
+    a_mask, b_mask = GV.np.array([True, False]), GV.np.array([False, True])
+    ee, ddg = GV.mc_selectivity(populations, a_mask, b_mask, temp)
+    assert ee[0] == pytest.approx(-ee[1])
+    assert ddg[1] == pytest.approx(GV.KCAL_TO_AU * 0.001, abs=1e-6)
+    assert ddg[0] == pytest.approx(-ddg[1])
+
+@pytest.mark.parametrize("profile, ts, temp, tdts, tdi, span", [
+    # kcal/mol: resting state, TS1, intermediate, TS2, product
+    ([0.0, 20.0, -5.0, 12.0, -10.0], [False, True, False, True, False], 298.15, 1, 0, 20.0),
+    # TDTS precedes the TDI: the reaction energy enters the span
+    ([0.0, 20.0, -10.0, 5.0, -5.0], [False, True, False, True, False], 298.15, 1, 2, 25.0),
+    # Shorter pathway padded with NaN
+    ([0.0, 12.0, -5.0, 20.0, -8.0, float('nan')], [False, True, False, True, False, False], 400.0, 3, 2, 25.0)
+])
+def test_energetic_span(profile, ts, temp, tdts, tdi, span):
+    g = [[[x / GV.KCAL_TO_AU for x in profile]]]
+    result = GV.energetic_span(g, [ts], [temp])
+    assert result.tdts[0, 0] == tdts
+    assert result.tdi[0, 0] == tdi
+    assert span == pytest.approx(result.span[0, 0] * GV.KCAL_TO_AU)
+
+    valid = [x for x in profile if not math.isnan(x)]
+    dgr, rt = valid[-1] - valid[0], GV.GAS_CONSTANT * temp / GV.J_TO_AU * GV.KCAL_TO_AU
+    terms = {}
+    for i, t_i in enumerate(valid):
+        for j, i_j in enumerate(valid[:-1]):
+            if ts[i] and not ts[j]:
+                terms[i, j] = math.exp((t_i - i_j + (dgr if i < j else 0.0)) / rt)
+    total = sum(terms.values())
+    tof = GV.BOLTZMANN_CONSTANT * temp / GV.PLANCK_CONSTANT * (math.exp(-dgr / rt) - 1) / total
+    assert tof == pytest.approx(result.tof[0, 0])
+    assert sum(v for (i, j), v in terms.items() if i == tdts) / total == pytest.approx(result.x_tof[0, 0, tdts])
+    assert sum(v for (i, j), v in terms.items() if j == tdi) / total == pytest.approx(result.x_tof[0, 0, tdi])
+
+@pytest.mark.parametrize("n, seed", [(50, 0), (200, 1)])
+def test_check_dup(n, seed):
+    rng = GV.np.random.default_rng(seed)
+    thermo_data, files = {}, []
+    for i in range(n):
+        base = int(rng.integers(0, 5))
+        file = 'conf_{}.log'.format(i)
+        files.append(file)
+        # Some structures have a different number of frequencies or rotational constants
+        n_freq = 6 if i % 7 else 3
+        thermo_data[file] = SimpleNamespace(
+            scf_energy=-100.0 - 0.01 * base + rng.normal(0, 3e-5),
+            roconst=[1.0 + base, 2.0, 3.0 + rng.normal(0, 2e-5)][:3 if i % 11 else 2],
+            frequency_wn=list(100.0 * (1 + base) + rng.normal(0, 4.0, n_freq)))
+    reference = []
+    for i, file in enumerate(files):
+        for j in range(0, i):
+            bbe_i, bbe_j = thermo_data[files[i]], thermo_data[files[j]]
+            if abs(bbe_i.scf_energy - bbe_j.scf_energy) >= 1e-4:
+                continue
+            if len(bbe_i.roconst) != len(bbe_j.roconst) or len(bbe_i.frequency_wn) != len(bbe_j.frequency_wn):
+                continue
+            if GV.np.linalg.norm(GV.np.array(bbe_i.roconst) - GV.np.array(bbe_j.roconst)) >= 1e-4:
+                continue
+            freq_diff = [abs(a - b) for a, b in zip(bbe_i.frequency_wn, bbe_j.frequency_wn)]
+            if GV.np.mean(freq_diff) < 10 and GV.np.max(freq_diff) < 10:
+                reference.append([files[i], files[j]])
+    assert len(reference) > 0
+    assert GV.check_dup(files, thermo_data) == reference
+
+
+def random_rotation(rng):
+    q, r = GV.np.linalg.qr(rng.normal(size=(3, 3)))
+    q *= GV.np.sign(GV.np.diag(r))
+    if GV.np.linalg.det(q) < 0:
+        q[:, 0] *= -1
+    return q
+
+
+def test_kabsch():
+    rng = GV.np.random.default_rng(3)
+    coords = rng.normal(size=(4, 12, 3))
+    moved = GV.np.array([c @ random_rotation(rng).T + rng.normal(size=3) for c in coords])
+    assert GV.np.allclose(GV.kabsch(coords, moved)[1], 0.0, atol=1e-6)
+    # Compare with explicit superposition of a distorted copy
+    distorted = moved + rng.normal(0, 0.1, moved.shape)
+    reference = []
+    for a, b in zip(coords, distorted):
+        a, b = a - a.mean(axis=0), b - b.mean(axis=0)
+        u, s, vt = GV.np.linalg.svd(a.T @ b)
+        d = GV.np.diag([1.0, 1.0, GV.np.sign(GV.np.linalg.det(u @ vt))])
+        reference.append(GV.np.sqrt(GV.np.mean(GV.np.sum((a @ u @ d @ vt - b) ** 2, axis=1))))
+    rotation, rmsd = GV.kabsch(coords, distorted)
+    assert GV.np.allclose(rmsd, reference)
+    # The rotation superimposes the centred structures with that RMSD
+    a, b = coords - coords.mean(axis=1)[:, None], distorted - distorted.mean(axis=1)[:, None]
+    superposed = GV.np.einsum('pni,pij->pnj', b, rotation)
+    assert GV.np.allclose(GV.np.sqrt(GV.np.mean(GV.np.sum((superposed - a) ** 2, axis=2), axis=1)), rmsd)
+    assert GV.np.allclose(GV.np.linalg.det(rotation), 1.0)
+    # A mirror image is not superimposable
+    assert GV.kabsch(coords[:1], -coords[:1])[1][0] > 0.1
+
+
+def test_check_dup_rmsd():
+    rng = GV.np.random.default_rng(5)
+    base = rng.normal(size=(8, 3))
+    other = base + rng.normal(0, 0.5, base.shape)
+    atom_nums = [6, 6, 8, 7, 1, 1, 1, 1]
+    geometries = [base, base @ random_rotation(rng).T + 2.0, other, base + rng.normal(0, 0.01, base.shape)]
+    thermo_data, files = {}, []
+    for i, cartesians in enumerate(geometries):
+        file = 'conf_{}.log'.format(i)
+        files.append(file)
+        # Frequencies differ, so only the geometry can identify duplicates
+        thermo_data[file] = SimpleNamespace(scf_energy=-100.0, roconst=[1.0, 2.0, 3.0],
+                                            frequency_wn=[100.0 * (i + 1)] * 6,
+                                            xyz=SimpleNamespace(atom_nums=atom_nums, cartesians=cartesians))
+    assert GV.check_dup(files, thermo_data) == []
+    assert GV.check_dup(files, thermo_data, rmsd_cutoff=0.1) == [['conf_1.log', 'conf_0.log'],
+                                                                 ['conf_3.log', 'conf_0.log'],
+                                                                 ['conf_3.log', 'conf_1.log']]
+
+
+def test_check_enantiomers():
+    rng = GV.np.random.default_rng(11)
+    base = rng.normal(size=(12, 3))
+    atom_nums = [6, 6, 8, 7, 6, 6, 6, 9, 1, 1, 1, 1]
+    mirror = base * [1.0, -1.0, 1.0]
+    geometries = [base, mirror @ random_rotation(rng).T, base + rng.normal(0, 0.5, base.shape),
+                  base @ random_rotation(rng).T]
+    thermo_data, files = {}, []
+    for i, cartesians in enumerate(geometries):
+        file = 'conf_{}.log'.format(i)
+        files.append(file)
+        thermo_data[file] = SimpleNamespace(scf_energy=-100.0, roconst=[1.0, 2.0, 3.0], qh_gibbs_free_energy=-100.0,
+                                            xyz=SimpleNamespace(atom_nums=atom_nums, cartesians=cartesians))
+    # conf_3 is a duplicate of conf_0 and a mirror image of conf_1, but conf_1 is already paired
+    enant_list = GV.check_enantiomers(files, thermo_data)
+    assert enant_list == [['conf_1.log', 'conf_0.log']]
+    GV.set_degeneracy(thermo_data, enant_list)
+    boltz_facs, weighted_free_energy, boltz_sum = GV.get_boltz(files, thermo_data, False, [], 298.15, enant_list)
+    assert 'conf_1.log' not in boltz_facs
+    assert boltz_facs['conf_0.log'] == pytest.approx(2.0)
+    assert boltz_sum == pytest.approx(4.0)
+
+
+def test_enantiomers_evaluated_once(tmp_path, monkeypatch, capsys):
+    # A mirror image (x coordinates reflected) is found before evaluation and takes the thermochemistry of its pair
+    import re, shutil
+    source = datapath(os.path.join('gconf_ee_boltz', 'Aminoxylation_TS1_R.log'))
+    files = [str(tmp_path / 'TS1_R.log'), str(tmp_path / 'TS1_S.log')]
+    shutil.copy(source, files[0])
+    coordinate = re.compile(r'^(\s+\d+\s+\d+\s+\d+\s+)(-?\d+\.\d{6})(\s+-?\d+\.\d{6}\s+-?\d+\.\d{6}\s*)$')
+    with open(source) as f, open(files[1], 'w') as mirror:
+        for line in f:
+            match = coordinate.match(line)
+            if match:
+                line = match.group(1) + '{:.6f}'.format(-float(match.group(2))).rjust(len(match.group(2))) + \
+                       match.group(3)
+            mirror.write(line)
+    evaluated, init = [], GV.calc_bbe.__init__
+
+    def evaluate(self, file, *args, **kwargs):
+        evaluated.append(file)
+        init(self, file, *args, **kwargs)
+    monkeypatch.setattr(GV.calc_bbe, '__init__', evaluate)
+    results = GV.analyze(files, enant=True)
+    assert results.enantiomers == [[files[1], files[0]]] and evaluated == files[:1]
+    mirror = results.thermo_data[files[1]]
+    assert mirror.file == files[1] and mirror.degeneracy == 0 and results.thermo_data[files[0]].degeneracy == 2
+    assert mirror.qh_gibbs_free_energy == results.thermo_data[files[0]].qh_gibbs_free_energy
+    assert mirror.xyz.cartesians[0][0] == pytest.approx(-results.thermo_data[files[0]].xyz.cartesians[0][0])
+    with pytest.raises(GV.GoodVibesError, match="--ee"):
+        GV.analyze(files, enant=True, ee='*_R*:*_S*')
+    # Also at each temperature of an interval
+    del evaluated[:]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['goodvibes'] + files + ['--enant', '--ti', '200,300,100'])
+    GV.main()
+    assert evaluated == files[:1] * 3
+    lines = [line.split()[2:] for line in capsys.readouterr().out.splitlines() if line.startswith('o  TS1_')]
+    assert len(lines) == 4 and lines[:2] == lines[2:]
+    # The file checks report the pair as enantiomers rather than duplicates
+    monkeypatch.setattr(sys, 'argv', ['goodvibes'] + files + ['--check'])
+    GV.main()
+    out = capsys.readouterr().out
+    assert "No duplicates found" in out and "{} and {}".format(files[1], files[0]) in out.split("enantiomers found")[1]
+
+
+@pytest.mark.parametrize("cartesians, linear", [
+    ([[0.0, 0.0, 0.0], [0.0, 0.0, 1.1]], True),
+    ([[0.0, 0.0, -1.16], [0.0, 0.0, 0.0], [0.0, 0.01, 1.16]], True),
+    ([[1.0, 1.0, 1.0], [2.0, 2.0, 2.0], [3.0, 3.0, 3.0], [4.2, 4.2, 4.2]], True),
+    ([[0.0, 0.0, 0.0], [0.96, 0.0, 0.0], [-0.24, 0.93, 0.0]], False),
+])
+def test_is_linear(cartesians, linear):
+    assert bool(GV.is_linear(cartesians)) == linear
+    rotated = GV.np.array(cartesians) @ random_rotation(GV.np.random.default_rng(0)).T
+    assert list(GV.is_linear([cartesians, rotated])) == [linear, linear]
+
+
+def test_check_geometries():
+    rng = GV.np.random.default_rng(7)
+    atom_nums = [6, 6, 8, 7, 1, 1, 1, 1, 1]
+    base = rng.normal(size=(9, 3)) * 1.5
+    moved = base @ random_rotation(rng).T + 3.0
+    order = rng.permutation(9)
+    distorted = base.copy()
+    distorted[2] += [0.2, 0.0, 0.0]
+    freq = [SimpleNamespace(atom_nums=atom_nums, cartesians=base)] * 4
+    spc = [SimpleNamespace(atom_nums=atom_nums, cartesians=moved),
+           SimpleNamespace(atom_nums=[atom_nums[i] for i in order], cartesians=moved[order]),
+           SimpleNamespace(atom_nums=atom_nums, cartesians=distorted),
+           SimpleNamespace(atom_nums=atom_nums[:-1] + [9], cartesians=moved)]
+    max_dev, rmsd = GV.check_geometries(freq, spc)
+    assert max_dev[0] < 1e-6 and max_dev[1] < 1e-6
+    assert 0.1 < max_dev[2] < 0.2 and 0.0 < rmsd[2] < max_dev[2]
+    assert GV.np.isinf(max_dev[3])
+
+
+@pytest.mark.parametrize("path, job_type, n_imag", [
+    ('HCN_triplet.out', 'GSFreq', 1),
+    ('ethane_TZ.out', 'SP', None),
+    ('gconf_ee_boltz/Aminoxylation_TS1_R.log', 'TSFreq', 1),
+])
+def test_output_summary(path, job_type, n_imag):
+    file = datapath(path)
+    data = GV.read_head_tail(file, tail_bytes=4096)
+    assert GV.read_initial(file, data)[:3] == GV.read_initial(file)[:3]
+    assert GV.parse_data(file, data)[1:] == GV.parse_data(file)[1:]
+    summary = GV.output_summary(file)
+    assert summary.progress == 'Normal'
+    assert summary.job_type == job_type
+    assert summary.n_imag == n_imag
+
+
+requires_symmetry_lib = pytest.mark.skipif(not os.path.exists(GV.sharepath(
+    {'linux': 'symmetry_linux.so', 'darwin': 'symmetry_mac.dylib'}.get(sys.platform, 'symmetry_windows.dll'))),
+    reason="compiled symmetry library not available")
+
+
+@requires_symmetry_lib
+def test_ex_sym_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    files = ['H2O.out', 'benzene.out', 'ethane.out', 'allene.out', 'neopentane.out', 'methylaniline.out']
+    mols = [SimpleNamespace(xyz=GV.getoutData(datapath(file))) for file in files]
+    expected = [(2, 'C2v'), (12, 'D6h'), (6, 'D3d'), (4, 'D2d'), (12, 'Td'), (1, 'C1')]
+    assert [GV.calc_bbe.ex_sym(mol, 'test') for mol in mols] == expected
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda mol: GV.calc_bbe.ex_sym(mol, 'test'), mols * 4))
+    assert results == expected * 4
+
+
+@requires_symmetry_lib
+@pytest.mark.parametrize("nproc, chunk_size", [(1, 64), (1, 2), (2, 2)])
+def test_point_groups(nproc, chunk_size):
+    files = ['H2O.out', 'benzene.out', 'ethane.out', 'allene.out', 'neopentane.out', 'methylaniline.out']
+    mols = [GV.getoutData(datapath(file)) for file in files] + [SimpleNamespace(atom_nums=[], cartesians=[])]
+    pgroups, sym_nums = GV.point_groups(mols, nproc=nproc, chunk_size=chunk_size)
+    assert pgroups == ['C2v', 'D6h', 'D3d', 'D2d', 'Td', 'C1', '']
+    assert sym_nums == [2, 12, 6, 4, 12, 1, 1]
+
+
+@pytest.mark.parametrize("path, c1", [
+    ('benzene.out', False),
+    ('ethane.out', False),
+    ('H2O.out', False),
+    ('gconf_ee_boltz/Aminoxylation_TS1_R.log', True),
+])
+def test_c1_prescreen(path, c1):
+    mol = GV.getoutData(datapath(path))
+    assert GV.c1_prescreen(mol.atom_nums, mol.cartesians) == c1
+    rotated = GV.np.array(mol.cartesians) @ random_rotation(GV.np.random.default_rng(3)).T
+    assert GV.c1_prescreen(mol.atom_nums, rotated) == c1
+
+
+def test_c1_prescreen_planar():
+    rng = GV.np.random.default_rng(11)
+    xyz = rng.normal(size=(10, 3)) * 2.0
+    atom_nums = [6, 7, 8, 9, 16, 17, 35, 53, 15, 14]
+    assert GV.c1_prescreen(atom_nums, xyz)
+    xyz[:, 2] = 0.0
+    assert not GV.c1_prescreen(atom_nums, xyz)
+
+
+def test_geometry_hash():
+    rng = GV.np.random.default_rng(5)
+    mol = GV.getoutData(datapath('gconf_ee_boltz/Aminoxylation_TS1_R.log'))
+    nums, xyz = GV.np.array(mol.atom_nums), GV.np.array(mol.cartesians)
+    key = GV.geometry_hash(nums, xyz)
+    order = rng.permutation(len(nums))
+    assert GV.geometry_hash(nums[order], xyz[order] @ random_rotation(rng).T + [1.0, -2.0, 0.5]) == key
+    moved = xyz.copy()
+    moved[0] += 0.05
+    assert GV.geometry_hash(nums, moved) != key
+    assert GV.geometry_hash(nums, -xyz) != key
+
+
+def test_symmetry_cache(tmp_path):
+    path = str(tmp_path / 'cache' / 'symmetry.json')
+    cache = GV.symmetry_cache(path)
+    assert cache.get('abc') is None
+    cache.put('abc', 'C2v', 2, 1)
+    cache.save()
+    other = GV.symmetry_cache(path)
+    other.put('def', 'D3d', 6, 9)
+    cache.put('ghi', 'C1', 1, 1)
+    other.save()
+    cache.save()
+    assert GV.symmetry_cache(path).entries == {'abc': ['C2v', 2, 1], 'def': ['D3d', 6, 9], 'ghi': ['C1', 1, 1]}
+
+
+@pytest.mark.parametrize("n, cutoff, seed", [(1, 1.0, 0), (40, 1.5, 1), (300, 2.0, 2), (300, 50.0, 3)])
+def test_neighbor_pairs(n, cutoff, seed):
+    xyz = GV.np.random.default_rng(seed).uniform(-6.0, 6.0, size=(n, 3))
+    i, j, distance = GV.neighbor_pairs(xyz, cutoff)
+    full = GV.np.linalg.norm(xyz[:, None] - xyz[None, :], axis=-1)
+    expected = set(zip(*GV.np.nonzero(GV.np.triu(full < cutoff, k=1))))
+    assert set(zip(i.tolist(), j.tolist())) == expected and len(i) == len(expected)
+    assert GV.np.allclose(distance, full[i, j])
+
+
+def test_connectivity_graph():
+    mol = GV.getoutData(datapath('ethane.out'))
+    indptr, indices = GV.connectivity_graph(mol.atom_types, mol.cartesians)
+    degree = GV.np.diff(indptr)
+    assert [int(d) for d, atom in zip(degree, mol.atom_types) if atom == 'C'] == [4, 4]
+    assert all(d == 1 for d, atom in zip(degree, mol.atom_types) if atom == 'H')
+    mol.get_connectivity()
+    assert mol.connectivity == [indices[indptr[k]:indptr[k + 1]].tolist() for k in range(len(mol.atom_types))]
+
+
+@pytest.mark.parametrize("path, int_sym", [
+    ('ethane.out', 3),
+    ('isobutane.out', 27),
+    ('neopentane.out', 81),
+    ('benzene.out', 1),
+    ('allene.out', 1),
+    ('gconf_ee_boltz/Aminoxylation_TS1_R.log', 6),
+])
+def test_internal_symmetry(path, int_sym):
+    assert GV.internal_symmetry(GV.getoutData(datapath(path))) == int_sym
+
+
+def test_graph_bridges():
+    # Methylcyclopropane with one hydrogen on the methyl group: ring C0-C1-C2, C0-C3, C3-H4
+    bonds = [(0, 1), (1, 2), (0, 2), (0, 3), (3, 4)]
+    rows = [a for a, b in bonds] + [b for a, b in bonds]
+    cols = [b for a, b in bonds] + [a for a, b in bonds]
+    order = GV.np.lexsort((cols, rows))
+    indptr = GV.np.concatenate(([0], GV.np.cumsum(GV.np.bincount(rows, minlength=5))))
+    bridges = GV.graph_bridges(indptr, GV.np.array(cols)[order])
+    assert sorted((min(a, b), max(a, b)) for a, b, _, _ in bridges) == [(0, 3), (3, 4)]
+    assert all(n_total == 5 for _, _, _, n_total in bridges)
+    assert sorted(n_b for _, _, n_b, _ in bridges) == [1, 2]
+
+
+def d3_test_reference():
+    # Two coordination-number references for H, C, N and O, with made-up but physically sized values
+    c6ab = GV.np.zeros((8, 8, 2, 2, 3))
+    base = {0: 3.0, 5: 18.0, 6: 15.0, 7: 12.0}
+    cnref = {0: (0.0, 1.0), 5: (0.0, 4.0), 6: (0.0, 3.0), 7: (0.0, 2.0)}
+    for a in base:
+        for b in base:
+            for m in range(2):
+                for n in range(2):
+                    c6ab[a, b, m, n] = [GV.math.sqrt(base[a] * base[b]) * (1.0 + 0.1 * m + 0.05 * n),
+                                        cnref[a][m], cnref[b][n]]
+    c6ab = (c6ab + c6ab.transpose(1, 0, 3, 2, 4)[..., [0, 2, 1]]) / 2
+    rcov = GV.np.linspace(0.8, 1.6, 8) * 4.0 / 3.0
+    r0ab = GV.np.add.outer(rcov, rcov) * 1.5
+    return {'c6ab': c6ab, 'r0ab': r0ab, 'rcov': rcov, 'r2r4': GV.np.linspace(1.5, 3.5, 8)}
+
+
+def d3_brute_force(nums, xyz, ref, damp, params):
+    # Full sums over all pairs and triples, one at a time
+    xyz = GV.np.asarray(xyz) / GV.BOHR_TO_ANGSTROM
+    z = [n - 1 for n in nums]
+    dist = lambda a, b: GV.np.linalg.norm(xyz[a] - xyz[b])
+    cn = [sum(1.0 / (1.0 + GV.math.exp(-16.0 * ((ref['rcov'][z[a]] + ref['rcov'][z[b]]) / dist(a, b) - 1.0)))
+              for b in range(len(z)) if b != a) for a in range(len(z))]
+    def c6(a, b):
+        num = den = 0.0
+        for m in range(2):
+            for n in range(2):
+                value, cna, cnb = ref['c6ab'][z[a], z[b], m, n]
+                weight = GV.math.exp(-4.0 * ((cna - cn[a]) ** 2 + (cnb - cn[b]) ** 2))
+                num, den = num + weight * value, den + weight
+        return num / den
+    energy = 0.0
+    for a in range(len(z)):
+        for b in range(a):
+            r, c6ab = dist(a, b), c6(a, b)
+            c8 = 3.0 * c6ab * ref['r2r4'][z[a]] * ref['r2r4'][z[b]]
+            if damp == 'zero':
+                s6, rs6, s8 = params
+                r0 = ref['r0ab'][z[a], z[b]]
+                energy -= s6 * c6ab / r ** 6 / (1.0 + 6.0 * (r / (rs6 * r0)) ** -14)
+                energy -= s8 * c8 / r ** 8 / (1.0 + 6.0 * (r / r0) ** -16)
+            else:
+                s6, a1, s8, a2 = params
+                r0 = a1 * GV.math.sqrt(c8 / c6ab) + a2
+                energy -= s6 * c6ab / (r ** 6 + r0 ** 6) + s8 * c8 / (r ** 8 + r0 ** 8)
+    three_body = 0.0
+    for a in range(len(z)):
+        for b in range(a):
+            for c in range(b):
+                rab, rac, rbc = dist(a, b), dist(a, c), dist(b, c)
+                r0 = GV.np.cbrt(ref['r0ab'][z[a], z[b]] * ref['r0ab'][z[a], z[c]] * ref['r0ab'][z[b], z[c]])
+                damping = 1.0 / (1.0 + 6.0 * (4.0 / 3.0 * r0 / GV.np.cbrt(rab * rac * rbc)) ** 16)
+                cos_a = (rab ** 2 + rac ** 2 - rbc ** 2) / (2 * rab * rac)
+                cos_b = (rab ** 2 + rbc ** 2 - rac ** 2) / (2 * rab * rbc)
+                cos_c = (rac ** 2 + rbc ** 2 - rab ** 2) / (2 * rac * rbc)
+                c9 = -GV.math.sqrt(c6(a, b) * c6(a, c) * c6(b, c))
+                three_body -= c9 * damping * (3.0 * cos_a * cos_b * cos_c + 1.0) / (rab * rac * rbc) ** 3
+    return energy, three_body
+
+
+@pytest.mark.parametrize("path, functional, damp", [
+    ('ethane.out', 'B3LYP', 'zero'),
+    ('ethane.out', 'PBE0', 'bj'),
+    ('methylaniline.out', 'M06-2X', 'zero'),
+    ('methylaniline.out', 'wB97X', 'bj'),
+])
+def test_d3_dispersion(path, functional, damp):
+    ref = d3_test_reference()
+    mol = GV.getoutData(datapath(path))
+    params = GV.d3_parameters(functional, damp) if functional != 'wB97X' else (1.0, 0.4, 2.0, 5.0)
+    d3 = GV.d3_dispersion(mol.atom_nums, mol.cartesians, functional, damp, abc=True, reference=ref, params=params)
+    two_body, three_body = d3_brute_force(mol.atom_nums, mol.cartesians, ref, damp, params)
+    assert d3.energy == pytest.approx(two_body + three_body, rel=1e-10)
+    assert d3.repulsive_abc == pytest.approx(three_body * GV.KCAL_TO_AU, rel=1e-10)
+    rotated = GV.np.array(mol.cartesians) @ random_rotation(GV.np.random.default_rng(7)).T + 3.0
+    moved = GV.d3_dispersion(mol.atom_nums, rotated, functional, damp, abc=True, reference=ref, params=params)
+    assert moved.energy == pytest.approx(d3.energy, rel=1e-10)
+
+
+def test_d3_parameters():
+    assert GV.d3_parameters('b3-lyp', 'zero') == GV.D3_ZERO_PARAMS['B3LYP']
+    assert GV.d3_parameters('UB3LYP', 'bj') == GV.D3_BJ_PARAMS['B3LYP']
+    assert GV.d3_parameters('PBE1PBE', 'bj') == GV.d3_parameters('PBE0', 'bj')
+    with pytest.raises(ValueError):
+        GV.d3_parameters('M062X', 'bj')
+    with pytest.raises(ValueError):
+        GV.d3_parameters('NOTAFUNCTIONAL', 'zero')
+    with pytest.raises(ValueError):
+        GV.d3_dispersion([1, 3], [[0, 0, 0], [0, 0, 1.0]], 'B3LYP', reference=d3_test_reference())
+
+
+def test_d3_cache(tmp_path, monkeypatch):
+    ref, path = d3_test_reference(), str(tmp_path / 'd3.json')
+    mol = GV.getoutData(datapath('ethane.out'))
+    cache = GV.d3_cache(ref, path)
+    energy = cache.energy(mol.atom_nums, mol.cartesians, 'B3LYP', 'bj', True)
+    assert energy == GV.d3_dispersion(mol.atom_nums, mol.cartesians, 'B3LYP', 'bj', True, reference=ref).energy
+    assert cache.energy(mol.atom_nums, mol.cartesians, 'B3LYP', 'zero', True) != energy
+    cache.save()
+    monkeypatch.setattr(GV, 'd3_dispersion', None)
+    rotated = GV.np.array(mol.cartesians) @ random_rotation(GV.np.random.default_rng(5)).T
+    assert GV.d3_cache(ref, path).energy(mol.atom_nums, rotated, 'b3-lyp', 'bj', True) == energy
+    changed = dict(ref, r2r4=ref['r2r4'] * 1.1)
+    with pytest.raises(TypeError):
+        GV.d3_cache(changed, path).energy(mol.atom_nums, mol.cartesians, 'B3LYP', 'bj', True)
+
+
+def test_d3_reference(tmp_path, monkeypatch):
+    # The reference data distributed with GoodVibes reproduce the energies of the dftd3 program
+    monkeypatch.delenv('GOODVIBES_D3_REFERENCE', raising=False)
+    monkeypatch.setenv('GOODVIBES_CACHE_DIR', str(tmp_path))
+    path = GV.d3_reference_path()
+    assert os.path.isfile(path) and os.path.dirname(path) == os.path.dirname(GV.sharepath('d3_reference.npz'))
+    ref = GV.load_d3_reference()
+    assert ref['c6ab'].shape[:2] == (94, 94)
+    mol = GV.getoutData(datapath('gconf_ee_boltz/Aminoxylation_TS1_R.log'))
+    zero = GV.d3_dispersion(mol.atom_nums, mol.cartesians, 'B3LYP', 'zero', reference=ref)
+    bj = GV.d3_dispersion(mol.atom_nums, mol.cartesians, 'B3LYP', 'bj', abc=True, reference=ref)
+    assert zero.energy == pytest.approx(-0.046475667055, abs=1e-11)
+    assert bj.energy == pytest.approx(-0.081917863409, abs=1e-11)
+
+
+@pytest.mark.parametrize("suffix", ['csv', 'jsonl', 'npz'])
+def test_result_sink(tmp_path, suffix):
+    import csv, json
+    files = [datapath('ethane.out'), datapath('gconf_ee_boltz/Aminoxylation_TS1_R.log')]
+    bbes = [GV.calc_bbe(file, 'grimme', True, 100.0, 100.0, 298.15, GV.ATMOS / (GV.GAS_CONSTANT * 298.15), 1.0,
+                        'none', False, False, 0.0) for file in files]
+    sink = GV.result_sink(str(tmp_path / ('results.' + suffix)))
+    for file, bbe, boltz in zip(files, bbes, [0.25, 0.75]):
+        sink.add(file, bbe, 298.15, qh=True, boltz=boltz)
+
+    def read_columns():
+        sink.write()
+        if suffix == 'csv':
+            with open(sink.path) as f:
+                rows = list(csv.DictReader(f))
+        elif suffix == 'jsonl':
+            with open(sink.path) as f:
+                rows = [json.loads(line) for line in f]
+        else:
+            with GV.np.load(sink.path) as data:
+                return dict((key, data[key].tolist()) for key in data.files)
+        return dict((key, [row[key] for row in rows]) for key in rows[0])
+    columns = read_columns()
+    assert sorted(columns) == sorted(GV.result_sink.fields)
+    assert columns['structure'] == ['ethane', 'Aminoxylation_TS1_R']
+    assert GV.np.allclose(GV.np.array(columns['qh_gibbs_free_energy'], dtype=float),
+                          [bbe.qh_gibbs_free_energy for bbe in bbes], rtol=0, atol=1e-12)
+    assert GV.np.allclose(GV.np.array(columns['boltzmann'], dtype=float), [0.25, 0.75])
+    assert [str(value) for value in columns['im_freqs']][0] in ('', '[]')
+    assert '-426.41' in str(columns['im_freqs'][1])
+    # Rows of a PES and of the selectivity follow the structures
+    sink.add_pes('Reaction', 'TS', 298.15, 'kJ/mol', [0.0, 0.01, 0.0, 0.0, 0.0, 0.0, 0.02, 0.03])
+    sink.add_selectivity(298.15, 20.0, '60:40', '1.5:1', 'R', 0.25)
+    columns = read_columns()
+    assert columns['record'] == ['structure', 'structure', 'pes', 'selectivity']
+    assert columns['structure'][2] == 'TS' and columns['path'][2] == 'Reaction' and columns['major'][3] == 'R'
+    assert float(columns['qh_gibbs_free_energy'][2]) == pytest.approx(0.03 * GV.J_TO_AU / 1000.0)
+    assert float(columns['excess'][3]) == 20.0 and columns['ratio_percent'][3] == '60:40'
+    with pytest.raises(ValueError):
+        GV.result_sink(str(tmp_path / 'results.txt'))
+
+
+def test_jsonl_stream(tmp_path):
+    import json
+    file = datapath('ethane.out')
+    bbe = GV.calc_bbe(file, 'grimme', False, 100.0, 100.0, 298.15, GV.ATMOS / (GV.GAS_CONSTANT * 298.15), 1.0,
+                      'none', False, False, 0.0)
+    stream = GV.jsonl_stream(str(tmp_path / 'results.jsonl'))
+    stream.structure(file, bbe, 298.15)
+    with open(stream.path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 1 and records[0]['record'] == 'structure'
+    assert records[0]['qh_gibbs_free_energy'] == pytest.approx(bbe.qh_gibbs_free_energy)
+    stream.boltzmann([file], {file: 2.0}, 4.0, {}, 298.15)
+    stream.pes('rxn', 'TS', 298.15, 'kJ/mol', [0.0, 0.01, 0.0, 0.0, 0.0, 0.0, 0.02, 0.03])
+    stream.close()
+    with open(stream.path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record['record'] for record in records] == ['structure', 'boltzmann', 'pes']
+    assert records[1]['populations'] == {'ethane': 0.5}
+    assert 'sp_energy' not in records[2] and 'qh_enthalpy' not in records[2]
+    assert records[2]['scf_energy'] == pytest.approx(0.01 * GV.J_TO_AU / 1000.0)
+    assert records[2]['qh_gibbs_free_energy'] == pytest.approx(0.03 * GV.J_TO_AU / 1000.0)
+
+
+def test_quiet_logger_and_progress(tmp_path, capsys):
+    import io
+    log = GV.Logger(str(tmp_path / 'GoodVibes'), 'quiet', quiet=True)
+    log.write('\n   hidden from the terminal')
+    log.finalize()
+    assert capsys.readouterr().out == ''
+    with open(str(tmp_path / 'GoodVibes_quiet.dat')) as f:
+        assert f.read() == '\n   hidden from the terminal'
+    # The third positional argument is the former csv flag, which does not make the log quiet
+    with pytest.warns(DeprecationWarning):
+        log = GV.Logger(str(tmp_path / 'GoodVibes'), 'csv', True)
+    log.write('shown')
+    log.finalize()
+    assert capsys.readouterr().out == 'shown'
+    stream = io.StringIO()
+    meter = GV.progress_meter(2, stream=stream, interval=3600.0)
+    meter.update(datapath('ethane.out'))
+    assert stream.getvalue() == ''
+    meter.update(datapath('H2O.out'))
+    meter.finish()
+    assert stream.getvalue().startswith('\r   Evaluating 2/2 files') and stream.getvalue().endswith('\n')
+    assert meter.nbytes == os.path.getsize(datapath('ethane.out')) + os.path.getsize(datapath('H2O.out'))
+
+
+def test_xyz_ensemble(tmp_path):
+    geometry = GV.getoutData(datapath('ethane.out'))
+    thermo_data = {'a.log': SimpleNamespace(xyz=geometry, scf_energy=-1.0, qh_gibbs_free_energy=-0.9),
+                   'b.log': SimpleNamespace(xyz=geometry, scf_energy=-1.1, qh_gibbs_free_energy=-1.2),
+                   'c.log': SimpleNamespace(xyz=geometry, scf_energy=-1.0)}
+    files = ['a.log', 'b.log', 'c.log']
+    assert [frame[2].split()[0] for frame in GV.xyz_ensemble(files, thermo_data)] == ['a', 'b', 'c']
+    assert [frame[2].split()[0] for frame in GV.xyz_ensemble(files, thermo_data, sort=True)] == ['b', 'a', 'c']
+    frames = GV.xyz_ensemble(files, thermo_data, {'a.log': 0.01, 'b.log': 0.99}, min_population=0.05, annotate=True)
+    assert len(frames) == 1 and frames[0][2].split()[1:] == ['Eopt', '-1.100000', 'qh-G(T)', '-1.200000', 'Boltz',
+                                                             '0.990']
+    out = GV.xyz_out(str(tmp_path / 'ensemble'), 'xyz', 'output')
+    for frame in frames:
+        out.write_frame(*frame)
+    out.finalize()
+    with open(str(tmp_path / 'ensemble_output.xyz')) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == str(len(geometry.atom_types)) and len(lines) == len(geometry.atom_types) + 2
+    assert GV.np.allclose([[float(x) for x in line.split()[1:]] for line in lines[2:]], geometry.cartesians, atol=1e-6)
+
+
+def test_project_db(tmp_path, monkeypatch):
+    import shutil
+    files = []
+    for name in ('ethane.out', 'H2O.out'):
+        shutil.copy(datapath(name), str(tmp_path / name))
+        files.append(str(tmp_path / name))
+    path = str(tmp_path / 'project.db')
+    settings = GV.project_db.settings_hash({'temperature': 298.15, 'QS': 'grimme'})
+    db = GV.project_db(path)
+    initial = [db.read_initial(file) for file in files]
+    bbes = [GV.calc_bbe(file, 'grimme', False, 100.0, 100.0, 298.15, GV.ATMOS / (GV.GAS_CONSTANT * 298.15), 1.0,
+                        'none', False, False, 0.0) for file in files]
+    for file, bbe in zip(files, bbes):
+        db.put(file, settings, bbe)
+    db.close()
+
+    # A rerun neither reads nor evaluates the files again
+    def parse(*args, **kwargs):
+        raise AssertionError('file parsed again')
+    monkeypatch.setattr(GV, 'read_initial', parse)
+    monkeypatch.setattr(GV.getoutData, '__init__', parse)
+    monkeypatch.setattr(GV.calc_bbe, '__init__', parse)
+    db = GV.project_db(path)
+    assert [db.read_initial(file) for file in files] == initial
+    moved = str(tmp_path / 'ethane_copy.out')
+    shutil.copy(files[0], moved)
+    stored = db.results(files + [moved], settings)
+    assert sorted(stored) == sorted(files + [moved]) and stored[moved].file == moved
+    for file, bbe in zip(files, bbes):
+        assert stored[file].qh_gibbs_free_energy == bbe.qh_gibbs_free_energy
+        assert stored[file].im_frequency_wn == bbe.im_frequency_wn
+        assert stored[file].xyz.cartesians == bbe.xyz.cartesians
+    assert db.results(files, GV.project_db.settings_hash({'temperature': 300.0, 'QS': 'grimme'})) == {}
+    populations = db.populations(settings, 298.15)
+    assert set(populations) == {'ethane', 'H2O'} and sum(populations.values()) == pytest.approx(1.0)
+    assert db.populations(settings, 298.15, names=['H2O']) == {'H2O': 1.0}
+
+    # Changed contents are evaluated again
+    with open(files[1], 'a') as f:
+        f.write('\n')
+    assert sorted(db.results(files, settings)) == [files[0]]
+    db.close()
+
+
+def test_project_db_spc(tmp_path, monkeypatch):
+    # The stored thermochemistry is not reused once the single-point file changes
+    import csv, shutil
+    for name in ('ethane.out', 'ethane_TZ.out'):
+        shutil.copy(datapath(name), str(tmp_path / name))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['goodvibes', 'ethane.out', '--spc', 'TZ', '--db', 'project.db', '--csv'])
+
+    def spc_energy():
+        GV.main()
+        with open('Goodvibes_output.csv') as f:
+            return float(next(csv.DictReader(f))['sp_energy'])
+    assert spc_energy() == pytest.approx(-79.858399, abs=1e-6)
+    with open('ethane_TZ.out') as f:
+        text = f.read()
+    with open('ethane_TZ.out', 'w') as f:
+        f.write(text.replace('-79.8583990481', '-79.9583990481'))
+    assert spc_energy() == pytest.approx(-79.958399, abs=1e-6)
+
+
+def test_project_db_d3_interval(tmp_path, monkeypatch, capsys):
+    # The D3 term of a stored file is restored for the temperature interval
+    import shutil
+    shutil.copy(datapath('ethane.out'), str(tmp_path / 'ethane.out'))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['goodvibes', 'ethane.out', '--d3', '--ti', '200,300,100', '--db', 'project.db'])
+    GV.main()
+    first = [line for line in capsys.readouterr().out.splitlines() if line.startswith('o  ethane')]
+    GV.main()
+    second = [line for line in capsys.readouterr().out.splitlines() if line.startswith('o  ethane')]
+    assert len(first) == 2 and second == first
+
+
+def test_project_db_spc_extension(tmp_path, monkeypatch, capsys):
+    # A single-point file with another extension than the frequency file is found again from a stored result
+    import shutil
+    shutil.copy(datapath('ethane.out'), str(tmp_path / 'ethane.out'))
+    shutil.copy(datapath('ethane_TZ.out'), str(tmp_path / 'ethane_sp.log'))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['goodvibes', 'ethane.out', '--spc', 'sp', '--check', '--db', 'project.db'])
+    for _ in range(2):
+        GV.main()
+        assert "No potential differences found between frequency and single-point" in capsys.readouterr().out
+    db = GV.project_db('project.db')
+    data, = db.db.execute('SELECT data FROM results').fetchone()
+    db.close()
+    bbe = GV.project_db.restore(GV.json.loads(data), 'ethane.out')
+    assert bbe.sp_file == 'ethane_sp.log'
+    mirror = GV.mirror_image(bbe, SimpleNamespace(file='mirror.out', xyz=None), 'mirror_sp.log')
+    assert mirror.file == 'mirror.out' and mirror.sp_file == 'mirror_sp.log'
+
+
+def test_spc_read_once(tmp_path, monkeypatch, capsys):
+    # The single-point file is read once, for its energy, CPU time and geometry
+    import builtins
+    opened, real_open = [], builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        opened.append(os.path.basename(str(file)))
+        return real_open(file, *args, **kwargs)
+    monkeypatch.setattr(builtins, 'open', counting_open)
+    bbe = GV.calc_bbe(datapath('ethane.out'), 'grimme', False, 100.0, 100.0, 298.15,
+                      GV.ATMOS / (GV.GAS_CONSTANT * 298.15), 1.0, 'none', 'TZ', False, 0.0)
+    assert len(bbe.sp_xyz.cartesians) == 8 and opened.count('ethane_TZ.out') == 1
+    monkeypatch.setattr(builtins, 'open', real_open)
+
+    # Link jobs are checked against the level of theory of the file itself
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(GV, 'level_of_theory', None)
+    monkeypatch.setattr(sys, 'argv', ['goodvibes', datapath('ethane.out'), '--spc', 'link', '--check'])
+    GV.main()
+    assert 'Using B3LYP/6-31G(d) in all the single-point corrections' in capsys.readouterr().out
+
+
+def test_analyze(tmp_path, monkeypatch):
+    import goodvibes
+    from glob import glob
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(GV, 'warm_caches', {})
+    files = [datapath('ethane.out'), datapath('H2O.out')]
+    results = goodvibes.analyze(files, {'QH': True}, temperature=353.15)
+    assert results.files == files and results.omitted == [] and results.options.QH
+    assert [row['structure'] for row in results.rows] == ['ethane', 'H2O']
+    bbe = GV.calc_bbe(files[0], 'grimme', True, 100.0, 100.0, 353.15, GV.ATMOS / (GV.GAS_CONSTANT * 353.15), 1.0,
+                      'none', False, False, 0.0)
+    assert results.rows[0]['qh_gibbs_free_energy'] == pytest.approx(bbe.qh_gibbs_free_energy, abs=1e-10)
+    assert any('levels of theory' in message for message in results.messages)
+    # Nothing is written
+    assert os.listdir(str(tmp_path)) == []
+
+    # A repeated call reuses the files evaluated before
+    def parse(*args, **kwargs):
+        raise AssertionError('file parsed again')
+    with monkeypatch.context() as m:
+        m.setattr(GV, 'read_initial', parse)
+        m.setattr(GV.calc_bbe, '__init__', parse)
+        again = goodvibes.analyze(files, QH=True, temperature=353.15)
+    assert again.rows == results.rows and again.thermo_data[files[0]] is not results.thermo_data[files[0]]
+
+    conformers = sorted(glob(datapath('gconf_ee_boltz/*.log')))
+    transition_states = [file for file in conformers if 'TS' in file]
+    results = goodvibes.analyze(transition_states, boltz=True, ee='*_R*:*_S*')
+    assert sum(results.populations.values()) == pytest.approx(1.0)
+    assert results.selectivity['major'] == 'R' and results.selectivity['ratio_percent'] == '60:40'
+    results = goodvibes.analyze(conformers, pes=datapath('gconf_ee_boltz/gconf_TS.yaml'))
+    assert results.pes.path == ['Reaction'] and results.pes.species == [['cat+subs', 'TS']]
+
+    for files, settings in ((files, {'foo': 1}), (files, {'xyz': True}), (files, {'boltz': True}),
+                            (files, {'pes': 'missing.yaml'}), ([datapath('missing.out')], {}),
+                            (transition_states, {'ee': 'A:B'})):
+        with pytest.raises(GV.GoodVibesError):
+            goodvibes.analyze(files, settings)
+
+
+def test_geometry_parsed_once(monkeypatch):
+    # The geometry read for the symmetry numbers and D3 energies is the one calc_bbe uses
+    monkeypatch.setattr(GV, 'warm_caches', {})
+    parsed, init = [], GV.getoutData.__init__
+
+    def parse(self, file, *args):
+        parsed.append(file)
+        init(self, file, *args)
+    monkeypatch.setattr(GV.getoutData, '__init__', parse)
+    files = [datapath('ethane.out'), datapath('H2O.out')]
+    results = GV.analyze(files, ssymm=True, D3BJ=True)
+    assert parsed == files and results.thermo_data[files[0]].point_group == 'D3d'
+    assert results.d3_energies[files[0]] < 0
+
+
+@pytest.mark.parametrize("args, loaded", [
+    (['-h'], []),
+    ([datapath('ethane.out')], []),
+    ([datapath('ethane.out'), '--csv'], ['csv']),
+    ([datapath('methylaniline.out'), '--ssymm'], ['ctypes', 'hashlib', 'numpy']),
+])
+def test_startup_imports(tmp_path, args, loaded):
+    # Heavy dependencies are only imported by the options that need them
+    import subprocess
+    optional = ['asyncio', 'csv', 'ctypes', 'hashlib', 'matplotlib', 'numpy', 'sqlite3', 'goodvibes.media']
+    script = ("import runpy, sys\nsys.argv = ['goodvibes'] + sys.argv[1:]\ntry:\n"
+              "    runpy.run_module('goodvibes', run_name='__main__')\nexcept SystemExit:\n    pass\n"
+              "sys.stderr.write(' '.join(sorted(name for name in {} if name in sys.modules)))\n".format(optional))
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(GV.__file__)))
+    run = subprocess.run([sys.executable, '-W', 'ignore', '-c', script] + args, cwd=str(tmp_path), env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    assert run.stderr.split() == loaded
+
+
+@pytest.mark.skipif(not hasattr(__import__('socket'), 'AF_UNIX'), reason="Unix sockets not available")
+def test_service(tmp_path, monkeypatch):
+    import subprocess, time
+    from concurrent.futures import ThreadPoolExecutor
+    from goodvibes import client
+    path = str(tmp_path / 'gv.sock')
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(GV.__file__)))
+    service = subprocess.Popen([sys.executable, '-W', 'ignore', '-m', 'goodvibes', '--serve', path, '--workers', '2'],
+                               cwd=str(tmp_path), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(200):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        files = [datapath('ethane.out'), datapath('H2O.out')]
+        # Concurrent analyses match the library API
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(lambda n: client.request({'files': files, 'settings': {'QH': True}}, path),
+                                      range(4)))
+        expected = GV.analyze(files, QH=True)
+        for response in responses:
+            assert response['ok'] and response['files'] == files
+            assert [row['qh_gibbs_free_energy'] for row in response['rows']] == \
+                pytest.approx([row['qh_gibbs_free_energy'] for row in expected.rows], abs=1e-10)
+        response = client.request({'files': [datapath('missing.out')]}, path)
+        assert not response['ok'] and 'not found' in response['error']
+
+        # Command lines run in the directory of the client
+        monkeypatch.setenv('GOODVIBES_SOCKET', path)
+        monkeypatch.chdir(tmp_path)
+        assert client.main([datapath('ethane.out'), '--output', 'service']) == 0
+        with open(str(tmp_path / 'Goodvibes_service.dat')) as f:
+            assert 'ethane' in f.read()
+        assert client.main([datapath('ethane.out'), '-t', 'abc']) == 2
+        assert client.request({'shutdown': True}, path) == {'ok': True}
+        service.wait(timeout=30)
+        assert not os.path.exists(path)
+    finally:
+        if service.poll() is None:
+            service.kill()
+
+
+def test_run_captured(tmp_path, monkeypatch):
+    # Command lines run by the service reuse what earlier requests parsed and evaluated
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(GV, 'warm_caches', {})
+    monkeypatch.setattr(sys, 'argv', sys.argv[:])
+    argv = [datapath('ethane.out'), datapath('H2O.out'), '--qh', '--imag']
+    first = GV.run_captured(argv)
+    assert first['status'] == 0 and 'ethane' in first['stdout']
+
+    def parse(*args, **kwargs):
+        raise AssertionError('file parsed again')
+    monkeypatch.setattr(GV, 'read_initial', parse)
+    monkeypatch.setattr(GV.calc_bbe, '__init__', parse)
+    again = GV.run_captured(argv)
+    assert again['status'] == 0
+    assert again['stdout'].split('\n')[3:] == first['stdout'].split('\n')[3:]